@@ -0,0 +1,227 @@
+"""
+Doc-smart archive import: extract Word documents from zip packets into the library folder
+"""
+
+import json
+import os
+import posixpath
+import queue
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from crawler import DEFAULT_EXCLUDE, DEFAULT_INCLUDE, compile_globs
+
+# Per-folder record of what was extracted: member path -> [crc, size, file size, file mtime_ns],
+# the last two describing the file as written, or None if the file there isn't the archive's
+INDEX_NAME = ".docsmart-archive.json"
+
+# Suffix for the archive's copy of a member whose extracted file was edited locally
+CONFLICT_SUFFIX = " (from archive)"
+
+
+def safe_member_path(name: str) -> Optional[str]:
+    """Member name as a relative path inside the extraction folder, or None if it escapes it"""
+    name = name.replace("\\", "/")
+    if name.startswith("/") or (len(name) > 1 and name[1] == ":"):
+        return None
+    parts = [part for part in posixpath.normpath(name).split("/") if part not in ("", ".")]
+    if not parts or ".." in parts:
+        return None
+    return os.path.join(*parts)
+
+
+class ArchiveImportJob:
+    """Extracts a zip's Word documents on worker threads, never overwriting edited files"""
+
+    MAX_WORKERS = 4
+    BATCH_SIZE = 100
+
+    def __init__(self, archive_path: str, dest_dir: str, include: Iterable[str] = DEFAULT_INCLUDE,
+                 exclude: Iterable[str] = DEFAULT_EXCLUDE):
+        self.archive_path = archive_path
+        self.dest_dir = dest_dir
+        self.is_included = compile_globs(include)
+        self.is_excluded = compile_globs(exclude)
+        self.results: queue.Queue = queue.Queue()  # ("extracted"|"unchanged"|"conflict"|"error", ...), ("done", None)
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="docsmart-archive", daemon=True)
+        self._local = threading.local()
+        self._handles: List[zipfile.ZipFile] = []
+        self._handles_lock = threading.Lock()
+
+        self.members = 0
+        self.extracted = 0
+        self.unchanged = 0
+        self.conflicts = 0
+        self.imported = 0
+        self.errors: List[str] = []
+        self.panel = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _wanted(self, info: zipfile.ZipInfo) -> bool:
+        if info.is_dir() or info.filename.startswith("__MACOSX/"):
+            return False
+        name = posixpath.basename(info.filename)
+        return self.is_included(name) and not self.is_excluded(name)
+
+    def _load_index(self) -> Dict[str, List[int]]:
+        try:
+            with open(os.path.join(self.dest_dir, INDEX_NAME), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index: Dict[str, List[int]]):
+        path = os.path.join(self.dest_dir, INDEX_NAME)
+        with open(path + ".tmp", "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+    def _archive(self) -> zipfile.ZipFile:
+        """This thread's own handle on the archive"""
+        handle = getattr(self._local, "archive", None)
+        if handle is None:
+            handle = self._local.archive = zipfile.ZipFile(self.archive_path)
+            with self._handles_lock:
+                self._handles.append(handle)
+        return handle
+
+    @staticmethod
+    def _edited_locally(target: str, entry: Optional[list]) -> bool:
+        """True if a file exists at target that isn't the copy we last extracted there"""
+        try:
+            stat = os.stat(target)
+        except OSError:
+            return False
+        if entry is None:
+            return True
+        if len(entry) < 4:
+            # Index from before file stats were recorded
+            return stat.st_size != entry[1]
+        return entry[2] is None or [stat.st_size, stat.st_mtime_ns] != entry[2:4]
+
+    @staticmethod
+    def _beside(target: str) -> str:
+        """A free name next to target for the archive's version of it"""
+        stem, ext = os.path.splitext(target)
+        candidate = f"{stem}{CONFLICT_SUFFIX}{ext}"
+        number = 2
+        while os.path.exists(candidate):
+            candidate = f"{stem}{CONFLICT_SUFFIX} {number}{ext}"
+            number += 1
+        return candidate
+
+    def _extract(self, info: zipfile.ZipInfo, target: str) -> Tuple[str, List[int]]:
+        """Write one member through a temporary file (runs on a pool thread); returns its path and stat"""
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = target + ".part"
+        with self._archive().open(info) as source, open(tmp, "wb") as out:
+            while True:
+                chunk = source.read(1 << 20)
+                if not chunk:
+                    break
+                out.write(chunk)
+        os.replace(tmp, target)
+        stat = os.stat(target)
+        return target, [stat.st_size, stat.st_mtime_ns]
+
+    def _run(self):
+        try:
+            self._import()
+        except Exception as e:
+            self.results.put(("error", f"{self.archive_path}: {e}"))
+        finally:
+            for handle in self._handles:
+                handle.close()
+            # Always, or the UI would keep polling for a job that has died
+            self.results.put(("done", None))
+
+    def _import(self):
+        os.makedirs(self.dest_dir, exist_ok=True)
+        index = self._load_index()
+        to_extract: List[Tuple[zipfile.ZipInfo, str, str, bool]] = []  # (member, index key, path, beside)
+        unchanged: List[str] = []
+        with zipfile.ZipFile(self.archive_path) as archive:
+            for info in archive.infolist():
+                if not self._wanted(info):
+                    continue
+                rel = safe_member_path(info.filename)
+                if rel is None:
+                    self.results.put(("error", f"Skipped unsafe path in archive: {info.filename}"))
+                    continue
+                self.members += 1
+                target = os.path.join(self.dest_dir, rel)
+                key = rel.replace(os.sep, "/")
+                entry = index.get(key)
+                if entry and entry[:2] == [info.CRC, info.file_size] and os.path.isfile(target):
+                    unchanged.append(target)
+                elif self._edited_locally(target, entry):
+                    to_extract.append((info, key, self._beside(target), True))
+                else:
+                    to_extract.append((info, key, target, False))
+        if unchanged:
+            self.results.put(("unchanged", unchanged))
+
+        batch: List[str] = []
+        conflicts: List[str] = []
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="docsmart-extract") as pool:
+            # Bounded window so a huge archive doesn't queue every member at once
+            pending = iter(to_extract)
+            in_flight = {}
+            try:
+                while True:
+                    while not self.cancelled and len(in_flight) < self.MAX_WORKERS * 2:
+                        item = next(pending, None)
+                        if item is None:
+                            break
+                        info, _, target, _ = item
+                        in_flight[pool.submit(self._extract, info, target)] = item
+                    if not in_flight:
+                        break
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        info, key, _, beside = in_flight.pop(future)
+                        try:
+                            path, stat = future.result()
+                        except (OSError, zipfile.BadZipFile, RuntimeError) as e:
+                            self.results.put(("error", f"{info.filename}: {e}"))
+                            continue
+                        if beside:
+                            # The file in place is the user's; remember this version was delivered
+                            conflicts.append(path)
+                            index[key] = [info.CRC, info.file_size, None, None]
+                        else:
+                            batch.append(path)
+                            index[key] = [info.CRC, info.file_size] + stat
+                    if len(batch) >= self.BATCH_SIZE:
+                        self.results.put(("extracted", batch))
+                        batch = []
+                    if len(conflicts) >= self.BATCH_SIZE:
+                        self.results.put(("conflict", conflicts))
+                        conflicts = []
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                self._save_index(index)
+        if batch:
+            self.results.put(("extracted", batch))
+        if conflicts:
+            self.results.put(("conflict", conflicts))
+
+
+def archive_folder(library_dir: Path, archive_path: str) -> str:
+    """Extraction folder for an archive: named after it, inside the library folder"""
+    stem = Path(archive_path).stem.strip() or "archive"
+    return str(library_dir / stem)
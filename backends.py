@@ -0,0 +1,478 @@
+"""
+Doc-smart document backends: open, close and list documents in an editor behind one interface
+"""
+
+import atexit
+import os
+import platform
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set
+
+from word_session import (UNSAVED_CHANGES, WD_DO_NOT_SAVE_CHANGES, WD_SAVE_CHANGES, CloseResult, WordSession,
+                          close_documents, document_key)
+
+if TYPE_CHECKING:
+    from launcher import LauncherService
+
+# Save policies for close(), independent of any one editor. PROMPT_TO_SAVE
+# closes only unmodified documents and reports the rest as UNSAVED_CHANGES
+# failures, so the caller can ask once for all of them.
+SAVE_CHANGES = "save"
+DISCARD_CHANGES = "discard"
+PROMPT_TO_SAVE = "prompt"
+
+# Names accepted by create_backend() and the document_backend setting
+AUTO = "auto"
+WORD = "word"
+LAUNCHER = "launcher"
+LIBREOFFICE = "libreoffice"
+FAKE = "fake"
+
+
+def is_url(target: str) -> bool:
+    return "://" in target
+
+
+class DocumentBackend:
+    """Opens and closes documents, given as file paths or URLs and identified by document_key()"""
+
+    name = ""
+    can_close = False
+    can_list = False
+    # Launches worth running at once in a batch
+    max_concurrency = 1
+
+    def open(self, target: str) -> Optional[Future]:
+        """Open a document; background launches return a Future that fails if the launch does"""
+        raise NotImplementedError
+
+    def worker(self) -> 'DocumentBackend':
+        """A backend for use on a worker thread; this one unless it is tied to its thread"""
+        return self
+
+    def prewarm(self) -> bool:
+        """Start or attach to the editor, blocking until ready; False if there is none to warm"""
+        return False
+
+    def close(self, targets: Iterable[str], save_policy: str = SAVE_CHANGES) -> CloseResult:
+        keys = list(dict.fromkeys(document_key(target) for target in targets))
+        return CloseResult([], [], [(key, f"{self.name} can't close documents") for key in keys], 0)
+
+    def list_open(self) -> Optional[Set[str]]:
+        """Keys of every document open in the editor, or None if that can't be known"""
+        return None
+
+    def open_in_window_order(self) -> Optional[List[str]]:
+        """Keys of open documents in the editor's window order, or None if that can't be known"""
+        return None
+
+    def is_open(self, target: str) -> Optional[bool]:
+        open_keys = self.list_open()
+        return None if open_keys is None else document_key(target) in open_keys
+
+    def subscribe(self, callback: Callable[[], None]) -> bool:
+        """Call callback() from any thread when the editor's open documents may have changed; False if unsupported"""
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class DesktopLauncherBackend(DocumentBackend):
+    """Hands documents to the desktop's default handler; can't close them or tell which are open"""
+
+    name = "Desktop launcher"
+    max_concurrency = 4
+
+    def __init__(self, service: Optional['LauncherService'] = None):
+        self.service = service
+        self.launches = 0
+
+    def open(self, target: str) -> Optional[Future]:
+        import subprocess
+        import webbrowser
+
+        self.launches += 1
+        system = platform.system()
+        if is_url(target):
+            # Try Word protocol first, fallback to browser
+            if system == "Windows":
+                try:
+                    os.startfile(f"ms-word:ofe|u|{target}")
+                    return
+                except OSError:
+                    pass
+            webbrowser.open(target)
+        elif system == "Windows":
+            os.startfile(target)
+        else:
+            argv = ["open" if system == "Darwin" else "xdg-open", target]
+            if self.service is not None:
+                return self.service.launch(argv)
+            subprocess.run(argv, check=True)
+        return None
+
+    def prewarm(self) -> bool:
+        # The handler application isn't known, but the launch loop can be ready
+        if self.service is not None:
+            self.service.start()
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {'launches': self.launches}
+        if self.service is not None:
+            stats['launch_failures'] = self.service.failures
+        return stats
+
+
+class WordComThread:
+    """One long-lived thread with its own COM apartment and Word session, running calls in order"""
+
+    def __init__(self, com: Any, fallback: DocumentBackend):
+        self.com = com
+        self.fallback = fallback
+        self.backend: Optional['WordComBackend'] = None  # lives on the thread
+        self._calls: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def call(self, action: Callable[['WordComBackend'], Any]) -> Any:
+        """Run action(backend) on the COM thread and wait for its result"""
+        with self._lock:
+            if self._thread is None:
+                atexit.register(self.stop)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="docsmart-word", daemon=True)
+                self._thread.start()
+        future: Future = Future()
+        self._calls.put((future, action))
+        return future.result()
+
+    def stop(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._calls.put(None)
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        import pythoncom
+        pythoncom.CoInitialize()
+        try:
+            self.backend = WordComBackend(WordSession(self.com), self.fallback)
+            while True:
+                item = self._calls.get()
+                if item is None:
+                    break
+                future, action = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(action(self.backend))
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            # COM references must go before the apartment does
+            if self.backend is not None:
+                self.backend.session.disconnect()
+            self.backend = None
+            pythoncom.CoUninitialize()
+
+
+class WordWorkerBackend(DocumentBackend):
+    """WordComBackend calls made from any thread, carried out on a shared WordComThread"""
+
+    name = "Microsoft Word"
+    can_close = True
+    can_list = True
+
+    def __init__(self, thread: WordComThread):
+        self.thread = thread
+
+    def open(self, target: str) -> Optional[Future]:
+        return self.thread.call(lambda backend: backend.open(target))
+
+    def close(self, targets: Iterable[str], save_policy: str = SAVE_CHANGES) -> CloseResult:
+        targets = list(targets)
+        return self.thread.call(lambda backend: backend.close(targets, save_policy))
+
+    def list_open(self) -> Optional[Set[str]]:
+        return self.thread.call(lambda backend: backend.list_open())
+
+    def open_in_window_order(self) -> Optional[List[str]]:
+        return self.thread.call(lambda backend: backend.open_in_window_order())
+
+
+class WordComBackend(DocumentBackend):
+    """Drives Microsoft Word over COM through one shared WordSession; URLs go to the launcher"""
+
+    name = "Microsoft Word"
+    can_close = True
+    can_list = True
+
+    SAVE_POLICIES = {
+        SAVE_CHANGES: WD_SAVE_CHANGES,
+        DISCARD_CHANGES: WD_DO_NOT_SAVE_CHANGES,
+        PROMPT_TO_SAVE: WD_DO_NOT_SAVE_CHANGES,  # only unmodified documents are closed
+    }
+
+    # How often (seconds) the pre-warm connection checks that Word is still there
+    KEEPALIVE_INTERVAL = 60.0
+
+    def __init__(self, session: WordSession, fallback: Optional[DocumentBackend] = None):
+        self.session = session
+        self.fallback = fallback or DesktopLauncherBackend()
+        self._keeper: Optional[threading.Thread] = None
+        self._listener: Optional[Callable[[], None]] = None
+        self._events = None
+        self._events_connection = 0  # session.connects value the events are bound to
+        self._worker_thread: Optional[WordComThread] = None
+
+    def open(self, target: str) -> Optional[Future]:
+        if is_url(target):
+            return self.fallback.open(target)
+        try:
+            self.session.open(target)
+        except Exception:
+            # Let the shell pick the handler if automation fails
+            return self.fallback.open(target)
+        self._bind_events()
+        return None
+
+    def worker(self) -> DocumentBackend:
+        """A backend for batch threads, sharing one long-lived Word session on a COM thread"""
+        if self._worker_thread is None:
+            self._worker_thread = WordComThread(self.session.com, self.fallback)
+        return WordWorkerBackend(self._worker_thread)
+
+    def prewarm(self) -> bool:
+        """Start Word on a keeper thread that holds a reference, so Word stays up for later attaches"""
+        if self._keeper is not None and self._keeper.is_alive():
+            return True
+        ready = threading.Event()
+        failure: List[Exception] = []
+
+        def keep():
+            import pythoncom
+            pythoncom.CoInitialize()
+            session = WordSession(self.session.com)
+            try:
+                try:
+                    session.run(lambda word_app: word_app.Documents.Count)
+                except Exception as e:
+                    failure.append(e)
+                    return
+                finally:
+                    ready.set()
+                while session.peek(lambda word_app: word_app.Documents.Count) is not None:
+                    time.sleep(self.KEEPALIVE_INTERVAL)
+            except Exception:
+                pass
+            finally:
+                session.disconnect()
+                pythoncom.CoUninitialize()
+
+        self._keeper = threading.Thread(target=keep, name="docsmart-word-keeper", daemon=True)
+        self._keeper.start()
+        ready.wait()
+        if failure:
+            raise failure[0]
+        return True
+
+    def close(self, targets: Iterable[str], save_policy: str = SAVE_CHANGES) -> CloseResult:
+        return close_documents(self.session, (document_key(target) for target in targets),
+                               save_changes=self.SAVE_POLICIES[save_policy],
+                               keep_unsaved=save_policy == PROMPT_TO_SAVE)
+
+    def list_open(self) -> Optional[Set[str]]:
+        def read(word_app) -> Set[str]:
+            documents = word_app.Documents
+            return {document_key(documents.Item(index).FullName) for index in range(1, documents.Count + 1)}
+        try:
+            # Word not running means nothing is open; it is never started just to look
+            open_keys = self.session.peek(read, set())
+        except Exception:
+            return None
+        self._bind_events()
+        return open_keys
+
+    def open_in_window_order(self) -> Optional[List[str]]:
+        def read(word_app) -> List[str]:
+            windows = word_app.Windows
+            return [document_key(windows.Item(index).Document.FullName) for index in range(1, windows.Count + 1)]
+        try:
+            # A document split into several windows is listed once
+            return list(dict.fromkeys(self.session.peek(read, [])))
+        except Exception:
+            return None
+
+    def subscribe(self, callback: Callable[[], None]) -> bool:
+        self._listener = callback
+        return self._bind_events()
+
+    def _bind_events(self) -> bool:
+        """(Re)attach Word application events after each new connection"""
+        if self._listener is None or not self.session.connected:
+            return False
+        if self._events_connection == self.session.connects:
+            return self._events is not None
+        listener = self._listener
+        handler = type("WordEvents", (), {
+            "OnDocumentOpen": lambda _self, doc: listener(),
+            "OnDocumentBeforeClose": lambda _self, doc, cancel: listener(),
+            "OnQuit": lambda _self: listener(),
+        })
+        self._events_connection = self.session.connects
+        try:
+            self._events = self.session.com.WithEvents(self.session.connect(), handler)
+        except Exception:
+            self._events = None
+        return self._events is not None
+
+    def stats(self) -> Dict[str, Any]:
+        return {'word_connections': self.session.connects, 'word_calls': self.session.calls}
+
+
+class FakeBackend(DocumentBackend):
+    """Thread-safe in-memory editor with configurable latency and failures, for benchmarks and headless runs"""
+
+    name = "Fake editor"
+    can_close = True
+    can_list = True
+    max_concurrency = 8
+
+    def __init__(self, open_latency: float = 0.0, close_latency: float = 0.0, list_latency: float = 0.0,
+                 failure_rate: float = 0.0, seed: Optional[int] = None, start_latency: float = 0.0):
+        self.start_latency = start_latency
+        self._start_lock = threading.Lock()
+        self.started = False
+        self.open_latency = open_latency
+        self.close_latency = close_latency
+        self.list_latency = list_latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._open: Dict[str, str] = {}  # key -> target, in open order
+        self._modified: Set[str] = set()
+        self.saves = 0
+        self.calls = 0
+        self.opens = 0
+        self.failures = 0
+        self._listener: Optional[Callable[[], None]] = None
+
+    def _changed(self):
+        if self._listener is not None:
+            self._listener()
+
+    def _call(self, latency: float):
+        with self._lock:
+            self.calls += 1
+        if latency:
+            time.sleep(latency)
+
+    def _start(self):
+        with self._start_lock:
+            if not self.started:
+                time.sleep(self.start_latency)
+                self.started = True
+
+    def prewarm(self) -> bool:
+        self._start()
+        return True
+
+    def open(self, target: str) -> Optional[Future]:
+        self._start()
+        self._call(self.open_latency)
+        with self._lock:
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                self.failures += 1
+                raise OSError(f"launch failed: {target}")
+            self.opens += 1
+            self._open.setdefault(document_key(target), target)
+        self._changed()
+        return None
+
+    def close(self, targets: Iterable[str], save_policy: str = SAVE_CHANGES) -> CloseResult:
+        closed: List[str] = []
+        not_open: List[str] = []
+        failed = []
+        calls = 0
+        for key in dict.fromkeys(document_key(target) for target in targets):
+            with self._lock:
+                is_open = key in self._open
+                modified = key in self._modified
+            if not is_open:
+                not_open.append(key)
+                continue
+            if modified and save_policy == PROMPT_TO_SAVE:
+                failed.append((key, UNSAVED_CHANGES))
+                continue
+            self._call(self.close_latency)
+            calls += 1
+            with self._lock:
+                self._open.pop(key, None)
+                self._modified.discard(key)
+                if modified and save_policy == SAVE_CHANGES:
+                    self.saves += 1
+            closed.append(key)
+        if closed:
+            self._changed()
+        return CloseResult(closed, not_open, failed, calls)
+
+    def modify(self, target: str):
+        """Give an open document unsaved changes"""
+        with self._lock:
+            if document_key(target) in self._open:
+                self._modified.add(document_key(target))
+
+    def list_open(self) -> Optional[Set[str]]:
+        self._call(self.list_latency)
+        with self._lock:
+            return set(self._open)
+
+    def open_targets(self) -> List[str]:
+        """Open documents in the order they were opened"""
+        with self._lock:
+            return list(self._open.values())
+
+    def open_in_window_order(self) -> Optional[List[str]]:
+        with self._lock:
+            return list(self._open)
+
+    def close_externally(self, target: str):
+        """Close a document behind the app's back, as a user closing a window would"""
+        with self._lock:
+            self._open.pop(document_key(target), None)
+        self._changed()
+
+    def subscribe(self, callback: Callable[[], None]) -> bool:
+        self._listener = callback
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {'calls': self.calls, 'opens': self.opens, 'failures': self.failures, 'saves': self.saves}
+
+
+def libreoffice_available() -> bool:
+    """True if LibreOffice and its Python bindings (uno) are installed"""
+    import importlib.util
+    import shutil
+    return importlib.util.find_spec("uno") is not None and shutil.which("soffice") is not None
+
+
+def create_backend(name: str = AUTO, word_com: Any = None) -> DocumentBackend:
+    """Backend for a document_backend setting ("auto" picks Word, LibreOffice or the launcher)"""
+    if name == FAKE:
+        return FakeBackend(open_latency=float(os.environ.get("DOCSMART_FAKE_LATENCY", "0")))
+    if name in (AUTO, WORD) and word_com:
+        return WordComBackend(WordSession(word_com))
+    if name == LIBREOFFICE or (name == AUTO and platform.system() == "Linux" and libreoffice_available()):
+        from libreoffice import UnoConnection, LibreOfficeBackend
+        return LibreOfficeBackend(UnoConnection(headless=os.environ.get("DOCSMART_OFFICE_HEADLESS") == "1"))
+    if platform.system() == "Windows":
+        return DesktopLauncherBackend()
+    # asyncio is slow to import, so only pay for it where launchers are subprocesses
+    from launcher import LauncherService
+    return DesktopLauncherBackend(LauncherService())
@@ -0,0 +1,77 @@
+"""
+Doc-smart batch close: close many documents with one save policy on a worker thread
+"""
+
+import queue
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from backends import SAVE_CHANGES, DocumentBackend
+from word_session import UNSAVED_CHANGES
+
+
+class BatchCloseJob:
+    """Closes documents in chunks through one backend session on a worker thread"""
+
+    CHUNK_SIZE = 20
+
+    def __init__(self, backend: DocumentBackend, targets: Dict[str, str], save_policy: str = SAVE_CHANGES):
+        self.backend = backend
+        self.targets = targets
+        self.save_policy = save_policy
+        # ("closed"|"not_open"|"unsaved"|"failed"|"calls", ...), then ("done", None)
+        self.results: queue.Queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="docsmart-batch-close", daemon=True)
+
+        self.closed = 0
+        self.not_open = 0
+        self.unsaved: List[str] = []
+        self.failures: List[Tuple[str, str]] = []
+        self.backend_calls = 0
+        self.started_at = 0.0
+        self.finished_at = 0.0
+        self.panel = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at if self.started_at else 0.0
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _run(self):
+        keys = list(self.targets)
+        try:
+            backend = self.backend.worker()
+        except Exception as e:
+            # No session at all, e.g. the editor's automation couldn't start
+            self.results.put(("failed", [(key, str(e)) for key in keys]))
+            self.results.put(("done", None))
+            return
+        for start in range(0, len(keys), self.CHUNK_SIZE):
+            if self.cancelled:
+                break
+            chunk = keys[start:start + self.CHUNK_SIZE]
+            try:
+                result = backend.close([self.targets[key] for key in chunk], self.save_policy)
+            except Exception as e:
+                self.results.put(("failed", [(key, str(e)) for key in chunk]))
+                continue
+            unsaved = [key for key, error in result.failed if error == UNSAVED_CHANGES]
+            failed = [(key, error) for key, error in result.failed if error != UNSAVED_CHANGES]
+            self.results.put(("calls", result.com_calls))
+            for kind, payload in (("closed", result.closed), ("not_open", result.not_open),
+                                  ("unsaved", unsaved), ("failed", failed)):
+                if payload:
+                    self.results.put((kind, payload))
+        self.results.put(("done", None))
@@ -0,0 +1,131 @@
+"""
+Doc-smart batch open: open many documents through a backend with a bounded window and retries
+"""
+
+import heapq
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, NamedTuple, Optional, Tuple
+
+from backends import DocumentBackend, is_url
+
+
+class OpenRequest(NamedTuple):
+    doc_id: str
+    target: str  # file path or URL
+    priority: int = 0  # lower opens first
+
+
+class BatchOpenJob:
+    """Opens documents on worker threads in priority order, a bounded window at a time, with retries"""
+
+    def __init__(self, backend: DocumentBackend, requests: List[OpenRequest], max_concurrent: Optional[int] = None,
+                 retries: int = 2, backoff: float = 0.5, in_order: bool = False):
+        self.backend = backend
+        self.requests = sorted(requests, key=lambda request: request.priority)
+        self.in_order = in_order
+        if in_order:
+            max_concurrent = 1
+        self.max_concurrent = max(1, min(max_concurrent or backend.max_concurrency, len(self.requests) or 1))
+        self.retries = retries
+        self.backoff = backoff
+        self.results: queue.Queue = queue.Queue()  # ("opened"|"missing"|"failed", ...), ("done", None)
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="docsmart-batch-open", daemon=True)
+        self._local = threading.local()
+
+        self.retried = 0
+        self.opened = 0
+        self.missing = 0
+        self.skipped = 0  # left out by the caller as already open
+        self.failures: List[Tuple[str, str]] = []
+        self.started_at = 0.0
+        self.finished_at = 0.0
+        self.panel = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at if self.started_at else 0.0
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.opened / self.elapsed if self.elapsed else 0.0
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _open(self, request: OpenRequest) -> bool:
+        """Open one document (runs on a pool thread); False if its file is missing"""
+        if not is_url(request.target) and not os.path.exists(request.target):
+            return False
+        backend = getattr(self._local, "backend", None)
+        if backend is None:
+            backend = self._local.backend = self.backend.worker()
+        launch = backend.open(request.target)
+        if launch is not None:
+            launch.result()  # background launches fail through their future
+        return True
+
+    def _run(self):
+        # (due time, sequence, attempt, request) for launches waiting to be retried
+        delayed: List[Tuple[float, int, int, OpenRequest]] = []
+        pending = iter(self.requests)
+        in_flight = {}
+        sequence = 0
+        with ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="docsmart-open") as pool:
+            while not self.cancelled:
+                now = time.monotonic()
+                while len(in_flight) < self.max_concurrent:
+                    if delayed and delayed[0][0] <= now:
+                        _, _, attempt, request = heapq.heappop(delayed)
+                    elif delayed and self.in_order:
+                        break
+                    else:
+                        request = next(pending, None)
+                        if request is None:
+                            break
+                        attempt = 0
+                    in_flight[pool.submit(self._open, request)] = (attempt, request)
+                if not in_flight and not delayed:
+                    break
+
+                timeout = max(0.0, delayed[0][0] - now) if delayed else None
+                if not in_flight:
+                    self.cancel_event.wait(timeout)
+                    continue
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                opened, missing, failed = [], [], []
+                for future in done:
+                    attempt, request = in_flight.pop(future)
+                    try:
+                        (opened if future.result() else missing).append(request.doc_id)
+                    except Exception as e:
+                        if attempt < self.retries:
+                            self.retried += 1
+                            sequence += 1
+                            due = time.monotonic() + self.backoff * (2 ** attempt)
+                            heapq.heappush(delayed, (due, sequence, attempt + 1, request))
+                        else:
+                            failed.append((request.doc_id, str(e)))
+                for kind, payload in (("opened", opened), ("missing", missing), ("failed", failed)):
+                    if payload:
+                        self.results.put((kind, payload))
+            for future in in_flight:
+                future.cancel()
+        # Launches already under way when cancelled still count
+        opened = [request.doc_id for future, (_, request) in in_flight.items()
+                  if not future.cancelled() and future.exception() is None and future.result()]
+        if opened:
+            self.results.put(("opened", opened))
+        self.results.put(("done", None))
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Backend benchmark: batch open/close throughput against the fake editor backend.
+
+Runs headless with FakeBackend standing in for Word, each call sleeping for
+the configured latency. Opens a batch one at a time and then through a
+thread pool, closes everything in one batch call, and checks after each
+step that list_open() agrees with what was asked for. Finally runs a
+BatchOpenJob against a backend that drops some launches, to time the
+throttled, retrying batch open, and drives the LibreOffice backend
+against StubOffice to check one UNO connection serves the whole batch.
+
+    python benchmarks/bench_backends.py
+    python benchmarks/bench_backends.py --docs 200 --open-latency 0.05 --workers 8
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backends import FakeBackend  # noqa: E402
+from batch_open import BatchOpenJob, OpenRequest  # noqa: E402
+from libreoffice import LibreOfficeBackend, StubOffice  # noqa: E402
+from word_session import document_key  # noqa: E402
+
+
+def make_targets(count: int):
+    return [str(Path("/evidence") / f"team{i % 8}" / f"card_{i}.docx") for i in range(count)]
+
+
+def check_open(backend: FakeBackend, expected):
+    assert backend.list_open() == {document_key(target) for target in expected}, "list_open() disagrees"
+
+
+def report(label: str, seconds: float, count: int):
+    rate = count / seconds if seconds else float("inf")
+    print(f"{label:<26}{seconds * 1000:>10.0f} ms  {rate:>8.1f} docs/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=60)
+    parser.add_argument("--open-latency", type=float, default=0.02, help="seconds per open")
+    parser.add_argument("--close-latency", type=float, default=0.005, help="seconds per close")
+    parser.add_argument("--workers", type=int, default=6)
+    parser.add_argument("--failure-rate", type=float, default=0.1, help="share of launches that fail")
+    args = parser.parse_args()
+
+    targets = make_targets(args.docs)
+    backend = FakeBackend(args.open_latency, args.close_latency)
+    print(f"{args.docs} documents, {args.open_latency * 1000:.0f} ms open / "
+          f"{args.close_latency * 1000:.0f} ms close latency")
+
+    start = time.perf_counter()
+    for target in targets:
+        backend.open(target)
+    report("open, one at a time", time.perf_counter() - start, len(targets))
+    check_open(backend, targets)
+
+    start = time.perf_counter()
+    result = backend.close(targets)
+    report("close, one batch", time.perf_counter() - start, len(result.closed))
+    assert len(result.closed) == len(targets) and not result.failed
+    check_open(backend, [])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(backend.open, targets))
+    report(f"open, {args.workers} concurrent", time.perf_counter() - start, len(targets))
+    check_open(backend, targets)
+
+    half = targets[::2]
+    result = backend.close(half + ["/evidence/not_open.docx"])
+    assert len(result.closed) == len(half) and len(result.not_open) == 1
+    check_open(backend, targets[1::2])
+    print(f"{'backend calls':<26}{backend.calls:>10}")
+
+    flaky = FakeBackend(args.open_latency, failure_rate=args.failure_rate, seed=1)
+    # URL targets, so the job doesn't check for files that don't exist here
+    requests = [OpenRequest(str(i), "fake://" + target) for i, target in enumerate(targets)]
+    job = BatchOpenJob(flaky, requests, max_concurrent=args.workers, backoff=0.01)
+    start = time.perf_counter()
+    job.start()
+    opened = failed = 0
+    while True:
+        kind, payload = job.results.get()
+        if kind == "done":
+            break
+        opened += len(payload) if kind == "opened" else 0
+        failed += len(payload) if kind == "failed" else 0
+    report(f"batch job, {args.workers} window", time.perf_counter() - start, opened)
+    print(f"{'retried / failed':<26}{job.retried:>10} / {failed}")
+    assert len(flaky.list_open()) == opened and opened + failed == len(requests)
+
+    office = StubOffice(start_latency=0.5, call_latency=args.open_latency)
+    libreoffice = LibreOfficeBackend(office.connection())
+    urls = ["https://example.org" + target for target in targets]
+    start = time.perf_counter()
+    for launch in [libreoffice.open(url) for url in urls]:
+        launch.result()
+    report("LibreOffice stub, open", time.perf_counter() - start, len(urls))
+    start = time.perf_counter()
+    result = libreoffice.close(urls)
+    report("LibreOffice stub, close", time.perf_counter() - start, len(result.closed))
+    assert len(result.closed) == len(urls) and not libreoffice.list_open()
+    print(f"{'office connections':<26}{office.connects:>10}")
+
+
+if __name__ == "__main__":
+    main()
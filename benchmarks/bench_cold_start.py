@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: time to first paint and time to interactive.
+
+Launches Doc-smart repeatedly against a synthetic library in a throwaway home
+directory, once per run, in both eager and fast startup modes. Each run starts
+a fresh interpreter (or the built exe with --exe), so import costs are included.
+
+    python benchmarks/bench_cold_start.py --runs 5 --docs 5000
+    python benchmarks/bench_cold_start.py --exe installer/dist/Doc-smart/Doc-smart.exe
+
+Needs a display (use xvfb-run on a headless Linux box).
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def write_library(home: Path, doc_count: int, team_count: int = 20):
+    """Write a reproducible synthetic data.json under home/.docsmart"""
+    rng = random.Random(42)
+    teams = {f"team_{i:04d}": {'id': f"team_{i:04d}", 'name': f"Team {i}", 'created_at': 1.7e9}
+             for i in range(team_count)}
+    team_ids = list(teams)
+    docs = {}
+    for i in range(doc_count):
+        doc_id = f"doc_{i:06d}"
+        name = ''.join(rng.choices(string.ascii_lowercase, k=12)) + ".docx"
+        docs[doc_id] = {
+            'id': doc_id,
+            'name': name,
+            'source_type': "file",
+            'url': None,
+            'file_path': f"/evidence/{rng.choice(team_ids)}/{name}",
+            'tags': rng.sample(["aff", "neg", "k", "cp", "da", "theory", "t"], k=2),
+            'team_id': rng.choice(team_ids + [None]),
+            'favorite': rng.random() < 0.1,
+            'is_open': False,
+            'last_opened_at': 1.7e9 + rng.random() * 1e7 if rng.random() < 0.5 else None,
+            'created_at': 1.7e9
+        }
+    data_dir = home / ".docsmart"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    with open(data_dir / "data.json", 'w') as f:
+        json.dump({'docs': docs, 'teams': teams, 'selected_team_id': None}, f)
+
+
+def launch(command, env) -> dict:
+    """Run one cold start and return millisecond offsets from launch"""
+    started = time.time()
+    result = subprocess.run(command + ["--startup-benchmark"], env=env,
+                            capture_output=True, text=True, timeout=120)
+    lines = [line for line in result.stdout.splitlines() if line.startswith("{")]
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(result.stderr.strip() or "no timings reported")
+    marks = json.loads(lines[-1])
+    return {name: (stamp - started) * 1000 for name, stamp in marks.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--docs", type=int, default=5000, help="documents in the synthetic library")
+    parser.add_argument("--exe", help="benchmark a built executable instead of docsmart.py")
+    args = parser.parse_args()
+
+    command = [args.exe] if args.exe else [sys.executable, str(REPO_ROOT / "docsmart.py")]
+
+    with tempfile.TemporaryDirectory() as home:
+        write_library(Path(home), args.docs)
+        env = dict(os.environ, HOME=home, USERPROFILE=home)
+
+        print(f"{args.runs} runs, {args.docs} documents, {' '.join(command)}")
+        print(f"{'mode':<8}{'first paint (ms)':>20}{'interactive (ms)':>20}")
+        for mode, extra in (("eager", ["--eager-start"]), ("fast", [])):
+            runs = [launch(command + extra, env) for _ in range(args.runs)]
+            paint = statistics.median(run['first_paint'] for run in runs)
+            ready = statistics.median(run['interactive'] for run in runs)
+            print(f"{mode:<8}{paint:>20.0f}{ready:>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
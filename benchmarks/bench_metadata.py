@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Metadata benchmark: sequential .docx property extraction vs. the process pool.
+
+Builds synthetic .docx packages with docProps/core.xml and app.xml, then
+times a plain loop over extract_metadata, the pooled MetadataExtractor, and
+a second pooled run that is served from the (path, size, mtime) cache.
+
+    python benchmarks/bench_metadata.py
+    python benchmarks/bench_metadata.py --files 20000 --workers 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import DirectoryCrawler  # noqa: E402
+from metadata import MetadataCache, MetadataExtractor, extract_metadata  # noqa: E402
+
+CORE_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties"
+ xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/"
+ xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+<dc:title>Card file {i}</dc:title><dc:creator>Coach {author}</dc:creator>
+<dcterms:modified xsi:type="dcterms:W3CDTF">2024-01-{day:02d}T10:00:00Z</dcterms:modified>
+</cp:coreProperties>"""
+
+APP_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">
+<Pages>{pages}</Pages><Words>{words}</Words></Properties>"""
+
+
+def build_files(root: Path, count: int, body_kb: int):
+    body = ("<w:p>" + "evidence " * 100 + "</w:p>") * max(1, body_kb)
+    for i in range(count):
+        directory = root / f"team{i % 20}"
+        directory.mkdir(exist_ok=True)
+        with zipfile.ZipFile(directory / f"card_{i}.docx", "w", zipfile.ZIP_DEFLATED) as package:
+            package.writestr("word/document.xml", body)
+            package.writestr("docProps/core.xml", CORE_XML.format(i=i, author=i % 7, day=i % 28 + 1))
+            package.writestr("docProps/app.xml", APP_XML.format(pages=i % 40 + 1, words=i * 13 % 9000))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def sequential(files) -> int:
+    return sum(1 for found in files if extract_metadata(found.path) is not None)
+
+
+def pooled(files, workers: int, cache: MetadataCache) -> int:
+    with MetadataExtractor(cache, max_workers=workers) as extractor:
+        extractor.submit(files)
+        return sum(len(results) for results in extractor.drain())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--body-kb", type=int, default=8, help="approximate size of each document body")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "files"
+        root.mkdir()
+        build_files(root, args.files, args.body_kb)
+        files = [found for batch in DirectoryCrawler([str(root)], with_stat=True).crawl() for found in batch]
+        print(f"{len(files)} synthetic .docx files")
+
+        seconds, count = timed(sequential, files)
+        print(f"{'sequential loop':<28}{seconds * 1000:>10.0f} ms  {count} extracted")
+
+        cache = MetadataCache(Path(tmp) / "cache.json")
+        seconds, count = timed(pooled, files, args.workers, cache)
+        print(f"{f'process pool, {args.workers} workers':<28}{seconds * 1000:>10.0f} ms  {count} extracted")
+
+        cache = MetadataCache(Path(tmp) / "cache.json").load()
+        seconds, count = timed(pooled, files, args.workers, cache)
+        print(f"{'process pool, cached':<28}{seconds * 1000:>10.0f} ms  {count} from cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Pre-warm benchmark: first-open latency with and without a pre-warmed editor.
+
+For each backend, times the first open of a session from cold, then in a
+fresh session after prewarm() has finished. The fake backend and the
+LibreOffice stub model the editor's start-up cost with --start-latency;
+pass --backend word/libreoffice/auto and --file to measure a real editor
+(close it between runs so the cold run really is cold).
+
+    python benchmarks/bench_prewarm.py
+    python benchmarks/bench_prewarm.py --backend libreoffice --file ~/cards/aff.docx
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backends import FAKE, FakeBackend, create_backend  # noqa: E402
+from libreoffice import LibreOfficeBackend, StubOffice  # noqa: E402
+
+
+def first_open(make_backend, target: str, prewarm: bool):
+    """(prewarm seconds, first open seconds) for a fresh backend"""
+    backend = make_backend()
+    warm_seconds = 0.0
+    if prewarm:
+        start = time.perf_counter()
+        backend.prewarm()
+        warm_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    launch = backend.open(target)
+    if launch is not None:
+        launch.result()
+    return warm_seconds, time.perf_counter() - start
+
+
+def report(label: str, make_backend, target: str):
+    _, cold = first_open(make_backend, target, prewarm=False)
+    warm_up, warm = first_open(make_backend, target, prewarm=True)
+    print(f"{label:<20}{cold * 1000:>10.0f} ms  {warm * 1000:>10.0f} ms  {warm_up * 1000:>10.0f} ms")
+
+
+def load_word_com():
+    try:
+        import win32com.client
+        return win32com.client
+    except ImportError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--start-latency", type=float, default=1.5, help="simulated editor start-up, seconds")
+    parser.add_argument("--open-latency", type=float, default=0.05, help="simulated document load, seconds")
+    parser.add_argument("--backend", default=FAKE, help="fake (simulated) or a document_backend setting")
+    parser.add_argument("--file", help="document to open with a real backend")
+    args = parser.parse_args()
+
+    print(f"{'':<20}{'cold':>13}  {'pre-warmed':>13}  {'pre-warm took':>13}")
+    if args.backend != FAKE:
+        if not args.file:
+            parser.error("--file is needed to measure a real editor")
+        report(args.backend, lambda: create_backend(args.backend, load_word_com()), os.path.abspath(args.file))
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".docx") as document:
+        report("fake editor", lambda: FakeBackend(args.open_latency, start_latency=args.start_latency),
+               document.name)
+        report("LibreOffice stub",
+               lambda: LibreOfficeBackend(StubOffice(args.start_latency, args.open_latency).connection()),
+               document.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Rules benchmark: the combined rule matcher vs. testing every rule on every file.
+
+Generates synthetic library paths and a rule set split between folder-name
+rules and file-name glob rules, then times CompiledRules.match against a
+loop that checks each rule in turn with fnmatch.
+
+    python benchmarks/bench_rules.py
+    python benchmarks/bench_rules.py --rules 200 --files 50000
+"""
+
+import argparse
+import fnmatch
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rules import FOLDER, NAME, CompiledRules, Rule  # noqa: E402
+
+SCHOOLS = ["Harvard", "Yale", "Berkeley", "Emory", "Dartmouth", "Kansas", "Wake", "Michigan"]
+SIDES = ["Aff", "Neg", "K", "CP", "DA", "T", "Theory", "Impact"]
+
+
+def make_rules(count: int, rng: random.Random):
+    rules = []
+    for i in range(count):
+        word = f"{rng.choice(SCHOOLS + SIDES)}{i}"
+        if i % 2:
+            rules.append(Rule(FOLDER, word, tag=word.lower()))
+        else:
+            rules.append(Rule(NAME, f"*_{word}_*", team=word))
+    return rules
+
+
+def make_paths(count: int, rules, rng: random.Random):
+    words = [rule.pattern.strip("*_") for rule in rules]
+    paths = []
+    for i in range(count):
+        folders = [rng.choice(words) if rng.random() < 0.3 else f"dir{rng.randrange(50)}" for _ in range(4)]
+        name = f"card_{rng.choice(words) if rng.random() < 0.3 else 'misc'}_{i}.docx"
+        paths.append(os.path.join(os.sep, "evidence", *folders, name))
+    return paths
+
+
+def naive_match(rules, path: str):
+    """Each rule checked on its own, as a straightforward loop would"""
+    directory, name = os.path.split(path)
+    segments = {segment.lower() for segment in directory.split(os.sep)}
+    tags, team = [], None
+    for rule in rules:
+        if rule.kind == FOLDER:
+            hit = rule.pattern.lower() in segments
+        else:
+            hit = fnmatch.fnmatch(name.lower(), rule.pattern.lower())
+        if hit:
+            if rule.tag and rule.tag not in tags:
+                tags.append(rule.tag)
+            if rule.team and team is None:
+                team = rule.team
+    return tags, team
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rules", type=int, default=200)
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rules = make_rules(args.rules, rng)
+    paths = make_paths(args.files, rules, rng)
+
+    start = time.perf_counter()
+    compiled = CompiledRules(rules)
+    compile_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    combined = [compiled.match(path) for path in paths]
+    combined_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive = [naive_match(rules, path) for path in paths]
+    naive_seconds = time.perf_counter() - start
+
+    assert [(m.tags, m.team) for m in combined] == naive, "matchers disagree"
+    print(f"{args.rules} rules, {args.files} files")
+    print(f"{'combined matcher':<22}{combined_seconds * 1000:>10.0f} ms  (+{compile_seconds * 1000:.0f} ms to compile)")
+    print(f"{'rule-by-rule loop':<22}{naive_seconds * 1000:>10.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Doc-smart bulk import: stream document lists from CSV or JSONL manifests
+"""
+
+import csv
+import json
+import os
+import queue
+import threading
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from health import FileHealthCache, check_paths
+
+# Accepted column names, first match wins
+PATH_COLUMNS = ("path", "file_path", "file")
+TRUE_VALUES = {"1", "true", "yes", "y", "x", "★"}
+
+
+class ManifestRow(NamedTuple):
+    line: int
+    source_type: str  # "file" or "url"
+    path: Optional[str]
+    url: Optional[str]
+    name: str
+    team: Optional[str]
+    tags: List[str]
+    favorite: bool
+
+
+class RowError(NamedTuple):
+    line: int
+    message: str
+
+
+def _parse_tags(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return [str(tag).strip() for tag in value if str(tag).strip()]
+    if not value:
+        return []
+    separator = ";" if ";" in value else ","
+    return [tag.strip() for tag in value.split(separator) if tag.strip()]
+
+
+def _parse_favorite(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in TRUE_VALUES
+
+
+def parse_record(line: int, record: Dict[str, Any], base_dir: str) -> ManifestRow:
+    """Turn one CSV or JSON record into a row; raises ValueError if it is unusable"""
+    record = {str(key).strip().lower(): value for key, value in record.items() if key is not None}
+    path = next((str(record[key]).strip() for key in PATH_COLUMNS if record.get(key)), None)
+    url = str(record.get("url") or "").strip() or None
+    if path and url:
+        raise ValueError("has both a path and a url")
+    if not path and not url:
+        raise ValueError("needs a path or a url")
+
+    if path:
+        path = os.path.normpath(os.path.join(base_dir, os.path.expanduser(path)))
+    name = str(record.get("name") or "").strip()
+    if not name:
+        name = os.path.basename(path) if path else url
+    team = str(record.get("team") or "").strip() or None
+    return ManifestRow(line, "file" if path else "url", path, url, name, team,
+                       _parse_tags(record.get("tags")), _parse_favorite(record.get("favorite")))
+
+
+def read_manifest(manifest_path: str) -> Iterator[Tuple[Optional[ManifestRow], Optional[RowError]]]:
+    """Yield (row, None) or (None, error) for each record of a CSV or JSON-lines manifest"""
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path, "r", encoding="utf-8-sig", newline="") as f:
+        if manifest_path.lower().endswith((".jsonl", ".ndjson")):
+            for line, text in enumerate(f, start=1):
+                if not text.strip():
+                    continue
+                try:
+                    record = json.loads(text)
+                    if not isinstance(record, dict):
+                        raise ValueError("is not a JSON object")
+                    yield parse_record(line, record, base_dir), None
+                except ValueError as e:
+                    yield None, RowError(line, str(e))
+        else:
+            reader = csv.DictReader(f)
+            for record in reader:
+                # Header is line 1; reader.line_num also counts quoted newlines
+                try:
+                    yield parse_record(reader.line_num, record, base_dir), None
+                except ValueError as e:
+                    yield None, RowError(reader.line_num, str(e))
+
+
+class ManifestImportJob:
+    """Reads a manifest on a worker thread and streams checked rows back a few chunks at a time"""
+
+    CHUNK_SIZE = 500
+    MAX_QUEUED_CHUNKS = 4
+    MAX_ERRORS = 10000
+
+    def __init__(self, manifest_path: str, health_cache: FileHealthCache):
+        self.manifest_path = manifest_path
+        self.health_cache = health_cache
+        self.results: queue.Queue = queue.Queue(maxsize=self.MAX_QUEUED_CHUNKS * 2)
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="docsmart-manifest-import", daemon=True)
+
+        self.read = 0
+        self.imported = 0
+        self.skipped = 0
+        self.teams_created = 0
+        self.error_count = 0
+        self.errors: List[RowError] = []  # the first MAX_ERRORS, for the report
+        # Owned by the UI thread: lower-cased team name -> id, and URLs already in the library
+        self.team_index: Dict[str, str] = {}
+        self.known_urls: set = set()
+        self.panel = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def add_errors(self, errors: List[RowError]):
+        self.error_count += len(errors)
+        self.errors.extend(errors[:max(0, self.MAX_ERRORS - len(self.errors))])
+
+    def _put(self, message) -> bool:
+        """Post to the UI thread, waiting for room; False once cancelled"""
+        while not self.cancel_event.is_set():
+            try:
+                self.results.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        try:
+            chunk: List[ManifestRow] = []
+            errors: List[RowError] = []
+            for row, error in read_manifest(self.manifest_path):
+                self.read += 1
+                if error is not None:
+                    errors.append(error)
+                else:
+                    chunk.append(row)
+                if len(chunk) + len(errors) >= self.CHUNK_SIZE:
+                    if not self._flush(chunk, errors):
+                        break
+                    chunk, errors = [], []
+            else:
+                self._flush(chunk, errors)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            self._put(("errors", [RowError(0, f"Could not read manifest: {e}")]))
+        self.results.put(("done", None))
+
+    def _flush(self, chunk: List[ManifestRow], errors: List[RowError]) -> bool:
+        paths = [row.path for row in chunk if row.source_type == "file"]
+        exists = {}
+        for batch in check_paths(paths, self.health_cache, cancel_event=self.cancel_event):
+            exists.update((probe.path, probe.exists) for probe in batch)
+
+        rows = []
+        for row in chunk:
+            if row.source_type == "file" and not exists.get(row.path):
+                errors.append(RowError(row.line, f"file not found: {row.path}"))
+            else:
+                rows.append(row)
+        errors.sort()
+        return (not rows or self._put(("rows", rows))) and (not errors or self._put(("errors", errors)))
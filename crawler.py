@@ -0,0 +1,148 @@
+"""
+Doc-smart crawler: parallel os.scandir directory walk for folder imports
+"""
+
+import fnmatch
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+DEFAULT_INCLUDE = ("*.docx", "*.doc")
+DEFAULT_EXCLUDE = ("~$*",)  # Word lock files
+
+
+class FoundFile(NamedTuple):
+    path: str
+    name: str
+    # Filled in only when the crawler is created with with_stat=True
+    size: Optional[int] = None
+    mtime: Optional[float] = None
+    inode: Optional[int] = None
+
+
+def compile_globs(patterns: Iterable[str]) -> Callable[[str], bool]:
+    """Combine glob patterns into one case-insensitive matcher"""
+    patterns = [p.strip() for p in patterns if p and p.strip()]
+    if not patterns:
+        return lambda name: False
+    regex = re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns), re.IGNORECASE)
+    return lambda name: regex.match(name) is not None
+
+
+K = TypeVar("K")
+
+
+def hold_unlisted(errors: List[str], previous: Dict[K, object], current: Dict[K, object],
+                  gone: Iterable[K]) -> List[K]:
+    """The disappeared keys to report as deleted; none if the crawl had listing errors"""
+    # An unreadable subfolder looks like deleted files, so after errors the
+    # missing entries are put back into `current` to be checked next time
+    gone = list(gone)
+    if not errors:
+        return gone
+    for key in gone:
+        current[key] = previous[key]
+    return []
+
+
+class DirectoryCrawler:
+    """Walks directory trees with os.scandir across a bounded thread pool, yielding matches in batches"""
+
+    # A partial batch is yielded once it is this old, so slow trees still stream
+    FLUSH_INTERVAL = 0.5
+
+    def __init__(self, roots: Iterable[str], include: Iterable[str] = DEFAULT_INCLUDE,
+                 exclude: Iterable[str] = DEFAULT_EXCLUDE, max_workers: int = 8,
+                 batch_size: int = 256, with_stat: bool = False,
+                 cancel_event: Optional[threading.Event] = None):
+        self.roots = [os.fspath(root) for root in roots]
+        self.is_included = compile_globs(include)
+        self.is_excluded = compile_globs(exclude)
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self.with_stat = with_stat
+        self.cancel_event = cancel_event or threading.Event()
+
+        self.scanned = 0
+        self.matched = 0
+        self.dirs_scanned = 0
+        self.errors: List[str] = []
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _scan(self, path: str) -> Tuple[List[FoundFile], List[str], int, Optional[str]]:
+        """List one directory (runs on a pool thread)"""
+        matches = []
+        subdirs = []
+        seen = 0
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.is_excluded(name):
+                                subdirs.append(entry.path)
+                            continue
+                    except OSError:
+                        continue
+                    seen += 1
+                    if not self.is_included(name) or self.is_excluded(name):
+                        continue
+                    if self.with_stat:
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        matches.append(FoundFile(entry.path, name, st.st_size, st.st_mtime, st.st_ino))
+                    else:
+                        matches.append(FoundFile(entry.path, name))
+        except OSError as e:
+            return matches, subdirs, seen, str(e)
+        return matches, subdirs, seen, None
+
+    def crawl(self) -> Iterator[List[FoundFile]]:
+        """Yield batches of matching files until the trees are exhausted or cancelled"""
+        pending_dirs: Deque[str] = deque(self.roots)
+        batch: List[FoundFile] = []
+        last_yield = time.monotonic()
+        # Keep enough listings in flight to hide latency without queueing the whole tree
+        window = self.max_workers * 2
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="docsmart-crawl") as pool:
+            in_flight = set()
+            try:
+                while pending_dirs or in_flight:
+                    if self.cancel_event.is_set():
+                        break
+                    while pending_dirs and len(in_flight) < window:
+                        in_flight.add(pool.submit(self._scan, pending_dirs.popleft()))
+
+                    done, in_flight = wait(in_flight, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        matches, subdirs, seen, error = future.result()
+                        self.dirs_scanned += 1
+                        self.scanned += seen
+                        self.matched += len(matches)
+                        if error:
+                            self.errors.append(error)
+                        pending_dirs.extend(subdirs)
+                        batch.extend(matches)
+
+                    if batch and (len(batch) >= self.batch_size
+                                  or time.monotonic() - last_yield >= self.FLUSH_INTERVAL):
+                        yield batch
+                        batch = []
+                        last_yield = time.monotonic()
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+        # Files already listed are still reported after a cancel
+        if batch:
+            yield batch
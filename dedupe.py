@@ -0,0 +1,157 @@
+"""
+Doc-smart dedupe: normalized path index and content hashing for imports
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from crawler import FoundFile
+
+HASH_CHUNK_SIZE = 1 << 20
+FINGERPRINT_SPAN = 1 << 16
+
+
+def normalize_path(path: str) -> str:
+    """Canonical form used to compare file paths (absolute, case-folded on Windows)"""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def hash_file(path: str) -> Optional[str]:
+    """Hash a file's contents in chunks; None if it cannot be read"""
+    digest = hashlib.blake2b(digest_size=20)
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def fingerprint_file(path: str, size: Optional[int] = None) -> Optional[str]:
+    """Cheap content fingerprint (size plus first and last 64 KiB); None if it cannot be read"""
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, 'rb') as f:
+            if size is None:
+                size = os.fstat(f.fileno()).st_size
+            digest.update(str(size).encode('ascii'))
+            digest.update(f.read(FINGERPRINT_SPAN))
+            if size > 2 * FINGERPRINT_SPAN:
+                f.seek(-FINGERPRINT_SPAN, os.SEEK_END)
+                digest.update(f.read(FINGERPRINT_SPAN))
+            elif size > FINGERPRINT_SPAN:
+                digest.update(f.read())
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class PathIndex:
+    """Normalized file path -> ids of the documents pointing at it"""
+
+    def __init__(self):
+        self.by_path: Dict[str, Set[str]] = {}
+        self.paths: Dict[str, Optional[str]] = {}  # doc id -> normalized path
+        self.built = False  # cleared to force a rebuild on next use
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __contains__(self, path: str) -> bool:
+        return normalize_path(path) in self.by_path
+
+    def rebuild(self, docs: Iterable) -> None:
+        self.by_path = {}
+        self.paths = {}
+        for doc in docs:
+            self.update(doc.id, doc)
+        self.built = True
+
+    def update(self, doc_id: str, doc) -> None:
+        """Re-index a document, or drop it when doc is None"""
+        old_path = self.paths.pop(doc_id, None)
+        if old_path is not None:
+            ids = self.by_path.get(old_path)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self.by_path[old_path]
+        if doc is None:
+            return
+        path = normalize_path(doc.file_path) if doc.source_type == "file" and doc.file_path else None
+        self.paths[doc_id] = path
+        if path is not None:
+            self.by_path.setdefault(path, set()).add(doc_id)
+
+
+class ContentDeduper:
+    """Drops files whose contents match a library file or an earlier import"""
+
+    def __init__(self, library_paths: Iterable[str], max_workers: Optional[int] = None):
+        self.library_paths = list(library_paths)
+        self.max_workers = max_workers
+        # Files not hashed yet, by size; a size's list is hashed (and dropped) once a second file has it
+        self.unhashed_by_size: Dict[int, List[str]] = {}
+        self.seen_sizes: Set[int] = set()
+        self.hashes: Dict[str, Optional[str]] = {}
+        self.known_paths: Set[str] = set()  # library files and accepted imports
+        self.known_hashes: Set[str] = set()
+        self.pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'ContentDeduper':
+        self.pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._index_library()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.pool.shutdown(cancel_futures=True)
+
+    def _index_library(self):
+        """Record library file sizes; stat calls overlap for network drives"""
+        def size_of(path):
+            try:
+                return path, os.path.getsize(path)
+            except OSError:
+                return path, None
+
+        with ThreadPoolExecutor(max_workers=16) as stat_pool:
+            for path, size in stat_pool.map(size_of, self.library_paths):
+                if size is not None:
+                    self.unhashed_by_size.setdefault(size, []).append(path)
+                    self.seen_sizes.add(size)
+                    self.known_paths.add(path)
+
+    def filter(self, files: List[FoundFile]) -> Tuple[List[FoundFile], List[FoundFile]]:
+        """Split a batch (crawled with_stat=True) into (unique, duplicates)"""
+        # Pass 1: anything sharing a size with another file needs a hash; each
+        # file is queued once, so many files of one size stay linear
+        to_hash: List[str] = []
+        for found in files:
+            if found.size in self.seen_sizes:
+                to_hash.append(found.path)
+                to_hash.extend(self.unhashed_by_size.pop(found.size, ()))
+            else:
+                self.seen_sizes.add(found.size)
+                self.unhashed_by_size[found.size] = [found.path]
+
+        to_hash = [path for path in dict.fromkeys(to_hash) if path not in self.hashes]
+        for path, digest in zip(to_hash, self.pool.map(hash_file, to_hash, chunksize=8)):
+            self.hashes[path] = digest
+            if digest and path in self.known_paths:
+                self.known_hashes.add(digest)
+
+        # Pass 2: in crawl order, the first file with given contents wins
+        unique, duplicates = [], []
+        for found in files:
+            digest = self.hashes.get(found.path)
+            if digest is not None and digest in self.known_hashes:
+                duplicates.append(found)
+                continue
+            unique.append(found)
+            self.known_paths.add(found.path)
+            if digest is not None:
+                self.known_hashes.add(digest)
+        return unique, duplicates
@@ -0,0 +1,213 @@
+"""
+Doc-smart diagnostics: handler latency recording and Tk mainloop stall detection
+"""
+
+import functools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# Stalls longer than this (milliseconds) are captured unless overridden
+DEFAULT_STALL_THRESHOLD_MS = int(os.environ.get("DOCSMART_STALL_THRESHOLD_MS", "250"))
+
+
+class HandlerStats:
+    """Wall-time statistics for a single handler"""
+
+    # Number of recent samples kept for percentiles
+    SAMPLE_LIMIT = 500
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.samples: Deque[float] = deque(maxlen=self.SAMPLE_LIMIT)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'mean_ms': (self.total / self.count * 1000) if self.count else 0.0,
+            'p50_ms': self.percentile(0.5) * 1000,
+            'p95_ms': self.percentile(0.95) * 1000,
+            'max_ms': self.max * 1000,
+            'last_ms': self.last * 1000
+        }
+
+
+class Stall:
+    """A period during which the Tk mainloop did not service events"""
+
+    def __init__(self, started_at: float, stack: List[str]):
+        self.started_at = started_at  # wall clock timestamp
+        self.duration = 0.0
+        self.stack = stack
+        self.handlers: List[str] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='milliseconds'),
+            'duration_ms': self.duration * 1000,
+            'handlers': self.handlers,
+            'stack': self.stack
+        }
+
+
+class LatencyRecorder:
+    """Thread-safe store of handler timings and detected stalls"""
+
+    # Number of stalls kept
+    STALL_LIMIT = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.handlers: Dict[str, HandlerStats] = {}
+        self.stalls: Deque[Stall] = deque(maxlen=self.STALL_LIMIT)
+        self.active: List[str] = []  # handlers currently running on the UI thread
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            stats = self.handlers.get(name)
+            if stats is None:
+                stats = self.handlers[name] = HandlerStats(name)
+            stats.add(seconds)
+
+    def add_stall(self, stall: Stall):
+        with self._lock:
+            stall.handlers = list(self.active)
+            self.stalls.append(stall)
+
+    def reset(self):
+        with self._lock:
+            self.handlers.clear()
+            self.stalls.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            handlers = sorted((stats.to_dict() for stats in self.handlers.values()),
+                              key=lambda s: s['total_ms'], reverse=True)
+            stalls = [stall.to_dict() for stall in self.stalls]
+        return {'handlers': handlers, 'stalls': stalls}
+
+    def dump(self, file_path: str, extra: Optional[Dict[str, Any]] = None):
+        """Write a JSON report suitable for attaching to a slowness report"""
+        report = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'platform': platform.platform(),
+            'python': sys.version.split()[0],
+        }
+        report.update(extra or {})
+        report.update(self.snapshot())
+        with open(file_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+# Shared recorder used by the @timed decorator
+recorder = LatencyRecorder()
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Record the wall time of every call to the decorated function"""
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            on_main = threading.current_thread() is threading.main_thread()
+            if on_main:
+                recorder.active.append(label)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.record(label, time.perf_counter() - start)
+                if on_main:
+                    recorder.active.pop()
+        return wrapper
+    return decorator
+
+
+class StallWatchdog:
+    """Detects Tk mainloop stalls from a heartbeat and captures the main thread's stack"""
+
+    def __init__(self, root, threshold_ms: int = DEFAULT_STALL_THRESHOLD_MS,
+                 latency_recorder: LatencyRecorder = recorder):
+        self.root = root
+        self.threshold = threshold_ms / 1000
+        self.recorder = latency_recorder
+        self._main_thread_id = threading.main_thread().ident
+        self._last_beat = time.monotonic()
+        self._current: Optional[Stall] = None
+        self._stall_began = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def threshold_ms(self) -> int:
+        return int(self.threshold * 1000)
+
+    @threshold_ms.setter
+    def threshold_ms(self, value: int):
+        self.threshold = max(value, 10) / 1000
+
+    def start(self):
+        if self._thread:
+            return
+        self._last_beat = time.monotonic()
+        self.root.after(self._beat_interval_ms(), self._beat)
+        self._thread = threading.Thread(target=self._watch, name="docsmart-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _beat_interval_ms(self) -> int:
+        return max(int(self.threshold * 1000 / 4), 5)
+
+    def _beat(self):
+        """Runs on the Tk loop"""
+        now = time.monotonic()
+        stall = self._current
+        if stall is not None:
+            stall.duration = now - self._stall_began
+            self._current = None
+        self._last_beat = now
+        if not self._stop.is_set():
+            self.root.after(self._beat_interval_ms(), self._beat)
+
+    def _watch(self):
+        """Runs on the watchdog thread"""
+        while not self._stop.wait(self.threshold / 4):
+            since = time.monotonic() - self._last_beat
+            if since < self.threshold or self._current is not None:
+                continue
+            frame = sys._current_frames().get(self._main_thread_id)
+            stack = traceback.format_stack(frame) if frame else []
+            stall = Stall(time.time() - since, stack)
+            stall.duration = since
+            self._stall_began = self._last_beat
+            self._current = stall
+            self.recorder.add_stall(stall)
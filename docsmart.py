@@ -5,27 +5,73 @@ Doc-smart: Desktop application for managing Word documents for debate preparatio
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
+import bisect
 import json
 import os
-import subprocess
 import platform
-from datetime import datetime
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-import webbrowser
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
 
-# Try to import Windows COM for Word automation
-try:
-    import win32com.client
-    WORD_COM_AVAILABLE = True
-except ImportError:
-    WORD_COM_AVAILABLE = False
+from archive_import import ArchiveImportJob, archive_folder
+from backends import (AUTO, DISCARD_CHANGES, PROMPT_TO_SAVE, SAVE_CHANGES, WORD, DocumentBackend,
+                      create_backend)
+from batch_close import BatchCloseJob
+from batch_open import BatchOpenJob, OpenRequest
+from bulk_import import ManifestImportJob, ManifestRow
+from crawler import DEFAULT_EXCLUDE, DEFAULT_INCLUDE, DirectoryCrawler, FoundFile
+from dedupe import ContentDeduper, PathIndex, normalize_path
+from diagnostics import StallWatchdog, recorder, timed
+from folder_sync import FolderSyncResult, Manifest, sync_folder
+from fswatch import ChangeBatch, ChangeCoalescer, create_watcher
+from health import FileHealthCache, FileProbe, check_paths
+from metadata import DocMetadata, MetadataCache, MetadataExtractor
+from open_state import OpenStateDiff, OpenStateReconciler, diff_open_state
+from relocate import BrokenFile, Relocation, RelocationFinder, unique_roots
+from rules import FOLDER, NAME, CompiledRules, Rule, RuleMatch, match_paths
+from word_session import document_key
+from workspaces import Workspace, find_workspace, order_by_keys, remove_workspace, replace_workspace
+
+# Heavy modules (win32com, subprocess, webbrowser) are imported on first use
+# so they don't delay the first paint of the window
+_word_com = None
+
+def load_word_com():
+    """Import win32com.client for Word automation, or None when unavailable"""
+    global _word_com
+    if _word_com is None:
+        try:
+            import win32com.client
+            _word_com = win32com.client
+        except ImportError:
+            _word_com = False
+    return _word_com or None
+
+# User preferences stored alongside the library in data.json
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    'import_include': list(DEFAULT_INCLUDE),
+    'import_exclude': list(DEFAULT_EXCLUDE),
+    'import_content_hash': False,
+    'import_metadata': True,
+    'live_watch': False,
+    'document_backend': AUTO,  # or "word", "libreoffice", "launcher", "fake"
+    'prewarm_editor': False,
+    'prewarm_times': [],  # "HH:MM" times to pre-warm the editor each day, e.g. before rounds
+    'close_save_policy': SAVE_CHANGES,
+}
 
 class DocEntry:
     def __init__(self, id: str, name: str, source_type: str, url: str = None, 
                  file_path: str = None, tags: List[str] = None, team_id: str = None,
                  favorite: bool = False, is_open: bool = False, 
-                 last_opened_at: float = None, created_at: float = None):
+                 last_opened_at: float = None, created_at: float = None,
+                 file_size: int = None, file_fingerprint: str = None,
+                 metadata: Dict[str, Any] = None):
         self.id = id
         self.name = name
         self.source_type = source_type  # "url" or "file"
@@ -37,6 +83,11 @@ class DocEntry:
         self.is_open = is_open
         self.last_opened_at = last_opened_at
         self.created_at = created_at or datetime.now().timestamp()
+        # Last seen size and fingerprint of the file, used to find it if it moves
+        self.file_size = file_size
+        self.file_fingerprint = file_fingerprint
+        # Document properties read from the file (title, author, modified, words, pages)
+        self.metadata = metadata or {}
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -50,7 +101,10 @@ class DocEntry:
             'favorite': self.favorite,
             'is_open': self.is_open,
             'last_opened_at': self.last_opened_at,
-            'created_at': self.created_at
+            'created_at': self.created_at,
+            'file_size': self.file_size,
+            'file_fingerprint': self.file_fingerprint,
+            'metadata': self.metadata
         }
 
     @classmethod
@@ -74,8 +128,155 @@ class Team:
     def from_dict(cls, data: Dict[str, Any]) -> 'Team':
         return cls(**data)
 
+class SortIndex:
+    """Document ids kept in order of one sort key"""
+    
+    def __init__(self, key_func: Callable[['DocEntry'], Any]):
+        self.key_func = key_func
+        self.entries: List[tuple] = []
+        self.keys: Dict[str, Any] = {}
+        self.built = False  # cleared to force a rebuild on next use
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def rebuild(self, docs: Iterable['DocEntry']):
+        self.keys = {doc.id: self.key_func(doc) for doc in docs}
+        self.entries = sorted((key, doc_id) for doc_id, key in self.keys.items())
+        self.built = True
+    
+    def entry(self, doc_id: str) -> tuple:
+        return (self.keys[doc_id], doc_id)
+    
+    def update(self, doc_id: str, doc: Optional['DocEntry']):
+        """Reposition a document, or drop it when doc is None"""
+        if doc_id in self.keys:
+            old_entry = (self.keys.pop(doc_id), doc_id)
+            del self.entries[bisect.bisect_left(self.entries, old_entry)]
+        if doc is not None:
+            key = self.key_func(doc)
+            self.keys[doc_id] = key
+            bisect.insort(self.entries, (key, doc_id))
+    
+    def ids(self, descending: bool = False) -> Iterator[str]:
+        entries = reversed(self.entries) if descending else self.entries
+        return (doc_id for key, doc_id in entries)
+
+class FolderImportJob:
+    """Crawls a folder on a worker thread and streams matching files back"""
+    
+    def __init__(self, folder_path: str, include: Iterable[str] = DEFAULT_INCLUDE,
+                 exclude: Iterable[str] = DEFAULT_EXCLUDE, known_paths: Iterable[str] = (),
+                 content_hash: bool = False, library_paths: Iterable[str] = (),
+                 metadata_cache: Optional[Path] = None):
+        self.folder_path = folder_path
+        self.known_paths = set(known_paths)
+        self.content_hash = content_hash
+        self.library_paths = list(library_paths)
+        self.metadata_cache = metadata_cache
+        self.results: queue.Queue = queue.Queue()  # ("matches"|"duplicates"|"metadata"|"error", ...), ("done", None)
+        self.cancel_event = threading.Event()
+        self.crawler = DirectoryCrawler([folder_path], include=include, exclude=exclude,
+                                        with_stat=content_hash or metadata_cache is not None,
+                                        cancel_event=self.cancel_event)
+        self.thread = threading.Thread(target=self._run, name="docsmart-import", daemon=True)
+        
+        self.matched = 0
+        self.imported = 0
+        self.skipped_path = 0
+        self.skipped_content = 0
+        self.pending: List[FoundFile] = []
+        self.pending_metadata: List[tuple] = []
+        self.created_ids: Set[str] = set()  # documents this job added; the only ones metadata may touch
+        self.errors: List[str] = []
+        self.panel: Optional['ProgressDialog'] = None
+        self.started_at = time.monotonic()
+        self.last_commit_at = self.started_at
+    
+    @property
+    def scanned(self) -> int:
+        return self.crawler.scanned
+    
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+    
+    def start(self):
+        self.started_at = time.monotonic()
+        self.last_commit_at = self.started_at
+        self.thread.start()
+    
+    def cancel(self):
+        self.cancel_event.set()
+    
+    def _run(self):
+        try:
+            with ExitStack() as stack:
+                deduper = extractor = None
+                if self.content_hash:
+                    deduper = stack.enter_context(ContentDeduper(self.library_paths))
+                if self.metadata_cache is not None:
+                    cache = MetadataCache(self.metadata_cache).load()
+                    extractor = stack.enter_context(MetadataExtractor(cache))
+                self._crawl(deduper, extractor)
+                if extractor is not None:
+                    for results in extractor.drain():
+                        if self.cancelled:
+                            break
+                        self.results.put(("metadata", results))
+        except Exception as e:
+            self.results.put(("error", str(e)))
+        
+        for error in self.crawler.errors:
+            self.results.put(("error", error))
+        self.results.put(("done", None))
+    
+    def _crawl(self, deduper: Optional[ContentDeduper], extractor: Optional[MetadataExtractor]):
+        for batch in self.crawler.crawl():
+            files = []
+            for found in batch:
+                path = normalize_path(found.path)
+                if path not in self.known_paths:
+                    self.known_paths.add(path)
+                    files.append(found)
+            same_path = len(batch) - len(files)
+            same_content = 0
+            if deduper is not None and files:
+                files, duplicates = deduper.filter(files)
+                same_content = len(duplicates)
+            
+            if files:
+                self.results.put(("matches", files))
+            if same_path or same_content:
+                self.results.put(("duplicates", (same_path, same_content)))
+            if extractor is not None:
+                extractor.submit(files)
+                ready = extractor.ready()
+                if ready:
+                    self.results.put(("metadata", ready))
+
 class DocSmartApp:
-    def __init__(self):
+    # How often the UI drains import results, and how many files or seconds
+    # of results accumulate before they are committed to the library
+    IMPORT_POLL_MS = 100
+    IMPORT_COMMIT_SIZE = 1000
+    IMPORT_COMMIT_INTERVAL = 1.0
+    
+    # How often the UI checks whether the background library load finished
+    LOAD_POLL_MS = 20
+    # How often the UI takes coalesced changes from the folder watcher
+    WATCH_POLL_MS = 250
+    # How often every file-backed document is checked for a missing file
+    HEALTH_CHECK_INTERVAL_MS = 5 * 60 * 1000
+    # How often the UI checks for editor events, and how often (seconds) it
+    # asks the editor what is open regardless
+    OPEN_STATE_TICK_MS = 500
+    OPEN_STATE_INTERVAL = 10.0
+    # Documents opened this recently (seconds) stay Open while the editor loads them
+    OPEN_STATE_GRACE = 5.0
+    
+    def __init__(self, fast_start: bool = True):
+        self.startup_marks: Dict[str, float] = {}
         self.root = tk.Tk()
         self.root.title("Doc-smart - Debate Document Manager")
         self.root.geometry("1200x800")
@@ -84,17 +285,109 @@ class DocSmartApp:
         self.docs: Dict[str, DocEntry] = {}
         self.teams: Dict[str, Team] = {}
         self.selected_team_id: Optional[str] = None
+        self.settings: Dict[str, Any] = dict(DEFAULT_SETTINGS)
+        self.watched_folders: List[str] = []
+        self._sync_running = False
+        # Tag and team rules applied to files as they are imported
+        self.rules: List[Rule] = []
+        self._compiled_rules: Optional[CompiledRules] = None
+        self._team_ids_by_name: Dict[str, str] = {}
+        # Named sets of open documents (Workspaces menu)
+        self.workspaces: List[Workspace] = []
+        self.workspaces_menu: Optional[tk.Menu] = None
+        self.watcher = None
+        self.watch_changes: Optional[ChangeCoalescer] = None
+        self._pending_rescans: set = set()
+        # File health: doc id -> the file_path that was found missing
+        self.file_health = FileHealthCache()
+        self.missing: Dict[str, str] = {}
+        self._health_running = False
         self.search_text = tk.StringVar()
         self.favorite_only = tk.BooleanVar()
         
-        # Load data
+        # Sorting: None is the default order (favorites, recently opened, name)
+        self.sort_column: Optional[str] = None
+        self.sort_descending = False
+        self.sort_indexes: Dict[Optional[str], SortIndex] = {}
+        self.path_index = PathIndex()
+        
+        # Batch state: saves and redraws requested inside `batch()` are
+        # deferred until the outermost batch exits
+        self._batch_depth = 0
+        self._save_pending = False
+        self._full_refresh_pending = False
+        self._teams_refresh_pending = False
+        self._dirty_doc_ids: set = set()
+        
         self.data_file = Path.home() / ".docsmart" / "data.json"
-        self.load_data()
+        self.manifest_dir = self.data_file.parent / "manifests"
+        self.metadata_cache_file = self.data_file.parent / "metadata_cache.json"
+        # Managed folder that imported archives are extracted into
+        self.library_dir = self.data_file.parent / "library"
+        self.backend: Optional[DocumentBackend] = None
+        self.open_state: Optional[OpenStateReconciler] = None
+        # Background launches (see _track_launch) report back through this queue
+        self.launch_results: queue.Queue = queue.Queue()
+        self._launches_pending = 0
+        # Editor pre-warm (see prewarm_editor) and the first open it is meant to speed up
+        self._prewarm: Optional[Future] = None
+        self._prewarm_after_id: Optional[str] = None
+        self._first_open_recorded = False
+        # Open flags from before this moment may be stale when the editor can't list its documents
+        self.session_started_at = time.time()
+        self.context_menu: Optional[tk.Menu] = None
+        self.team_context_menu: Optional[tk.Menu] = None
+        self.root.bind('<Expose>', self._on_first_paint, '+')
+        
+        if fast_start:
+            # Show the window right away and read the library in the background
+            self.setup_ui()
+            self.start_async_load()
+        else:
+            self.load_data()
+            self.setup_ui()
+            self.startup_marks['loaded'] = time.time()
+            self.on_library_loaded()
         
-        # Setup UI
-        self.setup_ui()
+        # Watch for mainloop stalls
+        self.watchdog = StallWatchdog(self.root)
+        self.watchdog.start()
         
     def setup_ui(self):
+        # Menu bar
+        menubar = tk.Menu(self.root)
+        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(label="Import Folder...", command=self.import_folder)
+        file_menu.add_command(label="Import List (CSV/JSONL)...", command=self.import_manifest)
+        file_menu.add_command(label="Import Archive (.zip)...", command=self.import_archive)
+        file_menu.add_separator()
+        file_menu.add_command(label="Export Data...", command=self.export_data)
+        menubar.add_cascade(label="File", menu=file_menu)
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        tools_menu.add_command(label="Watched Folders...", command=self.edit_watched_folders)
+        tools_menu.add_command(label="Sync Watched Folders", command=self.sync_watched_folders)
+        self.live_watch_var = tk.BooleanVar(value=self.settings['live_watch'])
+        tools_menu.add_checkbutton(label="Live Folder Watching", variable=self.live_watch_var,
+                                   command=self.toggle_live_watch)
+        tools_menu.add_command(label="Check for Missing Files",
+                               command=lambda: self.check_file_health(fresh=True))
+        tools_menu.add_command(label="Relink Missing Files...", command=self.relink_missing_files)
+        tools_menu.add_separator()
+        self.prewarm_var = tk.BooleanVar(value=self.settings['prewarm_editor'])
+        tools_menu.add_checkbutton(label="Pre-warm Editor at Startup", variable=self.prewarm_var,
+                                   command=self.toggle_prewarm)
+        tools_menu.add_command(label="Pre-warm Editor Now", command=self.prewarm_editor)
+        tools_menu.add_command(label="Pre-warm Schedule...", command=self.edit_prewarm_schedule)
+        tools_menu.add_separator()
+        tools_menu.add_command(label="Tag && Team Rules...", command=self.edit_rules)
+        tools_menu.add_command(label="Import Settings...", command=self.edit_import_settings)
+        tools_menu.add_command(label="Diagnostics...", command=self.show_diagnostics)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
+        self.workspaces_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Workspaces", menu=self.workspaces_menu)
+        self.refresh_workspaces_menu()
+        self.root.config(menu=menubar)
+        
         # Main frame
         main_frame = ttk.Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -138,11 +431,6 @@ class DocSmartApp:
         self.teams_listbox.bind('<<ListboxSelect>>', self.on_team_select)
         self.teams_listbox.bind('<Button-3>', self.show_team_context_menu)  # Right-click
         
-        # Team context menu
-        self.team_context_menu = tk.Menu(self.root, tearoff=0)
-        self.team_context_menu.add_command(label="Rename Team", command=self.rename_selected_team)
-        self.team_context_menu.add_command(label="Delete Team", command=self.delete_selected_team)
-        
         # Search and filters
         search_frame = ttk.LabelFrame(sidebar_frame, text="Search & Filters", padding=10)
         search_frame.pack(fill=tk.X, pady=(10, 0))
@@ -164,7 +452,7 @@ class DocSmartApp:
         self.docs_tree = ttk.Treeview(docs_frame, columns=columns, show='headings', height=20, selectmode='extended')
         
         for col in columns:
-            self.docs_tree.heading(col, text=col)
+            self.docs_tree.heading(col, text=col, command=lambda c=col: self.sort_by_column(c))
             self.docs_tree.column(col, width=150)
         
         # Scrollbar for treeview
@@ -174,93 +462,384 @@ class DocSmartApp:
         self.docs_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        self.docs_tree.bind("<Button-3>", self.show_context_menu)
+        self.docs_tree.bind("<Double-1>", self.open_selected_documents)
+        
+        # Status bar
+        self.status_var = tk.StringVar()
+        ttk.Label(main_frame, textvariable=self.status_var, font=("Arial", 9)).pack(anchor=tk.W, pady=(5, 0))
+        
+        # Initial load
+        self.refresh_teams()
+        self.refresh_documents()
+    
+    def build_context_menus(self):
+        """Create the right-click menus; deferred until first used"""
+        if self.context_menu is not None:
+            return
+        
         # Context menu for documents
         self.context_menu = tk.Menu(self.root, tearoff=0)
         self.context_menu.add_command(label="Open in Word", command=self.open_selected_documents)
         self.context_menu.add_command(label="Close in Word", command=self.close_selected_documents)
         self.context_menu.add_command(label="Mark as Favorite", command=self.toggle_favorite_selected)
         self.context_menu.add_command(label="Edit", command=self.edit_selected_document)
+        self.context_menu.add_command(label="Set Tags...", command=self.retag_selected_documents)
+        self.move_team_menu = tk.Menu(self.context_menu, tearoff=0)
+        self.context_menu.add_cascade(label="Move to Team", menu=self.move_team_menu)
         self.context_menu.add_separator()
         self.context_menu.add_command(label="Remove Selected", command=self.remove_selected_documents)
         
-        self.docs_tree.bind("<Button-3>", self.show_context_menu)
-        self.docs_tree.bind("<Double-1>", self.open_selected_documents)
+        # Team context menu
+        self.team_context_menu = tk.Menu(self.root, tearoff=0)
+        self.team_context_menu.add_command(label="Rename Team", command=self.rename_selected_team)
+        self.team_context_menu.add_command(label="Delete Team", command=self.delete_selected_team)
+    
+    def _on_first_paint(self, event):
+        if 'first_paint' not in self.startup_marks:
+            self.startup_marks['first_paint'] = time.time()
+            if 'loaded' in self.startup_marks:
+                self.root.after_idle(self._mark_interactive)
+    
+    def _mark_interactive(self):
+        """Record the moment the loaded library has been drawn"""
+        self.startup_marks.setdefault('interactive', time.time())
+    
+    def start_async_load(self):
+        """Read the library on a worker thread and apply it when ready"""
+        # Hold saves and redraws until the library is in, so nothing done in
+        # the meantime can overwrite the data file with a partial library
+        self._batch_depth += 1
+        self.status_var.set("Loading library...")
         
-        # Initial load
+        results: queue.Queue = queue.Queue()
+        
+        def worker():
+            try:
+                results.put((self.read_data_file(), None))
+            except Exception as e:
+                results.put((None, e))
+        
+        threading.Thread(target=worker, name="docsmart-load", daemon=True).start()
+        self.root.after(self.LOAD_POLL_MS, self._finish_async_load, results)
+    
+    def _finish_async_load(self, results: queue.Queue):
+        try:
+            data, error = results.get_nowait()
+        except queue.Empty:
+            self.root.after(self.LOAD_POLL_MS, self._finish_async_load, results)
+            return
+        
+        if error is not None:
+            messagebox.showerror("Error", f"Failed to load data: {error}")
+        elif data is not None:
+            # Keep anything added while the library was loading
+            added_docs, added_teams = self.docs, self.teams
+            self.apply_data(data)
+            self.docs.update(added_docs)
+            self.teams.update(added_teams)
+            self.live_watch_var.set(self.settings['live_watch'])
+            self.prewarm_var.set(self.settings['prewarm_editor'])
+            self.refresh_workspaces_menu()
+        
+        self.status_var.set("")
+        self.startup_marks['loaded'] = time.time()
         self.refresh_teams()
-        self.refresh_documents()
+        self._full_refresh_pending = True
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self._commit_batch()
+        if 'first_paint' in self.startup_marks:
+            self.root.after_idle(self._mark_interactive)
+        self.on_library_loaded()
     
+    def on_library_loaded(self):
+        """Start the background work that needs the library"""
+        self.start_live_watch()
+        self.root.after_idle(self._scheduled_health_check)
+        self.root.after_idle(self.start_open_state_tracking)
+        if self.settings['prewarm_editor']:
+            self.root.after_idle(self.prewarm_editor)
+        self.schedule_prewarm()
+    
+    def exit_after_startup(self):
+        """Print startup timings as JSON and quit once interactive (for benchmarks)"""
+        if 'interactive' in self.startup_marks:
+            print(json.dumps(self.startup_marks), flush=True)
+            self.root.destroy()
+            return
+        self.root.after(5, self.exit_after_startup)
+
     def generate_id(self, prefix: str = "id") -> str:
         import random
         import string
         return f"{prefix}_{''.join(random.choices(string.ascii_lowercase + string.digits, k=8))}"
     
+    @contextmanager
+    def batch(self):
+        """Group mutations so they are saved once and redrawn once; batches nest"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._commit_batch()
+
+    def _commit_batch(self):
+        """Apply the save and refresh requested during a batch"""
+        save_pending = self._save_pending
+        full_refresh = self._full_refresh_pending
+        teams_refresh = self._teams_refresh_pending
+        dirty_ids = self._dirty_doc_ids
+        self._save_pending = False
+        self._full_refresh_pending = False
+        self._teams_refresh_pending = False
+        self._dirty_doc_ids = set()
+
+        if save_pending:
+            self.save_data()
+        if teams_refresh:
+            self.refresh_teams()
+        if full_refresh:
+            self._update_indexes(dirty_ids)
+            self.refresh_documents()
+        elif dirty_ids:
+            self.refresh_documents(dirty_ids)
+
+    def mark_changed(self, doc_ids: Iterable[str]):
+        """Record that documents were added, edited or removed"""
+        with self.batch():
+            self._dirty_doc_ids.update(doc_ids)
+            self._save_pending = True
+
+    @timed()
     def save_data(self):
         """Save data to JSON file"""
+        if self._batch_depth:
+            self._save_pending = True
+            return
+
         self.data_file.parent.mkdir(exist_ok=True)
         
         data = {
             'docs': {id: doc.to_dict() for id, doc in self.docs.items()},
             'teams': {id: team.to_dict() for id, team in self.teams.items()},
-            'selected_team_id': self.selected_team_id
+            'selected_team_id': self.selected_team_id,
+            'settings': self.settings,
+            'watched_folders': self.watched_folders,
+            'rules': [rule.to_dict() for rule in self.rules],
+            'workspaces': [workspace.to_dict() for workspace in self.workspaces]
         }
         
         with open(self.data_file, 'w') as f:
             json.dump(data, f, indent=2)
     
+    def read_data_file(self) -> Optional[Dict[str, Any]]:
+        """Parse the data file into model objects; safe to call off the UI thread"""
+        if not self.data_file.exists():
+            return None
+        
+        with open(self.data_file, 'r') as f:
+            data = json.load(f)
+        
+        return {
+            'docs': {id: DocEntry.from_dict(doc_data) 
+                     for id, doc_data in data.get('docs', {}).items()},
+            'teams': {id: Team.from_dict(team_data) 
+                      for id, team_data in data.get('teams', {}).items()},
+            'selected_team_id': data.get('selected_team_id'),
+            'settings': data.get('settings', {}),
+            'watched_folders': data.get('watched_folders', []),
+            'rules': [Rule.from_dict(rule_data) for rule_data in data.get('rules', [])],
+            'workspaces': [Workspace.from_dict(workspace_data) for workspace_data in data.get('workspaces', [])]
+        }
+    
+    def apply_data(self, data: Dict[str, Any]):
+        """Install data returned by read_data_file"""
+        self.docs = data['docs']
+        self.teams = data['teams']
+        self.selected_team_id = data['selected_team_id']
+        self.settings = dict(DEFAULT_SETTINGS, **data['settings'])
+        self.watched_folders = data['watched_folders']
+        self.rules = data['rules']
+        self.workspaces = data['workspaces']
+        self._compiled_rules = None
+        self.sort_indexes = {}
+        self.path_index = PathIndex()
+    
     def load_data(self):
         """Load data from JSON file"""
-        if not self.data_file.exists():
-            return
-            
         try:
-            with open(self.data_file, 'r') as f:
-                data = json.load(f)
-            
-            self.docs = {id: DocEntry.from_dict(doc_data) 
-                        for id, doc_data in data.get('docs', {}).items()}
-            self.teams = {id: Team.from_dict(team_data) 
-                         for id, team_data in data.get('teams', {}).items()}
-            self.selected_team_id = data.get('selected_team_id')
+            data = self.read_data_file()
+            if data is not None:
+                self.apply_data(data)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load data: {e}")
     
-    def open_in_word(self, doc: DocEntry):
+    @timed()
+    def open_in_word(self, doc: DocEntry) -> bool:
         """Open document in Microsoft Word"""
         try:
+            started = time.perf_counter()
             if doc.source_type == "url":
-                # Try Word protocol first, fallback to browser
-                word_url = f"ms-word:ofe|u|{doc.url}"
-                try:
-                    if platform.system() == "Windows":
-                        os.startfile(word_url)
-                    else:
-                        webbrowser.open(doc.url)
-                except:
-                    webbrowser.open(doc.url)
+                launch = self.get_backend().open(doc.url)
             else:
                 # Open local file
-                if not doc.file_path or not os.path.exists(doc.file_path):
+                exists = bool(doc.file_path) and os.path.exists(doc.file_path)
+                if doc.file_path:
+                    if exists:
+                        # Size and fingerprint weren't read here; let the next check probe it
+                        self.file_health.invalidate([doc.file_path])
+                    else:
+                        self.file_health.put(doc.file_path, False)
+                    self.set_file_missing(doc, not exists)
+                if not exists:
                     messagebox.showerror("Error", "File not found. Please check the file path.")
-                    return
-                
-                if platform.system() == "Windows":
-                    os.startfile(doc.file_path)
-                elif platform.system() == "Darwin":  # macOS
-                    subprocess.run(["open", doc.file_path])
-                else:  # Linux
-                    subprocess.run(["xdg-open", doc.file_path])
+                    return False
+                launch = self.get_backend().open(doc.file_path)
+            if launch is not None:
+                self._track_launch(doc, launch)
+            if not self._first_open_recorded:
+                self._record_first_open(started, launch)
             
             # Mark as opened
             doc.is_open = True
             doc.last_opened_at = datetime.now().timestamp()
-            self.save_data()
-            self.refresh_documents()
+            self.mark_changed([doc.id])
+            return True
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open document: {e}")
+            return False
+    
+    def prewarm_editor(self):
+        """Start or attach to the editor in the background so the next open is quick"""
+        if self._prewarm is not None and not self._prewarm.done():
+            return
+        backend = self.get_backend()
+        future: Future = Future()
+        
+        def run():
+            started = time.perf_counter()
+            try:
+                warmed = backend.prewarm()
+            except Exception as e:
+                future.set_exception(e)
+                return
+            future.set_result(time.perf_counter() - started if warmed else None)
+        
+        self._prewarm = future
+        self.status_var.set(f"Starting {backend.name} in the background...")
+        threading.Thread(target=run, name="docsmart-prewarm", daemon=True).start()
+        self.root.after(self.IMPORT_POLL_MS, self._poll_prewarm, future)
+    
+    def _poll_prewarm(self, future: Future):
+        if not future.done():
+            self.root.after(self.IMPORT_POLL_MS, self._poll_prewarm, future)
+            return
+        backend = self.get_backend()
+        error = future.exception()
+        if error is not None:
+            self.status_var.set(f"Could not pre-warm {backend.name}: {error}")
+        elif future.result() is None:
+            self.status_var.set(f"{backend.name} has no editor to pre-warm")
+        else:
+            recorder.record("prewarm_editor", future.result())
+            self.status_var.set(f"{backend.name} is ready (started in {future.result():.1f}s)")
+    
+    def _record_first_open(self, started: float, launch: Optional[Future]):
+        """Record how long this session's first open took, split by whether the editor was pre-warmed"""
+        self._first_open_recorded = True
+        # A backend with nothing to pre-warm finishes with None; its opens are still cold
+        warm = (self._prewarm is not None and self._prewarm.done() and self._prewarm.exception() is None
+                and self._prewarm.result() is not None)
+        label = "first_open_prewarmed" if warm else "first_open_cold"
+        if launch is None:
+            recorder.record(label, time.perf_counter() - started)
+        else:
+            launch.add_done_callback(lambda _: recorder.record(label, time.perf_counter() - started))
+    
+    def toggle_prewarm(self):
+        self.settings['prewarm_editor'] = self.prewarm_var.get()
+        self.save_data()
+        if self.settings['prewarm_editor']:
+            self.prewarm_editor()
+    
+    def edit_prewarm_schedule(self):
+        """Set daily times at which the editor is pre-warmed"""
+        value = simpledialog.askstring(
+            "Pre-warm Schedule", "Pre-warm the editor daily at (HH:MM, comma-separated; blank for none):",
+            initialvalue=", ".join(self.settings['prewarm_times']), parent=self.root)
+        if value is None:
+            return
+        times = [part.strip() for part in value.split(",") if part.strip()]
+        for entry in times:
+            try:
+                datetime.strptime(entry, "%H:%M")
+            except ValueError:
+                messagebox.showerror("Error", f"'{entry}' is not a time like 08:30.")
+                return
+        self.settings['prewarm_times'] = times
+        self.save_data()
+        self.schedule_prewarm()
+    
+    def schedule_prewarm(self):
+        """Arrange the next scheduled pre-warm, replacing any already arranged"""
+        if self._prewarm_after_id is not None:
+            self.root.after_cancel(self._prewarm_after_id)
+            self._prewarm_after_id = None
+        now = datetime.now()
+        upcoming = []
+        for entry in self.settings['prewarm_times']:
+            try:
+                at = datetime.strptime(entry, "%H:%M")
+            except ValueError:
+                continue
+            when = now.replace(hour=at.hour, minute=at.minute, second=0, microsecond=0)
+            if when <= now:
+                when += timedelta(days=1)
+            upcoming.append(when)
+        if upcoming:
+            delay_ms = int((min(upcoming) - now).total_seconds() * 1000)
+            self._prewarm_after_id = self.root.after(delay_ms, self._scheduled_prewarm)
     
+    def _scheduled_prewarm(self):
+        self._prewarm_after_id = None
+        self.prewarm_editor()
+        self.schedule_prewarm()
+    
+    def _track_launch(self, doc: DocEntry, launch: Future):
+        """Watch a background launch and report it if it fails"""
+        self._launches_pending += 1
+        launch.add_done_callback(lambda future, doc_id=doc.id: self.launch_results.put((doc_id, future)))
+        if self._launches_pending == 1:
+            self.root.after(self.IMPORT_POLL_MS, self._poll_launches)
+    
+    @timed()
+    def _poll_launches(self):
+        failed = []
+        while True:
+            try:
+                doc_id, future = self.launch_results.get_nowait()
+            except queue.Empty:
+                break
+            self._launches_pending -= 1
+            error = future.exception()
+            doc = self.docs.get(doc_id)
+            if error is not None and doc is not None:
+                doc.is_open = False
+                failed.append((doc, error))
+        
+        self.mark_changed(doc.id for doc, _ in failed)
+        if self._launches_pending:
+            self.root.after(self.IMPORT_POLL_MS, self._poll_launches)
+        if failed:
+            messagebox.showerror("Error", f"Failed to open {len(failed)} document(s):\n\n"
+                                 + "\n".join(f"{doc.name}: {error}" for doc, error in failed[:10]))
+    
+    @timed()
     def add_document(self):
         """Add new document dialog"""
         dialog = DocumentDialog(self.root, self.teams)
@@ -279,10 +858,10 @@ class DocSmartApp:
             )
             
             self.docs[doc_id] = doc
-            self.save_data()
-            self.refresh_documents()
+            self.mark_changed([doc_id])
             messagebox.showinfo("Success", f"Document '{doc.name}' added successfully!")
     
+    @timed()
     def add_team(self):
         """Add new team"""
         name = simpledialog.askstring("Add Team", "Enter team name:")
@@ -294,38 +873,818 @@ class DocSmartApp:
             self.refresh_teams()
             messagebox.showinfo("Success", f"Team '{name}' added successfully!")
     
+    @timed()
     def import_folder(self):
-        """Import Word documents from a folder"""
+        """Import Word documents from a folder in the background"""
         folder_path = filedialog.askdirectory(title="Select folder containing Word documents")
         if not folder_path:
             return
         
-        word_extensions = ['.docx', '.doc']
-        imported_count = 0
+        content_hash = self.settings['import_content_hash']
+        job = FolderImportJob(folder_path,
+                              include=self.settings['import_include'],
+                              exclude=self.settings['import_exclude'],
+                              known_paths=self.get_path_index().by_path.keys(),
+                              content_hash=content_hash,
+                              library_paths=[doc.file_path for doc in self.docs.values()
+                                             if content_hash and doc.source_type == "file" and doc.file_path],
+                              metadata_cache=self.metadata_cache_file if self.settings['import_metadata'] else None)
+        job.panel = ProgressDialog(self.root, "Importing Documents",
+                                   ["Scanned", "Matched", "Imported", "Duplicates", "Rate"],
+                                   on_cancel=job.cancel)
+        job.panel.set_message(f"Scanning {folder_path}")
+        job.start()
+        self.root.after(self.IMPORT_POLL_MS, self._poll_import_job, job)
+    
+    @timed()
+    def _poll_import_job(self, job: 'FolderImportJob'):
+        """Drain results from an import job, committing them in batches"""
+        finished = False
+        while True:
+            try:
+                kind, payload = job.results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "matches":
+                job.pending.extend(payload)
+                job.matched += len(payload)
+            elif kind == "duplicates":
+                same_path, same_content = payload
+                job.skipped_path += same_path
+                job.skipped_content += same_content
+                job.matched += same_path + same_content
+            elif kind == "metadata":
+                job.pending_metadata.extend(payload)
+            elif kind == "error":
+                job.errors.append(payload)
+            elif kind == "done":
+                finished = True
+        
+        now = time.monotonic()
+        if (finished or len(job.pending) >= self.IMPORT_COMMIT_SIZE
+                or now - job.last_commit_at >= self.IMPORT_COMMIT_INTERVAL):
+            self._commit_import_batch(job)
+        
+        elapsed = max(now - job.started_at, 1e-6)
+        job.panel.set_values({
+            "Scanned": f"{job.scanned:,}",
+            "Matched": f"{job.matched:,}",
+            "Imported": f"{job.imported:,}",
+            "Duplicates": f"{job.skipped_path + job.skipped_content:,}",
+            "Rate": f"{job.scanned / elapsed:,.0f} files/s",
+        })
+        
+        if not finished:
+            self.root.after(self.IMPORT_POLL_MS, self._poll_import_job, job)
+            return
         
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                if any(file.lower().endswith(ext) for ext in word_extensions):
-                    file_path = os.path.join(root, file)
-                    doc_id = self.generate_id("doc")
-                    
-                    doc = DocEntry(
-                        id=doc_id,
-                        name=file,
-                        source_type="file",
-                        file_path=file_path
-                    )
-                    
-                    self.docs[doc_id] = doc
-                    imported_count += 1
+        if job.cancelled:
+            summary = f"Cancelled. Kept {job.imported} imported document(s)."
+        elif job.imported:
+            summary = f"Imported {job.imported} documents!"
+        elif job.matched:
+            summary = "No new documents found in the selected folder."
+        else:
+            summary = "No Word documents found in the selected folder."
+        if job.skipped_path or job.skipped_content:
+            summary += f" Skipped {job.skipped_path + job.skipped_content} duplicate(s)"
+            if job.content_hash:
+                summary += f" ({job.skipped_path} already in library, {job.skipped_content} same content)"
+            summary += "."
+        if job.errors:
+            summary += f" {len(job.errors)} folder(s) could not be read."
+        job.panel.finish(summary)
+    
+    def _commit_import_batch(self, job: 'FolderImportJob'):
+        """Add the pending files of an import job to the library"""
+        job.last_commit_at = time.monotonic()
+        if not job.pending and not job.pending_metadata:
+            return
+        
+        with self.batch():
+            # Re-check against the live index for documents added since the job started
+            path_index = self.get_path_index()
+            imported_ids = []
+            for found in job.pending:
+                if found.path in path_index:
+                    job.skipped_path += 1
+                    continue
+                imported_ids.append(self.add_file_document(found.path).id)
+            job.created_ids.update(imported_ids)
+            
+            # Metadata always arrives after its file, so its document exists by now. Documents
+            # that were already in the library keep the fields the user gave them.
+            updated_ids = []
+            for path, meta in job.pending_metadata:
+                for doc_id in path_index.by_path.get(normalize_path(path), ()):
+                    if doc_id in job.created_ids:
+                        self.apply_metadata(self.docs[doc_id], meta)
+                        updated_ids.append(doc_id)
+            
+            job.pending = []
+            job.pending_metadata = []
+            job.imported += len(imported_ids)
+            self.mark_changed(imported_ids + updated_ids)
+    
+    def import_manifest(self):
+        """Import documents listed in a CSV or JSONL file in the background"""
+        manifest_path = filedialog.askopenfilename(
+            title="Select document list",
+            filetypes=[("Document lists", "*.csv *.jsonl *.ndjson"), ("All files", "*.*")]
+        )
+        if not manifest_path:
+            return
+        
+        job = ManifestImportJob(manifest_path, self.file_health)
+        job.team_index = {team.name.lower(): team.id for team in self.teams.values()}
+        job.known_urls = {doc.url for doc in self.docs.values() if doc.source_type == "url" and doc.url}
+        job.panel = ProgressDialog(self.root, "Importing Document List",
+                                   ["Rows read", "Imported", "Already in library", "New teams", "Errors"],
+                                   on_cancel=job.cancel)
+        job.panel.set_message(f"Reading {os.path.basename(manifest_path)}")
+        job.start()
+        self.root.after(self.IMPORT_POLL_MS, self._poll_manifest_import, job)
+    
+    @timed()
+    def _poll_manifest_import(self, job: ManifestImportJob):
+        finished = False
+        with self.batch():
+            while True:
+                try:
+                    kind, payload = job.results.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == "rows":
+                    self._commit_manifest_rows(job, payload)
+                elif kind == "errors":
+                    job.add_errors(payload)
+                elif kind == "done":
+                    finished = True
+                    break
+        
+        job.panel.set_values({
+            "Rows read": f"{job.read:,}",
+            "Imported": f"{job.imported:,}",
+            "Already in library": f"{job.skipped:,}",
+            "New teams": f"{job.teams_created:,}",
+            "Errors": f"{job.error_count:,}",
+        })
+        if not finished:
+            self.root.after(self.IMPORT_POLL_MS, self._poll_manifest_import, job)
+            return
         
-        if imported_count > 0:
+        summary = f"Imported {job.imported} documents"
+        if job.cancelled:
+            summary = f"Cancelled. Kept {job.imported} imported document(s)"
+        if job.skipped:
+            summary += f", {job.skipped} already in the library"
+        summary += "."
+        if job.errors:
+            report = self.data_file.parent / "import_errors.txt"
+            try:
+                report.parent.mkdir(parents=True, exist_ok=True)
+                with open(report, 'w', encoding='utf-8') as f:
+                    f.write(f"Errors importing {job.manifest_path}\n")
+                    for error in job.errors:
+                        f.write(f"line {error.line}: {error.message}\n")
+                summary += f" {job.error_count} row(s) had errors; see {report}"
+            except OSError:
+                first = job.errors[0]
+                summary += f" {job.error_count} row(s) had errors (line {first.line}: {first.message})"
+        job.panel.finish(summary)
+    
+    def _commit_manifest_rows(self, job: ManifestImportJob, rows: List[ManifestRow]):
+        """Add one chunk of checked manifest rows to the library"""
+        path_index = self.get_path_index()
+        added_ids = []
+        teams_before = job.teams_created
+        for row in rows:
+            if row.source_type == "file" and row.path in path_index:
+                job.skipped += 1
+                continue
+            if row.source_type == "url" and row.url in job.known_urls:
+                job.skipped += 1
+                continue
+            
+            team_id = None
+            if row.team:
+                team_id = job.team_index.get(row.team.lower())
+                if team_id not in self.teams:
+                    team_id = self.generate_id("team")
+                    self.teams[team_id] = Team(id=team_id, name=row.team)
+                    job.team_index[row.team.lower()] = team_id
+                    job.teams_created += 1
+            
+            doc = DocEntry(
+                id=self.generate_id("doc"),
+                name=row.name,
+                source_type=row.source_type,
+                url=row.url,
+                file_path=row.path,
+                tags=row.tags,
+                team_id=team_id,
+                favorite=row.favorite
+            )
+            self.docs[doc.id] = doc
+            path_index.update(doc.id, doc)
+            if row.url:
+                job.known_urls.add(row.url)
+            added_ids.append(doc.id)
+        
+        job.imported += len(added_ids)
+        if job.teams_created != teams_before:
+            self.refresh_teams()
+        self.mark_changed(added_ids)
+    
+    def import_archive(self):
+        """Extract the Word documents of a zip archive into the library folder and import them"""
+        archive_path = filedialog.askopenfilename(
+            title="Select archive of Word documents",
+            filetypes=[("Zip archives", "*.zip"), ("All files", "*.*")]
+        )
+        if not archive_path:
+            return
+        
+        job = ArchiveImportJob(archive_path, archive_folder(self.library_dir, archive_path),
+                               include=self.settings['import_include'],
+                               exclude=self.settings['import_exclude'])
+        job.panel = ProgressDialog(self.root, "Importing Archive",
+                                   ["Documents", "Extracted", "Unchanged", "Imported"],
+                                   on_cancel=job.cancel)
+        job.panel.set_message(f"Extracting {os.path.basename(archive_path)} to {job.dest_dir}")
+        job.start()
+        self.root.after(self.IMPORT_POLL_MS, self._poll_archive_import, job)
+    
+    @timed()
+    def _poll_archive_import(self, job: ArchiveImportJob):
+        finished = False
+        added_ids = []
+        path_index = self.get_path_index()
+        with self.batch():
+            while True:
+                try:
+                    kind, payload = job.results.get_nowait()
+                except queue.Empty:
+                    break
+                if kind in ("extracted", "unchanged", "conflict"):
+                    if kind == "extracted":
+                        job.extracted += len(payload)
+                        # Rewritten files must be re-read by the health check
+                        self.file_health.invalidate(payload)
+                    elif kind == "conflict":
+                        job.conflicts += len(payload)
+                    else:
+                        job.unchanged += len(payload)
+                    for path in payload:
+                        if path not in path_index:
+                            added_ids.append(self.add_file_document(path).id)
+                elif kind == "error":
+                    job.errors.append(payload)
+                elif kind == "done":
+                    finished = True
+                    break
+            
+            job.imported += len(added_ids)
+            self.mark_changed(added_ids)
+        job.panel.set_values({
+            "Documents": f"{job.members:,}",
+            "Extracted": f"{job.extracted:,}",
+            "Unchanged": f"{job.unchanged:,}",
+            "Imported": f"{job.imported:,}",
+        })
+        if not finished:
+            self.root.after(self.IMPORT_POLL_MS, self._poll_archive_import, job)
+            return
+        
+        summary = "Cancelled. " if job.cancelled else ""
+        summary += (f"Extracted {job.extracted} file(s), {job.unchanged} unchanged; "
+                    f"{job.imported} new document(s) added.")
+        if job.conflicts:
+            summary += (f" {job.conflicts} file(s) had been edited since the last import and were kept;"
+                        f" the archive's versions were saved beside them.")
+        if job.errors:
+            summary += f" {len(job.errors)} error(s): {job.errors[0]}"
+        job.panel.finish(summary)
+    
+    def add_file_document(self, file_path: str) -> DocEntry:
+        """Add a library entry for a file, named after it; caller marks it changed"""
+        doc_id = self.generate_id("doc")
+        doc = DocEntry(
+            id=doc_id,
+            name=os.path.basename(file_path),
+            source_type="file",
+            file_path=file_path
+        )
+        rules = self.get_compiled_rules()
+        if rules:
+            self.apply_rule_match(doc, rules.match(file_path))
+        self.docs[doc_id] = doc
+        self.get_path_index().update(doc_id, doc)
+        return doc
+    
+    def get_compiled_rules(self) -> CompiledRules:
+        if self._compiled_rules is None:
+            self._compiled_rules = CompiledRules(self.rules)
+        return self._compiled_rules
+    
+    def set_rules(self, rules: List[Rule]):
+        self.rules = list(rules)
+        self._compiled_rules = None
+        self.save_data()
+    
+    def apply_rule_match(self, doc: DocEntry, match: RuleMatch) -> bool:
+        """Add a rule match's tags and, if the document is ungrouped, its team; True if it changed"""
+        changed = False
+        new_tags = [tag for tag in match.tags if tag not in doc.tags]
+        if new_tags:
+            doc.tags = doc.tags + new_tags
+            changed = True
+        if match.team and not doc.team_id:
+            doc.team_id = self.team_id_for_name(match.team)
+            changed = True
+        return changed
+    
+    def team_id_for_name(self, name: str) -> str:
+        """Id of the team with this name (ignoring case), creating it if needed"""
+        key = name.lower()
+        # Remembered ids are re-checked, since teams can be renamed or deleted
+        team = self.teams.get(self._team_ids_by_name.get(key))
+        if team is not None and team.name.lower() == key:
+            return team.id
+        for team in self.teams.values():
+            if team.name.lower() == key:
+                self._team_ids_by_name[key] = team.id
+                return team.id
+        team_id = self.generate_id("team")
+        self.teams[team_id] = Team(id=team_id, name=name)
+        self._team_ids_by_name[key] = team_id
+        # Joins the caller's batch, so an import creating many teams saves once
+        with self.batch():
+            self.refresh_teams()
             self.save_data()
-            self.refresh_documents()
-            messagebox.showinfo("Success", f"Imported {imported_count} documents!")
+        return team_id
+    
+    def edit_rules(self):
+        """Manage the tag and team rules"""
+        RulesDialog(self.root, self)
+    
+    def apply_rules_to_library(self):
+        """Run the rules over every file in the library on a worker thread"""
+        rules = self.get_compiled_rules()
+        if not rules:
+            messagebox.showinfo("Info", "There are no rules to apply.")
+            return
+        items = [(doc.id, doc.file_path) for doc in self.docs.values()
+                 if doc.source_type == "file" and doc.file_path]
+        self.status_var.set(f"Applying {len(rules.rules)} rule(s) to {len(items)} document(s)...")
+        results: queue.Queue = queue.Queue()
+        
+        def worker():
+            try:
+                results.put((match_paths(rules, items), None))
+            except Exception as e:
+                results.put((None, e))
+        
+        threading.Thread(target=worker, name="docsmart-rules", daemon=True).start()
+        self.root.after(self.IMPORT_POLL_MS, self._poll_rules_job, results)
+    
+    @timed()
+    def _poll_rules_job(self, results: queue.Queue):
+        try:
+            matches, error = results.get_nowait()
+        except queue.Empty:
+            self.root.after(self.IMPORT_POLL_MS, self._poll_rules_job, results)
+            return
+        if error is not None:
+            self.status_var.set("")
+            messagebox.showerror("Error", f"Failed to apply rules: {error}")
+            return
+        
+        changed_ids = []
+        with self.batch():
+            for doc_id, match in matches:
+                doc = self.docs.get(doc_id)
+                if doc is not None and self.apply_rule_match(doc, match):
+                    changed_ids.append(doc_id)
+            self.mark_changed(changed_ids)
+        self.status_var.set(f"Rules updated {len(changed_ids)} document(s)")
+    
+    def apply_metadata(self, doc: DocEntry, meta: DocMetadata):
+        """Store a file's document properties; its title replaces a file-name name"""
+        doc.metadata = meta.to_dict()
+        if meta.title and doc.file_path and doc.name == os.path.basename(doc.file_path):
+            doc.name = meta.title
+    
+    def edit_watched_folders(self):
+        """Manage the folders kept in sync with the library"""
+        WatchedFoldersDialog(self.root, self)
+    
+    def add_watched_folder(self, folder: str) -> bool:
+        if any(normalize_path(folder) == normalize_path(f) for f in self.watched_folders):
+            return False
+        self.watched_folders.append(folder)
+        self.save_data()
+        self.sync_watched_folders([folder])
+        self.restart_live_watch()
+        return True
+    
+    def remove_watched_folder(self, folder: str):
+        """Stop watching a folder; its documents stay in the library"""
+        self.watched_folders.remove(folder)
+        self.save_data()
+        self.restart_live_watch()
+        try:
+            Manifest.path_for(folder, self.manifest_dir).unlink()
+        except OSError:
+            pass
+    
+    @timed()
+    def sync_watched_folders(self, folders: Optional[List[str]] = None):
+        """Re-scan watched folders in the background and apply only what changed"""
+        folders = list(folders or self.watched_folders)
+        if not folders:
+            messagebox.showinfo("Info", "No watched folders. Add one under Tools > Watched Folders.")
+            return
+        if self._sync_running:
+            return
+        
+        self._sync_running = True
+        self.status_var.set(f"Syncing {len(folders)} watched folder(s)...")
+        
+        include = list(self.settings['import_include'])
+        exclude = list(self.settings['import_exclude'])
+        manifest_dir = self.manifest_dir
+        results: queue.Queue = queue.Queue()
+        
+        def worker():
+            for folder in folders:
+                try:
+                    results.put(("result", sync_folder(folder, manifest_dir, include, exclude)))
+                except Exception as e:
+                    results.put(("error", f"{folder}: {e}"))
+            results.put(("done", None))
+        
+        threading.Thread(target=worker, name="docsmart-sync", daemon=True).start()
+        totals = {'added': 0, 'changed': 0, 'moved': 0, 'deleted': 0, 'errors': []}
+        self.root.after(self.IMPORT_POLL_MS, self._poll_folder_sync, results, totals, time.monotonic())
+    
+    def _poll_folder_sync(self, results: queue.Queue, totals: Dict[str, Any], started_at: float):
+        while True:
+            try:
+                kind, payload = results.get_nowait()
+            except queue.Empty:
+                self.root.after(self.IMPORT_POLL_MS, self._poll_folder_sync, results, totals, started_at)
+                return
+            if kind == "result":
+                applied = self.apply_folder_sync(payload)
+                for key, count in applied.items():
+                    totals[key] += count
+                totals['errors'].extend(payload.errors)
+            elif kind == "error":
+                totals['errors'].append(payload)
+            elif kind == "done":
+                break
+        
+        self._sync_running = False
+        elapsed = time.monotonic() - started_at
+        self.status_var.set(
+            f"Sync finished in {elapsed:.1f}s: {totals['added']} new, {totals['changed']} changed, "
+            f"{totals['moved']} moved, {totals['deleted']} removed"
+            + (f", {len(totals['errors'])} error(s)" if totals['errors'] else ""))
+        if totals['errors']:
+            messagebox.showwarning("Warning", "Some watched folders could not be fully read:\n\n"
+                                   + "\n".join(totals['errors'][:10]))
+    
+    @timed()
+    def apply_folder_sync(self, result: FolderSyncResult) -> Dict[str, int]:
+        """Apply one folder's changes to the library, then save its new manifest"""
+        folder, changes = result.folder, result.changes
+        applied = self.apply_file_changes(
+            added=[os.path.join(folder, rel) for rel in changes.added],
+            moved=[(os.path.join(folder, old_rel), os.path.join(folder, new_rel))
+                   for old_rel, new_rel in changes.moved],
+            deleted=[os.path.join(folder, rel) for rel in changes.deleted]
+        )
+        
+        # Save the manifest only once the library reflects it
+        threading.Thread(target=result.manifest.save, args=(self.manifest_dir,),
+                         name="docsmart-manifest", daemon=True).start()
+        return dict(applied, changed=len(changes.changed))
+    
+    def apply_file_changes(self, added: Iterable[str], moved: Iterable[tuple],
+                           deleted: Iterable[str]) -> Dict[str, int]:
+        """Bring file entries in line with files that appeared, moved or disappeared"""
+        with self.batch():
+            path_index = self.get_path_index()
+            changed_ids = []
+            moved_count = 0
+            deleted_count = 0
+            
+            def docs_at(path: str) -> List[str]:
+                return list(path_index.by_path.get(normalize_path(path), ()))
+            
+            added_paths = list(added)
+            for old_path, new_path in moved:
+                doc_ids = docs_at(old_path)
+                if not doc_ids:
+                    added_paths.append(new_path)
+                    continue
+                for doc_id in doc_ids:
+                    doc = self.docs[doc_id]
+                    # Follow the rename unless the user gave the document its own name
+                    if doc.name == os.path.basename(old_path):
+                        doc.name = os.path.basename(new_path)
+                    doc.file_path = new_path
+                    path_index.update(doc_id, doc)
+                    changed_ids.append(doc_id)
+                # A rename keeps the content, so the identity recorded for the old path still holds
+                self.file_health.put(new_path, True, doc.file_size, doc.file_fingerprint)
+                moved_count += 1
+            
+            for path in deleted:
+                for doc_id in docs_at(path):
+                    del self.docs[doc_id]
+                    path_index.update(doc_id, None)
+                    changed_ids.append(doc_id)
+                    deleted_count += 1
+            
+            added_count = 0
+            for path in added_paths:
+                if path not in path_index:
+                    changed_ids.append(self.add_file_document(path).id)
+                    added_count += 1
+            
+            self.mark_changed(changed_ids)
+            return {'added': added_count, 'moved': moved_count, 'deleted': deleted_count}
+    
+    def start_live_watch(self):
+        """Watch the watched folders for changes if live watching is on"""
+        if self.watcher is not None or not self.settings['live_watch'] or not self.watched_folders:
+            return
+        self.watch_changes = ChangeCoalescer()
+        self.watcher = create_watcher(self.watched_folders, self.watch_changes,
+                                      self.settings['import_include'], self.settings['import_exclude'])
+        self.watcher.start()
+        self.root.after(self.WATCH_POLL_MS, self._poll_live_changes, self.watcher)
+    
+    def stop_live_watch(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+        self.watcher = None
+        self.watch_changes = None
+    
+    def restart_live_watch(self):
+        """Pick up a changed folder list or file filters"""
+        self.stop_live_watch()
+        self.start_live_watch()
+    
+    def toggle_live_watch(self):
+        self.settings['live_watch'] = self.live_watch_var.get()
+        self.save_data()
+        self.restart_live_watch()
+    
+    def _poll_live_changes(self, watcher):
+        if watcher is not self.watcher:
+            return  # stopped or replaced
+        changes = self.watch_changes.take()
+        if changes is not None:
+            self.apply_live_changes(changes)
+        if self._pending_rescans and not self._sync_running:
+            self.sync_watched_folders(sorted(self._pending_rescans))
+            self._pending_rescans.clear()
+        self.root.after(self.WATCH_POLL_MS, self._poll_live_changes, watcher)
+    
+    @timed()
+    def apply_live_changes(self, changes: ChangeBatch):
+        """Apply one coalesced burst of file events as a single library update"""
+        applied = self.apply_file_changes(changes.created, changes.moved, changes.deleted)
+        # Folder moves, deletions and event overflows are settled by a manifest sync
+        self._pending_rescans.update(changes.rescan)
+        if any(applied.values()):
+            self.status_var.set(
+                f"Watched folders: {applied['added']} new, {applied['moved']} moved, "
+                f"{applied['deleted']} removed")
+    
+    def start_open_state_tracking(self):
+        """Keep Open status in step with the editor, where the backend can list open documents"""
+        backend = self.get_backend()
+        if self.open_state is not None or not backend.can_list:
+            return
+        self.open_state = OpenStateReconciler(backend, self.OPEN_STATE_INTERVAL)
+        self.root.after(self.OPEN_STATE_TICK_MS, self._poll_open_state)
+    
+    def _poll_open_state(self):
+        if self.open_state.due():
+            try:
+                self.reconcile_open_state()
+            except Exception as e:
+                self.status_var.set(f"Could not check which documents are open: {e}")
+        self.root.after(self.OPEN_STATE_TICK_MS, self._poll_open_state)
+    
+    @timed()
+    def reconcile_open_state(self) -> Optional[OpenStateDiff]:
+        """Ask the editor what is open and update every document's Open status in one batch"""
+        open_keys = self.open_state.poll()
+        if open_keys is None:
+            return None
+        
+        now = datetime.now().timestamp()
+        marked_open, recently_opened, urls = [], set(), []
+        for doc in self.docs.values():
+            if doc.is_open:
+                marked_open.append(doc.id)
+                if doc.last_opened_at and now - doc.last_opened_at < self.OPEN_STATE_GRACE:
+                    recently_opened.add(doc.id)
+            if doc.source_type == "url" and doc.url:
+                urls.append((doc.id, doc.url))
+        diff = diff_open_state(open_keys, self.get_path_index().by_path, urls, marked_open, recently_opened)
+        if diff:
+            for doc_id in diff.opened:
+                self.docs[doc_id].is_open = True
+            for doc_id in diff.closed:
+                self.docs[doc_id].is_open = False
+            self.mark_changed(diff.changed)
+        return diff
+    
+    def _scheduled_health_check(self):
+        self.check_file_health()
+        self.root.after(self.HEALTH_CHECK_INTERVAL_MS, self._scheduled_health_check)
+    
+    def check_file_health(self, fresh: bool = False):
+        """Check in the background that every file-backed document's file exists"""
+        if self._health_running:
+            return
+        file_docs = [doc for doc in self.docs.values() if doc.source_type == "file" and doc.file_path]
+        if not file_docs:
+            return
+        paths = {doc.file_path for doc in file_docs}
+        # Fingerprint each file once, so it can be found again if it moves
+        fingerprint_paths = {doc.file_path for doc in file_docs if not doc.file_fingerprint}
+        if fresh:
+            self.file_health.invalidate()
+        
+        self._health_running = True
+        cache = self.file_health
+        results: queue.Queue = queue.Queue()
+        
+        def worker():
+            try:
+                for batch in check_paths(paths, cache, fingerprint_paths):
+                    results.put(("results", batch))
+            except Exception as e:
+                results.put(("error", str(e)))
+            results.put(("done", None))
+        
+        threading.Thread(target=worker, name="docsmart-health", daemon=True).start()
+        totals = {'checked': 0, 'missing': 0, 'learned': 0}
+        self.root.after(self.IMPORT_POLL_MS, self._poll_file_health, results, totals)
+    
+    def _poll_file_health(self, results: queue.Queue, totals: Dict[str, int]):
+        path_index = self.get_path_index()
+        changed_ids = []
+        done = False
+        while True:
+            try:
+                kind, payload = results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "done":
+                done = True
+                break
+            if kind == "error":
+                continue
+            for probe in payload:
+                totals['checked'] += 1
+                totals['missing'] += not probe.exists
+                for doc_id in path_index.by_path.get(normalize_path(probe.path), ()):
+                    doc = self.docs[doc_id]
+                    if self.set_file_missing(doc, not probe.exists, refresh=False):
+                        changed_ids.append(doc_id)
+                    if probe.exists and self.record_file_identity(doc, probe):
+                        totals['learned'] += 1
+        
+        if changed_ids:
+            # Missing state isn't saved, so only redraw
+            self.refresh_documents(changed_ids)
+        if not done:
+            self.root.after(self.IMPORT_POLL_MS, self._poll_file_health, results, totals)
+            return
+        self._health_running = False
+        if totals['learned']:
+            self.save_data()
+        if totals['missing']:
+            self.status_var.set(f"{totals['missing']} of {totals['checked']} document files are missing")
+    
+    def record_file_identity(self, doc: DocEntry, probe: FileProbe) -> bool:
+        """Remember a present file's size and fingerprint; True if anything changed"""
+        if probe.size is None:
+            # Existence-only probe; nothing to learn about the file's identity
+            return False
+        if probe.fingerprint:
+            if (doc.file_size, doc.file_fingerprint) == (probe.size, probe.fingerprint):
+                return False
+            doc.file_size, doc.file_fingerprint = probe.size, probe.fingerprint
+            return True
+        if doc.file_size == probe.size:
+            return False
+        # Resized since it was fingerprinted; take a new fingerprint next check
+        doc.file_size, doc.file_fingerprint = probe.size, None
+        return True
+    
+    def set_file_missing(self, doc: DocEntry, missing: bool, refresh: bool = True) -> bool:
+        """Flag or clear a document's missing file; True if that changed its status"""
+        was_missing = self.missing.get(doc.id) == doc.file_path
+        if missing:
+            self.missing[doc.id] = doc.file_path
         else:
-            messagebox.showinfo("Info", "No Word documents found in the selected folder.")
+            self.missing.pop(doc.id, None)
+        if was_missing == missing:
+            return False
+        if refresh:
+            self.refresh_documents([doc.id])
+        return True
+    
+    def relink_missing_files(self):
+        """Search folders for the files of documents flagged Missing and relink them"""
+        broken = [BrokenFile(doc.id, doc.file_path, doc.file_size, doc.file_fingerprint)
+                  for doc in self.docs.values()
+                  if doc.file_path and self.missing.get(doc.id) == doc.file_path]
+        if not broken:
+            messagebox.showinfo("Info", "No documents are flagged as missing. "
+                                "Run Tools > Check for Missing Files first.")
+            return
+        folder = filedialog.askdirectory(title="Select folder to search for moved documents")
+        if not folder:
+            return
+        
+        roots = unique_roots([folder] + [f for f in self.watched_folders if os.path.isdir(f)])
+        finder = RelocationFinder(broken, roots,
+                                  include=self.settings['import_include'],
+                                  exclude=self.settings['import_exclude'],
+                                  library_paths=list(self.get_path_index().by_path))
+        panel = ProgressDialog(self.root, "Relinking Documents",
+                               ["Missing", "Scanned", "Candidates", "Fingerprinted"],
+                               on_cancel=finder.cancel)
+        panel.set_message(f"Searching {len(roots)} folder(s) for {len(broken)} missing file(s)")
+        results: queue.Queue = queue.Queue()
+        
+        def worker():
+            try:
+                results.put((finder.find(), None))
+            except Exception as e:
+                results.put((None, e))
+        
+        threading.Thread(target=worker, name="docsmart-relocate", daemon=True).start()
+        self.root.after(self.IMPORT_POLL_MS, self._poll_relink, finder, panel, results)
+    
+    def _poll_relink(self, finder: RelocationFinder, panel: 'ProgressDialog', results: queue.Queue):
+        panel.set_values({
+            "Missing": f"{len(finder.broken):,}",
+            "Scanned": f"{finder.scanned:,}",
+            "Candidates": f"{finder.candidates:,}",
+            "Fingerprinted": f"{finder.fingerprinted:,}",
+        })
+        try:
+            result, error = results.get_nowait()
+        except queue.Empty:
+            self.root.after(self.IMPORT_POLL_MS, self._poll_relink, finder, panel, results)
+            return
+        
+        if error is not None:
+            panel.finish(f"Search failed: {error}")
+            return
+        if finder.cancel_event.is_set():
+            panel.finish("Cancelled. No documents were relinked.")
+            return
+        relinked = self.apply_relocations(result.relocations)
+        summary = f"Relinked {relinked} of {len(finder.broken)} missing document(s)."
+        if result.unresolved:
+            summary += f" {len(result.unresolved)} could not be found or matched more than one file."
+        if result.errors:
+            summary += f" {len(result.errors)} folder(s) could not be read."
+        panel.finish(summary)
     
+    @timed()
+    def apply_relocations(self, relocations: Iterable[Relocation]) -> int:
+        """Point documents at their files' new locations, keeping everything else"""
+        path_index = self.get_path_index()
+        changed_ids = []
+        for relocation in relocations:
+            doc = self.docs.get(relocation.doc_id)
+            if doc is None or doc.file_path != relocation.old_path:
+                continue  # removed or edited while the search ran
+            # Follow a rename unless the user gave the document its own name
+            if doc.name == os.path.basename(relocation.old_path):
+                doc.name = os.path.basename(relocation.new_path)
+            doc.file_path = relocation.new_path
+            path_index.update(doc.id, doc)
+            self.missing.pop(doc.id, None)
+            self.file_health.put(relocation.new_path, True, doc.file_size, doc.file_fingerprint)
+            changed_ids.append(doc.id)
+        self.mark_changed(changed_ids)
+        return len(changed_ids)
+    
+    @timed()
     def export_data(self):
         """Export data to JSON file"""
         file_path = filedialog.asksaveasfilename(
@@ -350,6 +1709,9 @@ class DocSmartApp:
     
     def refresh_teams(self):
         """Refresh teams listbox"""
+        if self._batch_depth:
+            self._teams_refresh_pending = True
+            return
         self.teams_listbox.delete(0, tk.END)
         self.teams_listbox.insert(0, "All Documents")
         self.teams_listbox.insert(1, "Ungrouped")
@@ -357,54 +1719,187 @@ class DocSmartApp:
         for team in sorted(self.teams.values(), key=lambda t: t.name):
             self.teams_listbox.insert(tk.END, team.name)
     
-    def refresh_documents(self):
-        """Refresh documents treeview"""
+    @timed()
+    def refresh_documents(self, doc_ids: Optional[Iterable[str]] = None):
+        """Refresh documents treeview (only the given rows when doc_ids is set)"""
+        if self._batch_depth:
+            if doc_ids is None:
+                self._full_refresh_pending = True
+            else:
+                self._dirty_doc_ids.update(doc_ids)
+            return
+        
+        if doc_ids is not None:
+            doc_ids = set(doc_ids)
+            self._update_indexes(doc_ids)
+            self._refresh_document_rows(doc_ids)
+            return
+        
         # Clear existing items
-        for item in self.docs_tree.get_children():
-            self.docs_tree.delete(item)
+        self.docs_tree.delete(*self.docs_tree.get_children())
         
-        # Filter documents
-        filtered_docs = []
+        # Add to treeview
+        for doc in self.get_visible_documents():
+            self.docs_tree.insert('', tk.END, iid=doc.id, values=self._document_row(doc))
+    
+    def _refresh_document_rows(self, doc_ids: set):
+        """Bring the rows of the given documents up to date in place"""
+        index = self.get_sort_index(self.sort_column)
+        is_visible = self.visibility_filter()
+        
+        placed = []
+        for doc_id in doc_ids:
+            exists = self.docs_tree.exists(doc_id)
+            doc = self.docs.get(doc_id)
+            if doc is None or not is_visible(doc):
+                if exists:
+                    self.docs_tree.delete(doc_id)
+                continue
+            
+            values = self._document_row(doc)
+            if exists:
+                self.docs_tree.item(doc_id, values=values)
+                self.docs_tree.detach(doc_id)
+            else:
+                self.docs_tree.insert('', tk.END, iid=doc_id, values=values)
+                self.docs_tree.detach(doc_id)
+            placed.append(doc_id)
+        if not placed:
+            return
+        
+        # The remaining rows are still in sort order, so each changed row's
+        # position is a bisection over them by its SortIndex entry
+        descending = self.sort_descending
+        rows = list(self.docs_tree.get_children())
+        placed.sort(key=index.entry, reverse=descending)
+        for doc_id in placed:
+            entry = index.entry(doc_id)
+            low, high = 0, len(rows)
+            while low < high:
+                middle = (low + high) // 2
+                other = index.entry(rows[middle])
+                if (other > entry) if descending else (other < entry):
+                    low = middle + 1
+                else:
+                    high = middle
+            rows.insert(low, doc_id)
+            self.docs_tree.move(doc_id, '', low)
+    
+    def visibility_filter(self) -> Callable[[DocEntry], bool]:
+        """Predicate for the current team, search and favorite filters"""
+        selected_team_id = self.selected_team_id
         search_term = self.search_text.get().lower()
+        favorite_only = self.favorite_only.get()
         
-        for doc in self.docs.values():
+        def is_visible(doc: DocEntry) -> bool:
             # Team filter
-            if self.selected_team_id == "ungrouped" and doc.team_id:
-                continue
-            elif self.selected_team_id and self.selected_team_id != "ungrouped" and doc.team_id != self.selected_team_id:
-                continue
+            if selected_team_id == "ungrouped" and doc.team_id:
+                return False
+            elif selected_team_id and selected_team_id != "ungrouped" and doc.team_id != selected_team_id:
+                return False
             
             # Search filter
             if search_term:
                 if (search_term not in doc.name.lower() and 
                     not any(search_term in tag.lower() for tag in doc.tags)):
-                    continue
+                    return False
             
             # Favorite filter
-            if self.favorite_only.get() and not doc.favorite:
-                continue
-            
-            filtered_docs.append(doc)
+            return not (favorite_only and not doc.favorite)
+        return is_visible
+    
+    def get_visible_documents(self) -> List[DocEntry]:
+        """Documents matching the current team, search and favorite filters, in display order"""
+        is_visible = self.visibility_filter()
+        index = self.get_sort_index(self.sort_column)
+        docs = (self.docs.get(doc_id) for doc_id in index.ids(self.sort_descending))
+        return [doc for doc in docs if doc is not None and is_visible(doc)]
+    
+    def sort_key_func(self, column: Optional[str]) -> Callable[[DocEntry], Any]:
+        """Sort key for a column heading, or the default order for None"""
+        if column == 'Name':
+            return lambda d: d.name.lower()
+        if column == 'Team':
+            return lambda d: self.get_team_name(d).lower()
+        if column == 'Tags':
+            return lambda d: ", ".join(d.tags).lower()
+        if column == 'Status':
+            return self.get_document_status
+        if column == 'Last Opened':
+            return lambda d: d.last_opened_at or 0
+        # Default: favorites first, then by last opened, then by name
+        return lambda d: (not d.favorite, -(d.last_opened_at or 0), d.name.lower())
+    
+    def get_sort_index(self, column: Optional[str]) -> SortIndex:
+        """Sort index for a column, built on first use and kept current after that"""
+        index = self.sort_indexes.get(column)
+        if index is None:
+            index = self.sort_indexes[column] = SortIndex(self.sort_key_func(column))
+        if not index.built:
+            index.rebuild(self.docs.values())
+        return index
+    
+    def get_path_index(self) -> PathIndex:
+        """Index of documents by normalized file path"""
+        if not self.path_index.built:
+            self.path_index.rebuild(self.docs.values())
+        return self.path_index
+    
+    def _update_indexes(self, doc_ids: Iterable[str]):
+        """Reposition changed documents in every built index; the one path for per-document changes"""
+        for index in [self.path_index, *self.sort_indexes.values()]:
+            if index.built:
+                for doc_id in doc_ids:
+                    index.update(doc_id, self.docs.get(doc_id))
+    
+    def invalidate_indexes(self):
+        """Rebuild every index on next use, after changes too broad to track per document"""
+        for index in [self.path_index, *self.sort_indexes.values()]:
+            index.built = False
+    
+    @timed()
+    def sort_by_column(self, column: str):
+        """Sort by a column heading; clicking the active column reverses it"""
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
         
-        # Sort documents (favorites first, then by last opened, then by name)
-        filtered_docs.sort(key=lambda d: (
-            not d.favorite,
-            -(d.last_opened_at or 0),
-            d.name.lower()
-        ))
+        for col in self.docs_tree['columns']:
+            arrow = (" ▼" if self.sort_descending else " ▲") if col == column else ""
+            self.docs_tree.heading(col, text=col + arrow)
         
-        # Add to treeview
-        for doc in filtered_docs:
-            team_name = self.teams[doc.team_id].name if doc.team_id and doc.team_id in self.teams else "—"
-            tags_str = ", ".join(doc.tags) if doc.tags else "—"
-            status = "Open" if doc.is_open else "Closed"
-            last_opened = datetime.fromtimestamp(doc.last_opened_at).strftime("%Y-%m-%d %H:%M") if doc.last_opened_at else "—"
-            
-            # Add star for favorites
-            name_display = f"★ {doc.name}" if doc.favorite else doc.name
-            
-            self.docs_tree.insert('', tk.END, values=(name_display, team_name, tags_str, status, last_opened))
+        # The visible rows are unchanged, so reorder them in one call
+        ordered_ids = [doc.id for doc in self.get_visible_documents()]
+        if len(ordered_ids) == len(self.docs_tree.get_children()):
+            self.docs_tree.set_children('', *ordered_ids)
+        else:
+            self.refresh_documents()
+    
+    def get_team_name(self, doc: DocEntry) -> str:
+        """Name of the document's team, or an empty string when ungrouped"""
+        team = self.teams.get(doc.team_id) if doc.team_id else None
+        return team.name if team else ""
+    
+    def get_document_status(self, doc: DocEntry) -> str:
+        if doc.file_path and self.missing.get(doc.id) == doc.file_path:
+            return "Missing"
+        return "Open" if doc.is_open else "Closed"
+    
+    def _document_row(self, doc: DocEntry) -> tuple:
+        """Treeview values for a document"""
+        team_name = self.get_team_name(doc) or "—"
+        tags_str = ", ".join(doc.tags) if doc.tags else "—"
+        status = self.get_document_status(doc)
+        last_opened = datetime.fromtimestamp(doc.last_opened_at).strftime("%Y-%m-%d %H:%M") if doc.last_opened_at else "—"
+        
+        # Add star for favorites
+        name_display = f"★ {doc.name}" if doc.favorite else doc.name
+        
+        return (name_display, team_name, tags_str, status, last_opened)
     
+    @timed()
     def on_team_select(self, event):
         """Handle team selection"""
         selection = self.teams_listbox.curselection()
@@ -425,6 +1920,7 @@ class DocSmartApp:
         
         self.refresh_documents()
     
+    @timed()
     def on_search_change(self, event):
         """Handle search text change"""
         self.refresh_documents()
@@ -433,42 +1929,35 @@ class DocSmartApp:
         """Show context menu for documents"""
         item = self.docs_tree.identify_row(event.y)
         if item:
-            self.docs_tree.selection_set(item)
+            self.build_context_menus()
+            # Keep a multi-selection intact so bulk actions apply to all of it
+            if item not in self.docs_tree.selection():
+                self.docs_tree.selection_set(item)
+            self.refresh_move_team_menu()
             self.context_menu.post(event.x_root, event.y_root)
     
+    def refresh_move_team_menu(self):
+        """Rebuild the "Move to Team" submenu from the current teams"""
+        self.move_team_menu.delete(0, tk.END)
+        self.move_team_menu.add_command(label="Ungrouped",
+                                        command=lambda: self.move_selected_to_team(None))
+        if self.teams:
+            self.move_team_menu.add_separator()
+        for team in sorted(self.teams.values(), key=lambda t: t.name):
+            self.move_team_menu.add_command(label=team.name,
+                                            command=lambda tid=team.id: self.move_selected_to_team(tid))
+    
     def get_selected_document(self) -> Optional[DocEntry]:
-        """Get currently selected document (first one if multiple selected)"""
-        selection = self.docs_tree.selection()
-        if not selection:
-            return None
-        
-        item = selection[0]
-        values = self.docs_tree.item(item, 'values')
-        doc_name = values[0].replace("★ ", "")  # Remove star if present
-        
-        for doc in self.docs.values():
-            if doc.name == doc_name:
-                return doc
-        return None
+        """Get currently selected document (first one if multiple selected)"""
+        selected_docs = self.get_selected_documents()
+        return selected_docs[0] if selected_docs else None
     
     def get_selected_documents(self) -> List[DocEntry]:
         """Get all currently selected documents"""
-        selection = self.docs_tree.selection()
-        if not selection:
-            return []
-        
-        selected_docs = []
-        for item in selection:
-            values = self.docs_tree.item(item, 'values')
-            doc_name = values[0].replace("★ ", "")  # Remove star if present
-            
-            for doc in self.docs.values():
-                if doc.name == doc_name:
-                    selected_docs.append(doc)
-                    break
-        
-        return selected_docs
+        # Rows are keyed by document id
+        return [self.docs[item] for item in self.docs_tree.selection() if item in self.docs]
     
+    @timed()
     def open_selected_documents(self, event=None):
         """Open selected documents in Word"""
         docs = self.get_selected_documents()
@@ -476,16 +1965,18 @@ class DocSmartApp:
             return
         
         opened_count = 0
-        for doc in docs:
-            try:
-                self.open_in_word(doc)
-                opened_count += 1
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to open '{doc.name}': {e}")
+        with self.batch():
+            for doc in docs:
+                try:
+                    if self.open_in_word(doc):
+                        opened_count += 1
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to open '{doc.name}': {e}")
         
         if opened_count > 0:
             messagebox.showinfo("Success", f"Opened {opened_count} document(s)!")
     
+    @timed()
     def toggle_favorite_selected(self):
         """Toggle favorite status of selected documents"""
         docs = self.get_selected_documents()
@@ -500,12 +1991,44 @@ class DocSmartApp:
         for doc in docs:
             doc.favorite = new_favorite_status
         
-        self.save_data()
-        self.refresh_documents()
+        self.mark_changed(doc.id for doc in docs)
         
         action = "Added to" if new_favorite_status else "Removed from"
         messagebox.showinfo("Success", f"{action} favorites: {len(docs)} document(s)!")
     
+    @timed()
+    def retag_selected_documents(self):
+        """Replace the tags of all selected documents"""
+        docs = self.get_selected_documents()
+        if not docs:
+            return
+        
+        # Pre-fill with the tags the selection has in common
+        common_tags = [tag for tag in docs[0].tags if all(tag in doc.tags for doc in docs[1:])]
+        tags_str = simpledialog.askstring("Set Tags", f"Tags for {len(docs)} document(s) (comma-separated):",
+                                          initialvalue=", ".join(common_tags))
+        if tags_str is None:
+            return
+        
+        tags = [tag.strip() for tag in tags_str.split(",") if tag.strip()]
+        for doc in docs:
+            doc.tags = list(tags)
+        
+        self.mark_changed(doc.id for doc in docs)
+    
+    @timed()
+    def move_selected_to_team(self, team_id: Optional[str]):
+        """Assign all selected documents to a team (None to ungroup)"""
+        docs = self.get_selected_documents()
+        if not docs:
+            return
+        
+        for doc in docs:
+            doc.team_id = team_id
+        
+        self.mark_changed(doc.id for doc in docs)
+    
+    @timed()
     def close_selected_documents(self):
         """Close selected documents in Word"""
         docs = self.get_selected_documents()
@@ -515,20 +2038,9 @@ class DocSmartApp:
             messagebox.showinfo("Info", "No open documents selected.")
             return
         
-        if messagebox.askyesno("Confirm", f"Actually close {len(open_docs)} Word documents?"):
-            closed_count = 0
-            
-            for doc in open_docs:
-                if self.actually_close_word_document(doc):
-                    doc.is_open = False
-                    closed_count += 1
-            
-            self.save_data()
-            self.refresh_documents()
-            
-            if closed_count > 0:
-                messagebox.showinfo("Success", f"Closed {closed_count} Word documents!")
+        self.close_documents_in_background(open_docs)
     
+    @timed()
     def edit_selected_document(self):
         """Edit selected document"""
         doc = self.get_selected_document()
@@ -543,10 +2055,10 @@ class DocSmartApp:
                 doc.tags = doc_data.get('tags', [])
                 doc.team_id = doc_data.get('team_id')
                 
-                self.save_data()
-                self.refresh_documents()
+                self.mark_changed([doc.id])
                 messagebox.showinfo("Success", "Document updated successfully!")
     
+    @timed()
     def remove_selected_documents(self):
         """Remove selected documents"""
         docs = self.get_selected_documents()
@@ -556,20 +2068,19 @@ class DocSmartApp:
         if len(docs) == 1:
             if messagebox.askyesno("Confirm", f"Remove document '{docs[0].name}'?"):
                 del self.docs[docs[0].id]
-                self.save_data()
-                self.refresh_documents()
+                self.mark_changed([docs[0].id])
         else:
             if messagebox.askyesno("Confirm", f"Remove {len(docs)} selected documents?"):
                 for doc in docs:
                     del self.docs[doc.id]
-                self.save_data()
-                self.refresh_documents()
+                self.mark_changed(doc.id for doc in docs)
                 messagebox.showinfo("Success", f"Removed {len(docs)} documents!")
     
     def show_team_context_menu(self, event):
         """Show context menu for teams"""
         index = self.teams_listbox.nearest(event.y)
         if index >= 2:  # Skip "All Documents" and "Ungrouped"
+            self.build_context_menus()
             self.teams_listbox.selection_clear(0, tk.END)
             self.teams_listbox.selection_set(index)
             self.team_context_menu.post(event.x_root, event.y_root)
@@ -586,6 +2097,7 @@ class DocSmartApp:
                 return team
         return None
     
+    @timed()
     def rename_selected_team(self):
         """Rename selected team"""
         team = self.get_selected_team()
@@ -593,33 +2105,36 @@ class DocSmartApp:
             new_name = simpledialog.askstring("Rename Team", "Enter new team name:", initialvalue=team.name)
             if new_name and new_name.strip() and new_name.strip() != team.name:
                 team.name = new_name.strip()
-                self.save_data()
                 self.refresh_teams()
-                self.refresh_documents()
+                self.mark_changed(doc.id for doc in self.docs.values() if doc.team_id == team.id)
                 messagebox.showinfo("Success", f"Team renamed to '{new_name}'!")
     
+    @timed()
     def delete_selected_team(self):
         """Delete selected team"""
         team = self.get_selected_team()
         if team:
             if messagebox.askyesno("Confirm", f"Delete team '{team.name}'? Documents will be ungrouped."):
-                # Remove team from all documents
-                for doc in self.docs.values():
-                    if doc.team_id == team.id:
-                        doc.team_id = None
-                
-                # Delete team
-                del self.teams[team.id]
-                
-                # Reset selection if this team was selected
-                if self.selected_team_id == team.id:
-                    self.selected_team_id = None
-                
-                self.save_data()
-                self.refresh_teams()
-                self.refresh_documents()
+                with self.batch():
+                    # Remove team from all documents
+                    team_doc_ids = [doc.id for doc in self.docs.values() if doc.team_id == team.id]
+                    for doc_id in team_doc_ids:
+                        self.docs[doc_id].team_id = None
+                    self.mark_changed(team_doc_ids)
+                    
+                    # Delete team
+                    del self.teams[team.id]
+                    
+                    # Reset selection if this team was selected
+                    if self.selected_team_id == team.id:
+                        self.selected_team_id = None
+                    
+                    self.save_data()
+                    self.refresh_teams()
+                    self.refresh_documents()
                 messagebox.showinfo("Success", f"Team '{team.name}' deleted!")
     
+    @timed()
     def close_all_documents(self):
         """Actually close all currently open Word documents"""
         open_docs = [doc for doc in self.docs.values() if doc.is_open]
@@ -627,18 +2142,9 @@ class DocSmartApp:
             messagebox.showinfo("Info", "No documents are currently open.")
             return
         
-        if messagebox.askyesno("Confirm", f"Actually close {len(open_docs)} Word documents?"):
-            closed_count = 0
-            
-            for doc in open_docs:
-                if self.actually_close_word_document(doc):
-                    doc.is_open = False
-                    closed_count += 1
-            
-            self.save_data()
-            self.refresh_documents()
-            messagebox.showinfo("Success", f"Closed {closed_count} Word documents!")
+        self.close_documents_in_background(open_docs)
     
+    @timed()
     def open_team_documents(self):
         """Open all documents in the selected team"""
         if not self.selected_team_id or self.selected_team_id == "ungrouped":
@@ -651,104 +2157,322 @@ class DocSmartApp:
             return
         
         if messagebox.askyesno("Confirm", f"Open all {len(team_docs)} documents in this team?"):
-            opened_count = 0
-            for doc in team_docs:
-                try:
-                    self.open_in_word(doc)
-                    opened_count += 1
-                except Exception as e:
-                    print(f"Failed to open '{doc.name}': {e}")
-            
-            if opened_count > 0:
-                messagebox.showinfo("Success", f"Opened {opened_count} team documents!")
-    
-    # def actually_close_word_document(self, doc: DocEntry) -> bool:
-    #     """Actually close a Word document using COM automation or process killing"""
-    #     try:
-    #         if platform.system() == "Windows" and WORD_COM_AVAILABLE:
-    #             # Try COM automation first (more precise)
-    #             try:
-    #                 word_app = win32com.client.Dispatch("Word.Application")
-                    
-    #                 # Find and close the specific document
-    #                 for word_doc in word_app.Documents:
-    #                     doc_path = word_doc.FullName.lower()
-    #                     if doc.file_path and doc.file_path.lower() in doc_path:
-    #                         word_doc.Close(SaveChanges=-1)  # -1 = save changes
-    #                         return True
-    #                     elif doc.name.lower() in doc_path:
-    #                         word_doc.Close(SaveChanges=-1)  # -1 = save changes
-    #                         return True
-                    
-    #                 return False
-                    
-    #             except Exception as e:
-    #                 print(f"COM automation failed: {e}")
-    #                 # Fall back to process method
-    #                 pass
-            
-    #         # Fallback: Kill all Word processes (nuclear option)
-    #         if platform.system() == "Windows":
-    #             result = subprocess.run(["taskkill", "/f", "/im", "winword.exe"], 
-    #                                   capture_output=True, text=True)
-    #             return result.returncode == 0
-    #         elif platform.system() == "Darwin":  # macOS
-    #             result = subprocess.run(["pkill", "-f", "Microsoft Word"], 
-    #                                   capture_output=True)
-    #             return result.returncode == 0
-    #         else:  # Linux
-    #             result = subprocess.run(["pkill", "-f", "libreoffice"], 
-    #                                   capture_output=True)
-    #             return result.returncode == 0
-                
-    #     except Exception as e:
-    #         print(f"Failed to close Word document: {e}")
-    #         return False
-
-    def actually_close_word_document(self, doc: DocEntry) -> bool:
-        """Actually close a Word document using COM automation"""
-        try:
-            if platform.system() == "Windows" and WORD_COM_AVAILABLE:
-                try:
-                    word_app = win32com.client.Dispatch("Word.Application")
-                    
-                    # Find and close the specific document
-                    for word_doc in word_app.Documents:
-                        doc_path = word_doc.FullName.lower()
-                        if doc.file_path and doc.file_path.lower() in doc_path:
-                            word_doc.Close(SaveChanges=-1)  # -1 = save changes
-                            # Check if any documents are still open
-                            if word_app.Documents.Count == 0:
-                                word_app.Quit()
-                            return True
-                        elif doc.name.lower() in doc_path:
-                            word_doc.Close(SaveChanges=-1)  # -1 = save changes
-                            # Check if any documents are still open
-                            if word_app.Documents.Count == 0:
-                                word_app.Quit()
-                            return True
-                    
-                    return False
-                    
-                except Exception as e:
-                    messagebox.showerror("Error", f"Could not close document '{doc.name}': {e}")
-                    return False
-            
-            # For non-Windows or when COM is not available, show warning
-            messagebox.showwarning("Warning", 
-                f"Cannot automatically close '{doc.name}'. Please close it manually in Word.")
-            return False
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to close Word document: {e}")
-            return False
-
+            self.open_documents_in_background(team_docs, "Opening Team Documents")
+    
+    def open_documents_in_background(self, docs: List[DocEntry], title: str, in_order: bool = False,
+                                     skipped: int = 0) -> BatchOpenJob:
+        """Open documents a few at a time on worker threads"""
+        requests = []
+        for position, doc in enumerate(docs):
+            target = doc.url if doc.source_type == "url" else doc.file_path
+            if target:
+                priority = position if in_order else (0 if doc.favorite else 1)
+                requests.append(OpenRequest(doc.id, target, priority=priority))
+        job = BatchOpenJob(self.get_backend(), requests, in_order=in_order)
+        job.skipped = skipped
+        job.panel = ProgressDialog(self.root, title, ["Documents", "Opened", "Retried", "Failed", "Docs/sec"],
+                                   on_cancel=job.cancel)
+        job.panel.set_message(f"Opening {len(requests)} document(s), {job.max_concurrent} at a time")
+        job.start()
+        self.root.after(self.IMPORT_POLL_MS, self._poll_batch_open, job)
+        return job
+    
+    @timed()
+    def _poll_batch_open(self, job: BatchOpenJob):
+        finished = False
+        changed_ids = []
+        now = datetime.now().timestamp()
+        while True:
+            try:
+                kind, payload = job.results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "opened":
+                job.opened += len(payload)
+                for doc_id in payload:
+                    doc = self.docs.get(doc_id)
+                    if doc is not None:
+                        doc.is_open = True
+                        doc.last_opened_at = now
+                        changed_ids.append(doc_id)
+            elif kind == "missing":
+                job.missing += len(payload)
+                for doc_id in payload:
+                    doc = self.docs.get(doc_id)
+                    if doc is not None and doc.file_path:
+                        self.file_health.put(doc.file_path, False)
+                        if self.set_file_missing(doc, True, refresh=False):
+                            changed_ids.append(doc_id)
+            elif kind == "failed":
+                job.failures.extend(payload)
+            elif kind == "done":
+                finished = True
+                break
+        
+        self.mark_changed(changed_ids)
+        if finished:
+            job.finished_at = time.monotonic()
+        job.panel.set_values({
+            "Documents": f"{len(job.requests):,}",
+            "Opened": f"{job.opened:,}",
+            "Retried": f"{job.retried:,}",
+            "Failed": f"{len(job.failures) + job.missing:,}",
+            "Docs/sec": f"{job.docs_per_second:.1f}",
+        })
+        if not finished:
+            self.root.after(self.IMPORT_POLL_MS, self._poll_batch_open, job)
+            return
+        
+        summary = "Cancelled. " if job.cancelled else ""
+        summary += f"Opened {job.opened} document(s) in {job.elapsed:.1f}s ({job.docs_per_second:.1f}/sec)."
+        if job.skipped:
+            summary += f" {job.skipped} already open."
+        if job.missing:
+            summary += f" {job.missing} file(s) not found."
+        if job.failures:
+            doc = self.docs.get(job.failures[0][0])
+            summary += (f" {len(job.failures)} failed after retrying, e.g. "
+                        f"'{doc.name if doc else job.failures[0][0]}': {job.failures[0][1]}")
+        self.status_var.set(summary)
+        job.panel.finish(summary)
+    
+    def close_documents_in_background(self, docs: List[DocEntry]) -> Optional[BatchCloseJob]:
+        """Ask once how to treat unsaved changes, then close the documents on a worker thread"""
+        backend = self.get_backend()
+        if not backend.can_close:
+            messagebox.showwarning("Warning",
+                "Cannot automatically close documents. Please close them manually in Word.")
+            return None
+        dialog = CloseDocumentsDialog(self.root, len(docs), backend.name, self.settings['close_save_policy'])
+        if dialog.result is None:
+            return None
+        self.settings['close_save_policy'] = dialog.result
+        self.save_data()
+        
+        targets: Dict[str, str] = {}
+        ids_by_key: Dict[str, List[str]] = {}
+        for doc in docs:
+            target = doc.file_path if doc.source_type == "file" else doc.url
+            if target:
+                ids_by_key.setdefault(document_key(target), []).append(doc.id)
+                targets[document_key(target)] = target
+        panel = ProgressDialog(self.root, "Closing Documents",
+                               ["Documents", "Closed", "Not open", "Unsaved", "Failed"])
+        return self._start_close_job(backend, targets, ids_by_key, dialog.result, panel)
+    
+    def _start_close_job(self, backend: DocumentBackend, targets: Dict[str, str],
+                         ids_by_key: Dict[str, List[str]], save_policy: str, panel,
+                         previous: Optional[BatchCloseJob] = None) -> BatchCloseJob:
+        job = BatchCloseJob(backend, targets, save_policy)
+        job.ids_by_key = ids_by_key
+        job.panel = panel
+        panel.on_cancel = job.cancel
+        panel.set_message(f"Closing {len(targets)} document(s) in {backend.name}")
+        job.total = len(targets)
+        if previous is not None:
+            # Second pass for the documents the user was asked about; report both as one batch
+            job.total = previous.total
+            job.closed, job.not_open = previous.closed, previous.not_open
+            job.failures = list(previous.failures)
+            job.backend_calls = previous.backend_calls
+        job.start()
+        if previous is not None:
+            job.started_at = previous.started_at
+        self.root.after(self.IMPORT_POLL_MS, self._poll_close_job, job)
+        return job
+    
+    @timed()
+    def _poll_close_job(self, job: BatchCloseJob):
+        finished = False
+        changed_ids = []
+        while True:
+            try:
+                kind, payload = job.results.get_nowait()
+            except queue.Empty:
+                break
+            if kind in ("closed", "not_open"):
+                if kind == "closed":
+                    job.closed += len(payload)
+                else:
+                    job.not_open += len(payload)
+                for key in payload:
+                    for doc_id in job.ids_by_key[key]:
+                        doc = self.docs.get(doc_id)
+                        if doc is not None:
+                            doc.is_open = False
+                            changed_ids.append(doc_id)
+            elif kind == "unsaved":
+                job.unsaved.extend(payload)
+            elif kind == "failed":
+                job.failures.extend(payload)
+            elif kind == "calls":
+                job.backend_calls += payload
+            elif kind == "done":
+                finished = True
+                break
+        
+        self.mark_changed(changed_ids)
+        job.panel.set_values({
+            "Documents": f"{job.total:,}",
+            "Closed": f"{job.closed:,}",
+            "Not open": f"{job.not_open:,}",
+            "Unsaved": f"{len(job.unsaved):,}",
+            "Failed": f"{len(job.failures):,}",
+        })
+        if not finished:
+            self.root.after(self.IMPORT_POLL_MS, self._poll_close_job, job)
+            return
+        job.finished_at = time.monotonic()
+        
+        if job.unsaved and not job.cancelled:
+            # The one prompt for the whole batch
+            answer = messagebox.askyesnocancel(
+                "Unsaved Changes",
+                f"{len(job.unsaved)} document(s) have unsaved changes. Save them before closing?\n\n"
+                "Yes saves them, No discards the changes, Cancel leaves them open.")
+            if answer is not None:
+                targets = {key: job.targets[key] for key in job.unsaved}
+                self._start_close_job(job.backend, targets, job.ids_by_key,
+                                      SAVE_CHANGES if answer else DISCARD_CHANGES, job.panel, previous=job)
+                return
+        
+        summary = "Cancelled. " if job.cancelled else ""
+        summary += f"Closed {job.closed} document(s) in {job.elapsed:.1f}s using {job.backend_calls} call(s)."
+        if job.not_open:
+            summary += f" {job.not_open} were no longer open."
+        if job.unsaved:
+            summary += f" {len(job.unsaved)} with unsaved changes left open."
+        if job.failures:
+            summary += f" {len(job.failures)} could not be closed."
+        self.status_var.set(summary)
+        job.panel.finish(summary)
+        if job.failures:
+            names = {key: self.docs[job.ids_by_key[key][0]].name for key, _ in job.failures
+                     if job.ids_by_key[key][0] in self.docs}
+            messagebox.showwarning("Warning", f"{len(job.failures)} document(s) could not be closed:\n\n"
+                                   + "\n".join(f"{names.get(key, key)}: {error}"
+                                                for key, error in job.failures[:15]))
+    
+    def refresh_workspaces_menu(self):
+        """Rebuild the Workspaces menu: one item per saved workspace, which restores it"""
+        menu = self.workspaces_menu
+        if menu is None:
+            return
+        menu.delete(0, tk.END)
+        menu.add_command(label="Save Open Documents as Workspace...", command=self.save_workspace)
+        delete_menu = tk.Menu(menu, tearoff=0)
+        for workspace in self.workspaces:
+            delete_menu.add_command(label=workspace.name,
+                                    command=lambda name=workspace.name: self.delete_workspace(name))
+        menu.add_cascade(label="Delete Workspace", menu=delete_menu,
+                         state=tk.NORMAL if self.workspaces else tk.DISABLED)
+        if self.workspaces:
+            menu.add_separator()
+        for workspace in self.workspaces:
+            menu.add_command(label=f"{workspace.name} ({len(workspace.doc_ids)})",
+                             command=lambda name=workspace.name: self.restore_workspace(name))
+    
+    def current_open_document_ids(self) -> List[str]:
+        """Ids of documents open in the editor, in its window order where it can tell"""
+        backend = self.get_backend()
+        keys = backend.open_in_window_order() if backend.can_list else None
+        if keys is None:
+            # Fall back to the Open flags, in the order the documents were opened
+            open_docs = sorted((doc for doc in self.docs.values() if doc.is_open),
+                               key=lambda doc: doc.last_opened_at or 0)
+            return [doc.id for doc in open_docs]
+        urls = {document_key(doc.url): doc.id for doc in self.docs.values()
+                if doc.source_type == "url" and doc.url}
+        return order_by_keys(keys, self.get_path_index().by_path, urls)
+    
+    @timed()
+    def save_workspace(self):
+        """Save the open documents, in window order, as a named workspace"""
+        doc_ids = self.current_open_document_ids()
+        if not doc_ids:
+            messagebox.showinfo("Info", "No library documents are open.")
+            return
+        name = simpledialog.askstring("Save Workspace",
+                                      f"Name for this set of {len(doc_ids)} open document(s):",
+                                      parent=self.root)
+        if not name or not name.strip():
+            return
+        name = name.strip()
+        if find_workspace(self.workspaces, name) and not messagebox.askyesno(
+                "Confirm", f"Replace the workspace '{name}'?"):
+            return
+        self.workspaces = replace_workspace(self.workspaces, Workspace.capture(name, doc_ids))
+        self.save_data()
+        self.refresh_workspaces_menu()
+        self.status_var.set(f"Saved workspace '{name}' with {len(doc_ids)} document(s)")
+    
+    @timed()
+    def restore_workspace(self, name: str):
+        """Open a workspace's documents in order, skipping those already open"""
+        workspace = find_workspace(self.workspaces, name)
+        if workspace is None:
+            return
+        docs = [self.docs[doc_id] for doc_id in workspace.doc_ids if doc_id in self.docs]
+        backend = self.get_backend()
+        open_keys = backend.list_open() if backend.can_list else None
+        if open_keys is None:
+            # The flags stick when the editor can't report its state, so only trust this session's opens
+            already_open = {doc.id for doc in docs
+                            if doc.is_open and (doc.last_opened_at or 0) >= self.session_started_at}
+        else:
+            already_open = {doc.id for doc in docs
+                            if document_key((doc.url if doc.source_type == "url" else doc.file_path) or "")
+                            in open_keys}
+        to_open = [doc for doc in docs if doc.id not in already_open]
+        removed = len(workspace.doc_ids) - len(docs)
+        if not to_open:
+            self.status_var.set(f"Workspace '{name}': all {len(docs)} document(s) already open")
+            return
+        job = self.open_documents_in_background(to_open, f"Restoring '{name}'", in_order=True,
+                                                skipped=len(already_open))
+        if removed:
+            job.panel.set_message(f"Opening {len(to_open)} document(s); "
+                                  f"{removed} no longer in the library")
+    
+    def delete_workspace(self, name: str):
+        if not messagebox.askyesno("Confirm", f"Delete the workspace '{name}'?"):
+            return
+        self.workspaces = remove_workspace(self.workspaces, name)
+        self.save_data()
+        self.refresh_workspaces_menu()
+    
+    def get_backend(self) -> DocumentBackend:
+        """The document backend, created on first use from the document_backend setting"""
+        if self.backend is None:
+            name = os.environ.get("DOCSMART_BACKEND") or self.settings.get('document_backend', AUTO)
+            word_com = load_word_com() if name in (AUTO, WORD) and platform.system() == "Windows" else None
+            self.backend = create_backend(name, word_com)
+        return self.backend
+    
+    def edit_import_settings(self):
+        """Edit which files Import Folder picks up"""
+        dialog = ImportSettingsDialog(self.root, self.settings)
+        if dialog.result:
+            self.settings.update(dialog.result)
+            self.save_data()
+            self.restart_live_watch()
+    
+    def show_diagnostics(self):
+        """Show handler timings and detected mainloop stalls"""
+        DiagnosticsDialog(self.root, self.watchdog, extra={
+            'documents': len(self.docs),
+            'teams': len(self.teams),
+            'document_backend': self.backend.name if self.backend else "(not started)",
+            'prewarm_editor': self.settings['prewarm_editor'],
+            **(self.backend.stats() if self.backend else {})
+        })
     
     def run(self):
         """Start the application"""
         self.root.mainloop()
 
 class DocumentDialog:
+    @timed("DocumentDialog")
     def __init__(self, parent, teams: Dict[str, Team], doc: DocEntry = None):
         self.result = None
         self.teams = teams
@@ -910,6 +2634,432 @@ class DocumentDialog:
         """Cancel dialog"""
         self.dialog.destroy()
 
+class WatchedFoldersDialog:
+    def __init__(self, parent, app: DocSmartApp):
+        self.app = app
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Watched Folders")
+        self.dialog.geometry("560x320")
+        self.dialog.transient(parent)
+        
+        self.setup_dialog()
+        self.refresh()
+    
+    def setup_dialog(self):
+        main_frame = ttk.Frame(self.dialog, padding=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(main_frame, text="New, moved and deleted Word files in these folders are "
+                  "picked up as they happen while Tools > Live Folder Watching is on, "
+                  "and by Tools > Sync Watched Folders.", wraplength=500).pack(anchor=tk.W, pady=(0, 10))
+        
+        self.folders_listbox = tk.Listbox(main_frame, height=8)
+        self.folders_listbox.pack(fill=tk.BOTH, expand=True)
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(button_frame, text="Add Folder...", command=self.add_folder).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Remove", command=self.remove_folder).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Sync Now", command=self.sync_now).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Close", command=self.dialog.destroy).pack(side=tk.RIGHT, padx=2)
+    
+    def refresh(self):
+        self.folders_listbox.delete(0, tk.END)
+        for folder in self.app.watched_folders:
+            self.folders_listbox.insert(tk.END, folder)
+    
+    def selected_folder(self) -> Optional[str]:
+        selection = self.folders_listbox.curselection()
+        return self.folders_listbox.get(selection[0]) if selection else None
+    
+    def add_folder(self):
+        folder = filedialog.askdirectory(parent=self.dialog, title="Select folder to watch")
+        if folder:
+            if not self.app.add_watched_folder(folder):
+                messagebox.showinfo("Info", "That folder is already watched.", parent=self.dialog)
+            self.refresh()
+    
+    def remove_folder(self):
+        folder = self.selected_folder()
+        if folder and messagebox.askyesno("Confirm", f"Stop watching '{folder}'?\n\n"
+                                          "Its documents stay in the library.", parent=self.dialog):
+            self.app.remove_watched_folder(folder)
+            self.refresh()
+    
+    def sync_now(self):
+        folder = self.selected_folder()
+        self.app.sync_watched_folders([folder] if folder else None)
+
+class RulesDialog:
+    KIND_LABELS = {FOLDER: "Folder name", NAME: "File name pattern"}
+    
+    def __init__(self, parent, app: DocSmartApp):
+        self.app = app
+        self.rules: List[Rule] = list(app.rules)
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Tag & Team Rules")
+        self.dialog.geometry("680x420")
+        self.dialog.transient(parent)
+        
+        self.kind_var = tk.StringVar(value=self.KIND_LABELS[FOLDER])
+        self.pattern_var = tk.StringVar()
+        self.tag_var = tk.StringVar()
+        self.team_var = tk.StringVar()
+        
+        self.setup_dialog()
+        self.refresh()
+    
+    def setup_dialog(self):
+        main_frame = ttk.Frame(self.dialog, padding=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(main_frame, text="Imported files get the tags and team of every rule they match. "
+                  "Folder rules match a folder anywhere in the path (e.g. Aff); file name rules "
+                  "use patterns (e.g. *_Harvard_*).", wraplength=620).pack(anchor=tk.W, pady=(0, 10))
+        
+        columns = ('Type', 'Pattern', 'Tag', 'Team')
+        self.rules_tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=8)
+        for col in columns:
+            self.rules_tree.heading(col, text=col)
+        self.rules_tree.pack(fill=tk.BOTH, expand=True)
+        
+        form = ttk.Frame(main_frame)
+        form.pack(fill=tk.X, pady=(10, 0))
+        ttk.Combobox(form, textvariable=self.kind_var, values=list(self.KIND_LABELS.values()),
+                     state="readonly", width=16).pack(side=tk.LEFT, padx=2)
+        for label, var, width in (("Pattern:", self.pattern_var, 18), ("Tag:", self.tag_var, 12),
+                                  ("Team:", self.team_var, 12)):
+            ttk.Label(form, text=label).pack(side=tk.LEFT, padx=(6, 2))
+            ttk.Entry(form, textvariable=var, width=width).pack(side=tk.LEFT)
+        ttk.Button(form, text="Add", command=self.add_rule).pack(side=tk.LEFT, padx=(6, 0))
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(button_frame, text="Remove", command=self.remove_rule).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Apply to Library",
+                   command=self.app.apply_rules_to_library).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Close", command=self.dialog.destroy).pack(side=tk.RIGHT, padx=2)
+    
+    def refresh(self):
+        self.rules_tree.delete(*self.rules_tree.get_children())
+        for index, rule in enumerate(self.rules):
+            self.rules_tree.insert('', tk.END, iid=str(index), values=(
+                self.KIND_LABELS[rule.kind], rule.pattern, rule.tag or "—", rule.team or "—"))
+    
+    def add_rule(self):
+        pattern = self.pattern_var.get().strip()
+        tag = self.tag_var.get().strip() or None
+        team = self.team_var.get().strip() or None
+        if not pattern or not (tag or team):
+            messagebox.showerror("Error", "A rule needs a pattern and a tag or team.", parent=self.dialog)
+            return
+        kind = next(k for k, label in self.KIND_LABELS.items() if label == self.kind_var.get())
+        self.rules.append(Rule(kind, pattern, tag, team))
+        self.app.set_rules(self.rules)
+        self.pattern_var.set("")
+        self.tag_var.set("")
+        self.team_var.set("")
+        self.refresh()
+    
+    def remove_rule(self):
+        selected = {int(iid) for iid in self.rules_tree.selection()}
+        if selected:
+            self.rules = [rule for index, rule in enumerate(self.rules) if index not in selected]
+            self.app.set_rules(self.rules)
+            self.refresh()
+
+class ImportSettingsDialog:
+    def __init__(self, parent, settings: Dict[str, Any]):
+        self.result = None
+        
+        # Create dialog window
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Import Settings")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        # Variables
+        self.include_var = tk.StringVar(value=", ".join(settings['import_include']))
+        self.exclude_var = tk.StringVar(value=", ".join(settings['import_exclude']))
+        self.content_hash_var = tk.BooleanVar(value=settings['import_content_hash'])
+        self.metadata_var = tk.BooleanVar(value=settings['import_metadata'])
+        
+        self.setup_dialog()
+        self.dialog.wait_window()
+    
+    def setup_dialog(self):
+        main_frame = ttk.Frame(self.dialog, padding=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(main_frame, text="Include files:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        ttk.Entry(main_frame, textvariable=self.include_var, width=50).grid(row=0, column=1, sticky=tk.EW, pady=5)
+        
+        ttk.Label(main_frame, text="Skip files/folders:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        ttk.Entry(main_frame, textvariable=self.exclude_var, width=50).grid(row=1, column=1, sticky=tk.EW, pady=5)
+        
+        ttk.Label(main_frame, text="(comma-separated patterns, e.g. *.docx, ~$*)",
+                  font=("Arial", 8)).grid(row=2, column=1, sticky=tk.W)
+        
+        ttk.Checkbutton(main_frame, text="Skip copies of library files saved under other names (slower)",
+                        variable=self.content_hash_var).grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=(10, 0))
+        ttk.Checkbutton(main_frame, text="Name .docx files by their document title and read their properties",
+                        variable=self.metadata_var).grid(row=4, column=0, columnspan=2, sticky=tk.W)
+        
+        # Buttons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=10, column=0, columnspan=2, pady=(20, 0))
+        
+        ttk.Button(button_frame, text="Save", command=self.save).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=self.dialog.destroy).pack(side=tk.LEFT, padx=5)
+        
+        main_frame.columnconfigure(1, weight=1)
+    
+    def save(self):
+        include = [p.strip() for p in self.include_var.get().split(",") if p.strip()]
+        if not include:
+            messagebox.showerror("Error", "At least one file pattern is required!", parent=self.dialog)
+            return
+        
+        self.result = {
+            'import_include': include,
+            'import_exclude': [p.strip() for p in self.exclude_var.get().split(",") if p.strip()],
+            'import_content_hash': self.content_hash_var.get(),
+            'import_metadata': self.metadata_var.get()
+        }
+        self.dialog.destroy()
+
+class CloseDocumentsDialog:
+    """Confirm closing documents and choose what happens to unsaved changes"""
+    
+    POLICIES = [
+        (SAVE_CHANGES, "Save changes in every document"),
+        (DISCARD_CHANGES, "Discard unsaved changes"),
+        (PROMPT_TO_SAVE, "Ask me once about documents with unsaved changes"),
+    ]
+    
+    def __init__(self, parent, count: int, editor: str, policy: str):
+        self.result = None
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Close Documents")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        self.policy_var = tk.StringVar(value=policy)
+        
+        main_frame = ttk.Frame(self.dialog, padding=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(main_frame, text=f"Close {count} document(s) in {editor}?").pack(anchor=tk.W, pady=(0, 10))
+        for value, label in self.POLICIES:
+            ttk.Radiobutton(main_frame, text=label, value=value, variable=self.policy_var).pack(anchor=tk.W)
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(pady=(20, 0))
+        ttk.Button(button_frame, text="Close Documents", command=self.confirm).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=self.dialog.destroy).pack(side=tk.LEFT, padx=5)
+        
+        self.dialog.wait_window()
+    
+    def confirm(self):
+        self.result = self.policy_var.get()
+        self.dialog.destroy()
+
+class ProgressDialog:
+    """Non-modal window showing live counters for a background job"""
+    
+    def __init__(self, parent, title: str, fields: List[str], on_cancel=None):
+        self.on_cancel = on_cancel
+        self.finished = False
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(title)
+        self.dialog.transient(parent)
+        self.dialog.resizable(False, False)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        main_frame = ttk.Frame(self.dialog, padding=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.message_var = tk.StringVar()
+        ttk.Label(main_frame, textvariable=self.message_var, wraplength=360).grid(
+            row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
+        
+        self.field_vars: Dict[str, tk.StringVar] = {}
+        for row, field in enumerate(fields, start=1):
+            ttk.Label(main_frame, text=f"{field}:").grid(row=row, column=0, sticky=tk.W, pady=2)
+            var = tk.StringVar(value="—")
+            ttk.Label(main_frame, textvariable=var).grid(row=row, column=1, sticky=tk.E, pady=2)
+            self.field_vars[field] = var
+        
+        self.progress = ttk.Progressbar(main_frame, mode='indeterminate', length=360)
+        self.progress.grid(row=len(fields) + 1, column=0, columnspan=2, pady=(10, 10))
+        self.progress.start(10)
+        
+        self.button = ttk.Button(main_frame, text="Cancel", command=self.cancel)
+        self.button.grid(row=len(fields) + 2, column=0, columnspan=2)
+        
+        main_frame.columnconfigure(1, weight=1)
+    
+    def set_message(self, message: str):
+        self.message_var.set(message)
+    
+    def set_values(self, values: Dict[str, Any]):
+        """Update the displayed counters"""
+        if not self.dialog.winfo_exists():
+            return
+        for field, value in values.items():
+            if field in self.field_vars:
+                self.field_vars[field].set(str(value))
+    
+    def finish(self, message: str):
+        """Show a final summary and turn Cancel into Close"""
+        self.finished = True
+        if not self.dialog.winfo_exists():
+            return
+        self.progress.stop()
+        self.progress.config(mode='determinate', value=100)
+        self.message_var.set(message)
+        self.button.config(text="Close", state=tk.NORMAL)
+    
+    def cancel(self):
+        """Request cancellation, or close the window once the job is over"""
+        if self.finished:
+            self.dialog.destroy()
+            return
+        self.set_message("Cancelling...")
+        self.button.config(state=tk.DISABLED)
+        if self.on_cancel:
+            self.on_cancel()
+
+class DiagnosticsDialog:
+    """Window listing handler wall times and captured mainloop stalls"""
+    
+    def __init__(self, parent, watchdog: StallWatchdog, extra: Optional[Dict[str, Any]] = None):
+        self.watchdog = watchdog
+        self.extra = extra or {}
+        self.stalls: List[Dict[str, Any]] = []
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Diagnostics")
+        self.dialog.geometry("900x600")
+        self.dialog.transient(parent)
+        
+        self.threshold_var = tk.IntVar(value=watchdog.threshold_ms)
+        
+        self.setup_dialog()
+        self.refresh()
+    
+    def setup_dialog(self):
+        main_frame = ttk.Frame(self.dialog, padding=10)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Handler timings
+        ttk.Label(main_frame, text="Handler timings", font=("Arial", 12, "bold")).pack(anchor=tk.W)
+        columns = ('Handler', 'Calls', 'Mean (ms)', 'p95 (ms)', 'Max (ms)', 'Total (ms)')
+        self.handlers_tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=10)
+        for col in columns:
+            self.handlers_tree.heading(col, text=col)
+            self.handlers_tree.column(col, width=220 if col == 'Handler' else 100,
+                                      anchor=tk.W if col == 'Handler' else tk.E)
+        self.handlers_tree.pack(fill=tk.BOTH, expand=True, pady=(5, 10))
+        
+        # Stalls
+        stall_header = ttk.Frame(main_frame)
+        stall_header.pack(fill=tk.X)
+        ttk.Label(stall_header, text="Mainloop stalls", font=("Arial", 12, "bold")).pack(side=tk.LEFT)
+        ttk.Label(stall_header, text="ms").pack(side=tk.RIGHT)
+        ttk.Spinbox(stall_header, from_=50, to=10000, increment=50, width=7,
+                    textvariable=self.threshold_var, command=self.apply_threshold).pack(side=tk.RIGHT)
+        ttk.Label(stall_header, text="Threshold:").pack(side=tk.RIGHT, padx=(0, 5))
+        
+        stall_frame = ttk.Frame(main_frame)
+        stall_frame.pack(fill=tk.BOTH, expand=True, pady=(5, 10))
+        self.stalls_listbox = tk.Listbox(stall_frame, width=45)
+        self.stalls_listbox.pack(side=tk.LEFT, fill=tk.Y)
+        self.stalls_listbox.bind('<<ListboxSelect>>', self.on_stall_select)
+        self.stack_text = tk.Text(stall_frame, wrap=tk.NONE, font=("Courier", 9))
+        self.stack_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(5, 0))
+        
+        # Buttons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+        ttk.Button(button_frame, text="Refresh", command=self.refresh).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Reset", command=self.reset).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Save Report...", command=self.save_report).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Close", command=self.dialog.destroy).pack(side=tk.RIGHT, padx=2)
+    
+    def refresh(self):
+        """Reload timings and stalls from the recorder"""
+        snapshot = recorder.snapshot()
+        
+        self.handlers_tree.delete(*self.handlers_tree.get_children())
+        for stats in snapshot['handlers']:
+            self.handlers_tree.insert('', tk.END, values=(
+                stats['name'], stats['count'], f"{stats['mean_ms']:.1f}", f"{stats['p95_ms']:.1f}",
+                f"{stats['max_ms']:.1f}", f"{stats['total_ms']:.0f}"))
+        
+        self.stalls = list(reversed(snapshot['stalls']))
+        self.stalls_listbox.delete(0, tk.END)
+        for stall in self.stalls:
+            handlers = " > ".join(stall['handlers']) or "idle"
+            self.stalls_listbox.insert(tk.END, f"{stall['started_at'][11:]}  {stall['duration_ms']:.0f} ms  {handlers}")
+        self.stack_text.delete('1.0', tk.END)
+    
+    def on_stall_select(self, event):
+        selection = self.stalls_listbox.curselection()
+        if not selection:
+            return
+        self.stack_text.delete('1.0', tk.END)
+        self.stack_text.insert('1.0', "".join(self.stalls[selection[0]]['stack']))
+    
+    def apply_threshold(self):
+        try:
+            self.watchdog.threshold_ms = self.threshold_var.get()
+        except tk.TclError:
+            self.threshold_var.set(self.watchdog.threshold_ms)
+    
+    def reset(self):
+        recorder.reset()
+        self.refresh()
+    
+    def save_report(self):
+        file_path = filedialog.asksaveasfilename(
+            parent=self.dialog,
+            title="Save Diagnostics Report",
+            defaultextension=".json",
+            initialfile=f"docsmart-diagnostics-{datetime.now():%Y%m%d-%H%M%S}.json",
+            filetypes=[("JSON files", "*.json")]
+        )
+        if not file_path:
+            return
+        try:
+            extra = dict(self.extra, stall_threshold_ms=self.watchdog.threshold_ms)
+            recorder.dump(file_path, extra=extra)
+            messagebox.showinfo("Success", "Diagnostics report saved!", parent=self.dialog)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save report: {e}", parent=self.dialog)
+
+def main():
+    import argparse
+    import multiprocessing
+    
+    # Import hashing uses a process pool, which frozen Windows builds must bootstrap
+    multiprocessing.freeze_support()
+    
+    parser = argparse.ArgumentParser(description="Doc-smart: Debate Document Manager")
+    parser.add_argument("--eager-start", action="store_true",
+                        help="load the library before showing the window")
+    parser.add_argument("--startup-benchmark", action="store_true",
+                        help="print startup timings as JSON and exit once interactive")
+    args = parser.parse_args()
+    
+    app = DocSmartApp(fast_start=not args.eager_start)
+    if args.startup_benchmark:
+        app.exit_after_startup()
+    app.run()
+
 if __name__ == "__main__":
-    app = DocSmartApp()
-    app.run()
\ No newline at end of file
+    main()
\ No newline at end of file
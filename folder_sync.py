@@ -0,0 +1,136 @@
+"""
+Doc-smart folder sync: incremental re-scan of watched folders against a saved manifest
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from crawler import DEFAULT_EXCLUDE, DEFAULT_INCLUDE, DirectoryCrawler, hold_unlisted
+from dedupe import normalize_path
+
+
+class ManifestEntry(NamedTuple):
+    size: int
+    mtime: float
+    inode: int  # 0 where the platform does not report one (Windows scandir)
+
+
+class SyncChanges(NamedTuple):
+    """Paths relative to the watched folder"""
+    added: List[str]
+    changed: List[str]
+    moved: List[Tuple[str, str]]  # (old path, new path)
+    deleted: List[str]
+
+    @property
+    def total(self) -> int:
+        return len(self.added) + len(self.changed) + len(self.moved) + len(self.deleted)
+
+
+class Manifest:
+    """Snapshot of (size, mtime, inode) for every matching file under a folder"""
+
+    def __init__(self, folder: str, entries: Optional[Dict[str, ManifestEntry]] = None):
+        self.folder = folder
+        self.entries: Dict[str, ManifestEntry] = entries or {}
+
+    @staticmethod
+    def path_for(folder: str, manifest_dir: Path) -> Path:
+        """Manifest file for a folder, named by a hash of its normalized path"""
+        key = hashlib.sha1(normalize_path(folder).encode('utf-8')).hexdigest()[:16]
+        return manifest_dir / f"{key}.json"
+
+    @classmethod
+    def load(cls, folder: str, manifest_dir: Path) -> 'Manifest':
+        """Saved manifest for a folder, or an empty one if none was saved"""
+        path = cls.path_for(folder, manifest_dir)
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(folder)
+        entries = {rel: ManifestEntry(size, mtime, inode)
+                   for rel, size, mtime, inode in data.get('entries', [])}
+        return cls(folder, entries)
+
+    def save(self, manifest_dir: Path):
+        manifest_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(self.folder, manifest_dir)
+        # Compact rows instead of objects; a 50k-file manifest stays a few MB
+        data = {
+            'folder': self.folder,
+            'entries': [[rel, *entry] for rel, entry in self.entries.items()]
+        }
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def scan(cls, folder: str, include: Iterable[str] = DEFAULT_INCLUDE,
+             exclude: Iterable[str] = DEFAULT_EXCLUDE) -> Tuple['Manifest', List[str]]:
+        """Build a manifest from the folder as it is now; also returns listing errors"""
+        crawler = DirectoryCrawler([folder], include=include, exclude=exclude,
+                                   with_stat=True, batch_size=4096)
+        entries = {}
+        for batch in crawler.crawl():
+            for found in batch:
+                rel = os.path.relpath(found.path, folder)
+                entries[rel] = ManifestEntry(found.size, found.mtime, found.inode or 0)
+        return cls(folder, entries), crawler.errors
+
+    def diff(self, current: 'Manifest') -> SyncChanges:
+        """What changed between this (older) manifest and a fresh scan"""
+        old, new = self.entries, current.entries
+        added = [rel for rel in new if rel not in old]
+        deleted = [rel for rel in old if rel not in new]
+        changed = [rel for rel, entry in new.items()
+                   if rel in old and (old[rel].size, old[rel].mtime) != (entry.size, entry.mtime)]
+
+        # A deleted and an added path with the same identity are one move
+        def identity(rel: str, entry: ManifestEntry) -> tuple:
+            if entry.inode:
+                return ('inode', entry.inode, entry.size)
+            return ('stat', os.path.basename(rel).lower(), entry.size, entry.mtime)
+
+        move_sources: Dict[tuple, List[str]] = {}
+        for rel in deleted:
+            move_sources.setdefault(identity(rel, old[rel]), []).append(rel)
+
+        moved = []
+        really_added = []
+        for rel in added:
+            sources = move_sources.get(identity(rel, new[rel]))
+            if sources:
+                moved.append((sources.pop(), rel))
+            else:
+                really_added.append(rel)
+
+        moved_from = {old_rel for old_rel, new_rel in moved}
+        really_deleted = [rel for rel in deleted if rel not in moved_from]
+        return SyncChanges(really_added, changed, moved, really_deleted)
+
+
+class FolderSyncResult(NamedTuple):
+    folder: str
+    changes: SyncChanges
+    manifest: Manifest
+    errors: List[str]
+
+
+def sync_folder(folder: str, manifest_dir: Path, include: Iterable[str] = DEFAULT_INCLUDE,
+                exclude: Iterable[str] = DEFAULT_EXCLUDE) -> FolderSyncResult:
+    """Scan a watched folder and diff it against its saved manifest; the new manifest is returned, not saved"""
+    if not os.path.isdir(folder):
+        raise FileNotFoundError(f"Watched folder is not available: {folder}")
+
+    previous = Manifest.load(folder, manifest_dir)
+    current, errors = Manifest.scan(folder, include, exclude)
+    changes = previous.diff(current)
+
+    changes = changes._replace(deleted=hold_unlisted(errors, previous.entries, current.entries, changes.deleted))
+
+    return FolderSyncResult(folder, changes, current, errors)
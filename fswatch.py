@@ -0,0 +1,390 @@
+"""
+Doc-smart live folder watching: inotify through ctypes on Linux, polling elsewhere
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from crawler import DEFAULT_EXCLUDE, DEFAULT_INCLUDE, DirectoryCrawler, compile_globs, hold_unlisted
+
+
+class ChangeBatch(NamedTuple):
+    """Net effect of a burst of filesystem events (absolute paths)"""
+    created: List[str]
+    deleted: List[str]
+    moved: List[Tuple[str, str]]  # (old path, new path)
+    rescan: List[str]  # watched roots whose directory structure changed
+
+    @property
+    def total(self) -> int:
+        return len(self.created) + len(self.deleted) + len(self.moved) + len(self.rescan)
+
+
+class ChangeCoalescer:
+    """Folds raw file events into one batch per burst of activity"""
+
+    def __init__(self, quiet: float = 0.5, max_delay: float = 3.0):
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._created: Set[str] = set()
+        self._deleted: Set[str] = set()
+        self._moves: Dict[str, str] = {}  # new path -> original path
+        self._rescan: Set[str] = set()
+        self._first_at: Optional[float] = None
+        self._last_at = 0.0
+
+    def _touch(self):
+        now = time.monotonic()
+        if self._first_at is None:
+            self._first_at = now
+        self._last_at = now
+
+    def created(self, path: str):
+        with self._lock:
+            self._touch()
+            if path in self._deleted:
+                # Replaced in place: the library entry stays valid
+                self._deleted.discard(path)
+            else:
+                self._created.add(path)
+
+    def deleted(self, path: str):
+        with self._lock:
+            self._touch()
+            if path in self._created:
+                self._created.discard(path)
+            elif path in self._moves:
+                self._deleted.add(self._moves.pop(path))
+            else:
+                self._deleted.add(path)
+
+    def moved(self, old_path: str, new_path: str):
+        with self._lock:
+            self._touch()
+            if old_path in self._created:
+                self._created.discard(old_path)
+                self._created.add(new_path)
+                return
+            original = self._moves.pop(old_path, old_path)
+            if original != new_path:
+                self._moves[new_path] = original
+
+    def rescan(self, root: str):
+        with self._lock:
+            self._touch()
+            self._rescan.add(root)
+
+    def take(self) -> Optional[ChangeBatch]:
+        """The pending batch if the burst is over (or has run too long), else None"""
+        with self._lock:
+            if self._first_at is None:
+                return None
+            now = time.monotonic()
+            if now - self._last_at < self.quiet and now - self._first_at < self.max_delay:
+                return None
+            batch = ChangeBatch(
+                created=sorted(self._created),
+                deleted=sorted(self._deleted),
+                moved=[(old, new) for new, old in self._moves.items()],
+                rescan=sorted(self._rescan)
+            )
+            self._reset()
+            return batch
+
+
+class _Watcher:
+    """Common setup for watchers that report into a ChangeCoalescer"""
+
+    def __init__(self, roots: Iterable[str], coalescer: ChangeCoalescer,
+                 include: Iterable[str] = DEFAULT_INCLUDE, exclude: Iterable[str] = DEFAULT_EXCLUDE):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.coalescer = coalescer
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.is_included = compile_globs(self.include)
+        self.is_excluded = compile_globs(self.exclude)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def wants(self, name: str) -> bool:
+        return self.is_included(name) and not self.is_excluded(name)
+
+    def root_of(self, path: str) -> str:
+        for root in self.roots:
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                return root
+        return self.roots[0]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"docsmart-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        raise NotImplementedError
+
+
+class PollingWatcher(_Watcher):
+    """Stdlib fallback: rescans the roots every `interval` seconds and diffs them"""
+
+    name = "polling"
+
+    def __init__(self, *args, interval: float = 5.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.interval = interval
+
+    def _snapshot(self, root: str) -> Tuple[Dict[str, tuple], List[str]]:
+        """The files under a root with their identity, and any listing errors"""
+        crawler = DirectoryCrawler([root], include=self.include, exclude=self.exclude,
+                                   with_stat=True, batch_size=4096, cancel_event=self._stop)
+        files = {found.path: (found.inode or None, found.size, found.mtime)
+                 for batch in crawler.crawl() for found in batch}
+        return files, crawler.errors
+
+    def _run(self):
+        previous = {root: self._snapshot(root)[0] for root in self.roots}
+        while not self._stop.wait(self.interval):
+            for root in self.roots:
+                if not os.path.isdir(root):
+                    continue
+                current, errors = self._snapshot(root)
+                if self._stop.is_set():
+                    return
+                self._report(previous[root], current, errors)
+                previous[root] = current
+
+    def _report(self, old: Dict[str, tuple], new: Dict[str, tuple], errors: List[str]):
+        """Report the differences between two snapshots; deletions are held back after listing errors"""
+        gone = {path: stat for path, stat in old.items() if path not in new}
+        # Pair disappearances with appearances of the same file as moves
+        by_identity = {}
+        for path, (inode, size, mtime) in gone.items():
+            key = (inode, size) if inode else (os.path.basename(path).lower(), size, mtime)
+            by_identity[key] = path
+        for path, (inode, size, mtime) in new.items():
+            if path in old:
+                continue
+            key = (inode, size) if inode else (os.path.basename(path).lower(), size, mtime)
+            old_path = by_identity.pop(key, None)
+            if old_path is not None:
+                gone.pop(old_path)
+                self.coalescer.moved(old_path, path)
+            else:
+                self.coalescer.created(path)
+        for path in hold_unlisted(errors, old, new, gone):
+            self.coalescer.deleted(path)
+
+
+# inotify constants from <sys/inotify.h>
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1  # noqa: B018 - probe for the symbol
+    except (OSError, AttributeError):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+class InotifyWatcher(_Watcher):
+    """Linux watcher using inotify via ctypes, one watch per directory"""
+
+    name = "inotify"
+    _libc = None
+
+    @classmethod
+    def available(cls) -> bool:
+        if cls._libc is None:
+            cls._libc = _load_libc() or False
+        return bool(cls._libc)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.available():
+            raise OSError("inotify is not available on this system")
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, str] = {}
+        # Renamed-away paths by cookie, until their IN_MOVED_TO arrives (possibly in a later read)
+        self._moved_from: Dict[int, Tuple[str, bool, float]] = {}
+        self._wake_r, self._wake_w = os.pipe()
+
+    def stop(self):
+        super().stop()
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+
+    def _add_watch(self, path: str) -> bool:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            return False
+        self.watches[wd] = path
+        return True
+
+    def _watch_tree(self, top: str, report: bool):
+        """Watch a directory and everything below it; optionally report its files as created"""
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            if not self._add_watch(directory):
+                # Out of watches (fs.inotify.max_user_watches) or gone; let a rescan catch up
+                self.coalescer.rescan(self.root_of(directory))
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.is_excluded(entry.name):
+                                stack.append(entry.path)
+                        elif report and self.wants(entry.name):
+                            self.coalescer.created(entry.path)
+            except OSError:
+                continue
+
+    def _rewatch(self, root: str):
+        """Drop and re-add the watches under a root after its structure changed"""
+        prefix = root.rstrip(os.sep) + os.sep
+        for wd, path in list(self.watches.items()):
+            if path == root or path.startswith(prefix):
+                self._libc.inotify_rm_watch(self.fd, wd)
+                self.watches.pop(wd, None)
+        if os.path.isdir(root):
+            self._watch_tree(root, report=False)
+        self.coalescer.rescan(root)
+
+    def _run(self):
+        # Adding watches walks the whole tree, so it happens here, off the UI thread
+        for root in self.roots:
+            if os.path.isdir(root):
+                self._watch_tree(root, report=False)
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([self.fd, self._wake_r], [], [], self.coalescer.quiet)
+                data = b""
+                if self.fd in ready:
+                    try:
+                        data = os.read(self.fd, 256 * 1024)
+                    except BlockingIOError:
+                        pass
+                # Also runs with no data, to expire renames whose other half never came
+                self._handle(data)
+        finally:
+            os.close(self.fd)
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+
+    def _handle(self, data: bytes):
+        moved_from = self._moved_from
+        now = time.monotonic()
+        rewatch: Set[str] = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length]
+            offset += _EVENT_HEADER.size + length
+            name = os.fsdecode(raw_name.rstrip(b"\0"))
+
+            if mask & IN_Q_OVERFLOW:
+                rewatch.update(self.roots)
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                if directory in self.roots:
+                    rewatch.add(directory)
+                continue
+
+            path = os.path.join(directory, name)
+            is_dir = bool(mask & IN_ISDIR)
+            if is_dir and self.is_excluded(name):
+                continue
+            if not is_dir and not self.wants(name):
+                if mask & IN_MOVED_FROM:
+                    moved_from[cookie] = (path, False, now)
+                elif mask & IN_MOVED_TO and cookie in moved_from:
+                    # Renamed to something we don't track, e.g. report.docx -> report.bak
+                    old_path, _, _ = moved_from.pop(cookie)
+                    self.coalescer.deleted(old_path)
+                continue
+
+            if mask & IN_CREATE:
+                if is_dir:
+                    self._watch_tree(path, report=True)
+                else:
+                    self.coalescer.created(path)
+            elif mask & IN_DELETE:
+                if not is_dir:
+                    self.coalescer.deleted(path)
+            elif mask & IN_MOVED_FROM:
+                moved_from[cookie] = (path, is_dir, now)
+            elif mask & IN_MOVED_TO:
+                source = moved_from.pop(cookie, None)
+                if is_dir:
+                    rewatch.add(self.root_of(path))
+                elif source is not None and self.wants(os.path.basename(source[0])):
+                    self.coalescer.moved(source[0], path)
+                else:
+                    self.coalescer.created(path)
+
+        # No IN_MOVED_TO within the coalescing window: moved out of the watched trees
+        for cookie, (path, is_dir, moved_at) in list(moved_from.items()):
+            if now - moved_at < self.coalescer.quiet:
+                continue
+            del moved_from[cookie]
+            if is_dir:
+                rewatch.add(self.root_of(path))
+            elif self.wants(os.path.basename(path)):
+                self.coalescer.deleted(path)
+
+        for root in rewatch:
+            self._rewatch(root)
+
+
+def create_watcher(roots: Iterable[str], coalescer: ChangeCoalescer,
+                   include: Iterable[str] = DEFAULT_INCLUDE, exclude: Iterable[str] = DEFAULT_EXCLUDE,
+                   poll_interval: float = 5.0) -> _Watcher:
+    """inotify watcher where available, otherwise a polling watcher"""
+    roots = list(roots)
+    if InotifyWatcher.available():
+        try:
+            return InotifyWatcher(roots, coalescer, include, exclude)
+        except OSError:
+            pass
+    return PollingWatcher(roots, coalescer, include, exclude, interval=poll_interval)
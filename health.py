@@ -0,0 +1,124 @@
+"""
+Doc-smart file health: parallel existence checks for file-backed documents
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from dedupe import fingerprint_file, normalize_path
+
+DEFAULT_TTL = 300.0
+
+
+class FileProbe(NamedTuple):
+    path: str
+    exists: bool
+    size: Optional[int] = None
+    # Only computed when asked for; see dedupe.fingerprint_file
+    fingerprint: Optional[str] = None
+
+
+class FileHealthCache:
+    """Recent probe results by normalized path, trusted for `ttl` seconds"""
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self._results: Dict[str, Tuple[FileProbe, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[FileProbe]:
+        """Cached probe if still fresh, else None"""
+        with self._lock:
+            result = self._results.get(normalize_path(path))
+        if result is None or time.monotonic() - result[1] > self.ttl:
+            return None
+        return result[0]
+
+    def put(self, path: str, exists: bool, size: Optional[int] = None, fingerprint: Optional[str] = None):
+        with self._lock:
+            self._results[normalize_path(path)] = (FileProbe(path, exists, size, fingerprint), time.monotonic())
+
+    def invalidate(self, paths: Optional[Iterable[str]] = None):
+        """Forget some paths, or everything"""
+        with self._lock:
+            if paths is None:
+                self._results.clear()
+                return
+            for path in paths:
+                self._results.pop(normalize_path(path), None)
+
+    def exists(self, path: str) -> bool:
+        """Cached result, or a fresh stat that is then cached"""
+        probe = self.get(path)
+        if probe is None:
+            probe = probe_file(path)
+            self.put(*probe)
+        return probe.exists
+
+
+def probe_file(path: str, with_fingerprint: bool = False) -> FileProbe:
+    try:
+        size = os.stat(path).st_size
+    except OSError:
+        return FileProbe(path, False)
+    return FileProbe(path, True, size, fingerprint_file(path, size) if with_fingerprint else None)
+
+
+def _probe_chunk(paths: List[str], fingerprint_paths) -> List[FileProbe]:
+    return [probe_file(path, path in fingerprint_paths) for path in paths]
+
+
+def check_paths(paths: Iterable[str], cache: FileHealthCache, fingerprint_paths: Iterable[str] = (),
+                max_workers: int = 16, chunk_size: int = 32, batch_size: int = 500,
+                flush_interval: float = 0.5,
+                cancel_event: Optional[threading.Event] = None) -> Iterator[List[FileProbe]]:
+    """Yield probes in batches, stat'ing only paths not fresh in the cache"""
+    cancel_event = cancel_event or threading.Event()
+    fingerprint_paths = frozenset(fingerprint_paths)
+    cached: List[FileProbe] = []
+    to_check: List[str] = []
+    for path in dict.fromkeys(paths):
+        probe = cache.get(path)
+        if probe is None or (probe.exists and probe.fingerprint is None and path in fingerprint_paths):
+            to_check.append(path)
+        else:
+            cached.append(probe._replace(path=path))
+    if cached:
+        yield cached
+
+    chunks = [to_check[i:i + chunk_size] for i in range(0, len(to_check), chunk_size)]
+    batch: List[FileProbe] = []
+    last_yield = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="docsmart-health") as pool:
+        # Bounded window, like the crawler: enough in flight to hide latency
+        pending = iter(chunks)
+        in_flight = set()
+        try:
+            while True:
+                if cancel_event.is_set():
+                    break
+                while len(in_flight) < max_workers * 2:
+                    chunk = next(pending, None)
+                    if chunk is None:
+                        break
+                    in_flight.add(pool.submit(_probe_chunk, chunk, fingerprint_paths))
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for probe in future.result():
+                        cache.put(*probe)
+                        batch.append(probe)
+                if batch and (len(batch) >= batch_size
+                              or time.monotonic() - last_yield >= flush_interval):
+                    yield batch
+                    batch = []
+                    last_yield = time.monotonic()
+        finally:
+            for future in in_flight:
+                future.cancel()
+    if batch:
+        yield batch
@@ -8,9 +8,9 @@ REM Build executable using spec file
 pyinstaller docsmart.spec
 
 REM Check if build was successful
-if exist "dist\Doc-smart.exe" (
+if exist "dist\Doc-smart\Doc-smart.exe" (
     echo.
-    echo Build successful! Executable created at: dist\Doc-smart.exe
+    echo Build successful! Executable created at: dist\Doc-smart\Doc-smart.exe
     echo.
     echo To create installer, run: iscc installer.iss
     echo (Requires Inno Setup to be installed)
@@ -2,16 +2,18 @@
 
 block_cipher = None
 
+# Build the application in the repository root, not a copy, so its sibling
+# modules (backends, word_session, ...) are bundled with it.
 a = Analysis(
-    ['docsmart.py'],
-    pathex=[],
+    ['../docsmart.py'],
+    pathex=['..'],
     binaries=[],
     datas=[],
     hiddenimports=['win32com.client'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['test', 'unittest', 'pydoc_data'],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -20,20 +22,19 @@ a = Analysis(
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
+# One-folder build: a one-file exe unpacks itself to a temp directory on every
+# launch, which dominates cold start. UPX is off because decompressing the
+# binaries at load time costs more than it saves on disk.
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='Doc-smart',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -41,4 +42,15 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
     icon='icon.ico'
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='Doc-smart'
 )
\ No newline at end of file
@@ -11,7 +11,7 @@ build_options = {
 base = 'Win32GUI' if sys.platform == 'win32' else None
 
 executables = [
-    Executable('docsmart.py', 
+    Executable('../docsmart.py', 
               base=base, 
               target_name='Doc-smart.exe',
               icon='icon.ico')
@@ -0,0 +1,84 @@
+"""
+Doc-smart launcher service: run desktop launchers (open, xdg-open) on an asyncio loop off the UI thread
+"""
+
+import asyncio
+import subprocess
+import threading
+from concurrent.futures import Future
+from typing import List, Optional, Sequence, Set
+
+
+class LaunchError(Exception):
+    """A launcher command could not be started or exited with an error"""
+
+
+class LauncherService:
+    """An asyncio event loop on a helper thread that spawns launcher processes"""
+
+    def __init__(self, max_concurrent: int = 8, settle: float = 10.0):
+        self.max_concurrent = max_concurrent
+        self.settle = settle
+        self.launches = 0
+        self.failures = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # asyncio keeps only weak references to tasks; this holds the reapers until they finish
+        self._reapers: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(ready,), name="docsmart-launcher", daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def _run(self, ready: threading.Event):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    def stop(self):
+        if self.running:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    def launch(self, argv: Sequence[str]) -> Future:
+        """Run a launcher command without waiting for it; starts the loop on first use"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._launch(list(argv)), self._loop)
+
+    async def _launch(self, argv: List[str]):
+        async with self._semaphore:
+            self.launches += 1
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *argv, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            except OSError as e:
+                self.failures += 1
+                raise LaunchError(f"Could not run {argv[0]}: {e}") from e
+            try:
+                _, stderr = await asyncio.wait_for(process.communicate(), self.settle)
+            except asyncio.TimeoutError:
+                reaper = asyncio.ensure_future(process.communicate())
+                self._reapers.add(reaper)
+                reaper.add_done_callback(self._reapers.discard)
+                return
+        if process.returncode != 0:
+            self.failures += 1
+            message = stderr.decode(errors="replace").strip() if stderr else ""
+            raise LaunchError(f"{argv[0]} exited with status {process.returncode}"
+                              + (f": {message}" if message else ""))
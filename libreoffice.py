@@ -0,0 +1,351 @@
+"""
+Doc-smart LibreOffice backend: open, close and list documents in soffice over one reused UNO connection
+"""
+
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from backends import PROMPT_TO_SAVE, SAVE_CHANGES, DocumentBackend, is_url
+from word_session import UNSAVED_CHANGES, CloseResult, document_key
+
+DEFAULT_PORT = 2002
+
+
+def to_office_url(target: str) -> str:
+    return target if is_url(target) else Path(os.path.abspath(target)).as_uri()
+
+
+def office_url_key(url: str) -> str:
+    """document_key() for a URL reported by LibreOffice"""
+    parsed = urlparse(url)
+    if parsed.scheme == "file":
+        return document_key(url2pathname(parsed.path))
+    return document_key(url)
+
+
+def uno_disconnect_errors() -> Tuple[Type[Exception], ...]:
+    """pyuno's exceptions for a bridge that has gone away and for nothing listening on the port"""
+    import uno  # noqa: F401 - installs the import hook for the com.sun.star modules
+    from com.sun.star.connection import NoConnectException
+    from com.sun.star.lang import DisposedException
+    return (DisposedException, NoConnectException)
+
+
+class UnoConnection:
+    """One UNO bridge to a long-running soffice, started on first use and restarted after it exits"""
+
+    _disconnect_errors: Optional[Tuple[Type[Exception], ...]] = None
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, soffice: str = "soffice",
+                 headless: bool = False, start_timeout: float = 30.0):
+        self.accept = f"socket,host={host},port={port};urp;"
+        self.soffice = soffice
+        self.headless = headless
+        self.start_timeout = start_timeout
+        self.connects = 0
+        self.process: Optional[subprocess.Popen] = None
+        self._desktop = None
+        self._lock = threading.Lock()  # held only for quick connects, never while soffice starts
+        self._start_lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._desktop is not None
+
+    def is_disposed(self, error: Exception) -> bool:
+        """True if an error says the office process or its bridge has gone away"""
+        if self._disconnect_errors is None:
+            try:
+                self._disconnect_errors = uno_disconnect_errors()
+            except ImportError:
+                self._disconnect_errors = ()
+        return isinstance(error, self._disconnect_errors)
+
+    def _resolve(self):
+        import uno
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+        context = resolver.resolve(f"uno:{self.accept}StarOffice.ComponentContext")
+        return context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+
+    def _start_office(self):
+        args = [self.soffice, f"--accept={self.accept}", "--norestore", "--nologo", "--nodefault"]
+        if self.headless:
+            args.append("--headless")
+        self.process = subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL)
+
+    def desktop(self, start: bool = True):
+        """The office Desktop, connecting (and starting soffice if `start`) when needed; None if not running"""
+        with self._lock:
+            if self._desktop is not None:
+                return self._desktop
+            try:
+                return self._connected(self._resolve())
+            except Exception as e:
+                if not self.is_disposed(e):
+                    raise
+                # Nothing listening on the port
+                if not start:
+                    return None
+        # Starting takes seconds; other callers (listing from the UI) must not wait on it
+        with self._start_lock:
+            if self._desktop is not None:
+                return self._desktop
+            desktop = self._start_and_resolve()
+            with self._lock:
+                return self._desktop if self._desktop is not None else self._connected(desktop)
+
+    def _connected(self, desktop):
+        """Record a new connection; call with _lock held"""
+        self._desktop = desktop
+        self.connects += 1
+        return desktop
+
+    def _start_and_resolve(self):
+        self._start_office()
+        deadline = time.monotonic() + self.start_timeout
+        while True:
+            time.sleep(0.25)
+            try:
+                return self._resolve()
+            except Exception as e:
+                if not self.is_disposed(e) or time.monotonic() > deadline:
+                    raise
+
+    def disconnect(self):
+        with self._lock:
+            self._desktop = None
+
+
+def iter_components(desktop) -> Iterator[Tuple[str, Any]]:
+    """(key, document) for every document with a location open in the office"""
+    enumeration = desktop.getComponents().createEnumeration()
+    while enumeration.hasMoreElements():
+        component = enumeration.nextElement()
+        try:
+            url = component.getURL()
+        except AttributeError:  # not a document model (e.g. the Start Center)
+            continue
+        if url:
+            yield office_url_key(url), component
+
+
+class LibreOfficeBackend(DocumentBackend):
+    """Drives LibreOffice through a UnoConnection (or a StubOffice connection)"""
+
+    name = "LibreOffice"
+    can_close = True
+    can_list = True
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.calls = 0
+        self._opener: Optional[ThreadPoolExecutor] = None
+
+    def _run(self, action: Callable[[Any], Any], start: bool = True, default: Any = None) -> Any:
+        """Call action(desktop), reconnecting and retrying once if the office has gone away"""
+        for attempt in range(2):
+            desktop = self.connection.desktop(start)
+            if desktop is None:
+                return default
+            try:
+                self.calls += 1
+                return action(desktop)
+            except Exception as e:
+                if attempt or not self.connection.is_disposed(e):
+                    raise
+                self.connection.disconnect()
+        return default
+
+    def open(self, target: str) -> Future:
+        if self._opener is None:
+            self._opener = ThreadPoolExecutor(max_workers=1, thread_name_prefix="docsmart-office")
+        url = to_office_url(target)
+        return self._opener.submit(self._run, lambda desktop: desktop.loadComponentFromURL(url, "_blank", 0, ()))
+
+    def prewarm(self) -> bool:
+        """Start soffice if needed and open the shared connection"""
+        self.connection.desktop(start=True)
+        return True
+
+    def close(self, targets: Iterable[str], save_policy: str = SAVE_CHANGES) -> CloseResult:
+        wanted = list(dict.fromkeys(document_key(target) for target in targets))
+        closed: List[str] = []
+        failed: List[Tuple[str, str]] = []
+        calls = 0
+
+        def close_matching(desktop) -> Set[str]:
+            nonlocal calls
+            documents: Dict[str, Any] = dict(iter_components(desktop))
+            calls += 1 + 2 * len(documents)
+            for key in wanted:
+                component = documents.get(key)
+                if component is None:
+                    continue
+                try:
+                    calls += 2
+                    if component.isModified():
+                        if save_policy == PROMPT_TO_SAVE:
+                            failed.append((key, UNSAVED_CHANGES))
+                            continue
+                        if save_policy == SAVE_CHANGES:
+                            calls += 1
+                            component.store()
+                    component.close(True)
+                    closed.append(key)
+                except Exception as e:
+                    if self.connection.is_disposed(e):
+                        raise
+                    failed.append((key, str(e)))
+            return set(documents)
+
+        open_keys = self._run(close_matching, start=False, default=set())
+        not_open = [key for key in wanted if key not in open_keys]
+        return CloseResult(closed, not_open, failed, calls)
+
+    def list_open(self) -> Optional[Set[str]]:
+        try:
+            return self._run(lambda desktop: {key for key, _ in iter_components(desktop)}, start=False, default=set())
+        except Exception:
+            return None
+
+    def open_in_window_order(self) -> Optional[List[str]]:
+        try:
+            return self._run(lambda desktop: [key for key, _ in iter_components(desktop)], start=False, default=[])
+        except Exception:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {'office_connections': self.connection.connects, 'office_calls': self.calls}
+
+
+class DisposedException(Exception):
+    """Stands in for com.sun.star.lang.DisposedException in StubOffice"""
+
+
+class NoConnectException(Exception):
+    """Stands in for com.sun.star.connection.NoConnectException in StubOffice"""
+
+
+class StubOffice:
+    """In-process stand-in for a soffice instance, for tests and benchmarks without LibreOffice"""
+
+    def __init__(self, start_latency: float = 0.0, call_latency: float = 0.0):
+        self.start_latency = start_latency
+        self.call_latency = call_latency
+        self.running = False
+        self.generation = 0
+        self.documents: List['StubDocument'] = []
+        self.connects = 0
+        self._lock = threading.Lock()
+
+    def connection(self) -> 'StubConnection':
+        return StubConnection(self)
+
+    def quit(self):
+        with self._lock:
+            self.running = False
+            self.documents.clear()
+
+    def open_urls(self) -> List[str]:
+        with self._lock:
+            return [document.url for document in self.documents]
+
+
+class StubDocument:
+    def __init__(self, office: StubOffice, url: str):
+        self.office = office
+        self.url = url
+        self.modified = False
+        self.saves = 0
+
+    def getURL(self) -> str:
+        return self.url
+
+    def isModified(self) -> bool:
+        return self.modified
+
+    def store(self):
+        self.saves += 1
+        self.modified = False
+
+    def close(self, deliver_ownership: bool):
+        with self.office._lock:
+            self.office.documents.remove(self)
+
+
+class _StubEnumeration:
+    def __init__(self, items: List[Any]):
+        self.items = items
+
+    def hasMoreElements(self) -> bool:
+        return bool(self.items)
+
+    def nextElement(self):
+        return self.items.pop(0)
+
+
+class _StubDesktop:
+    def __init__(self, office: StubOffice):
+        self.office = office
+        self.generation = office.generation
+
+    def _check(self):
+        if not self.office.running or self.office.generation != self.generation:
+            raise DisposedException("Binary URP bridge disposed during call")
+
+    def loadComponentFromURL(self, url: str, frame: str, flags: int, properties):
+        self._check()
+        if self.office.call_latency:
+            time.sleep(self.office.call_latency)
+        if urlparse(url).scheme == "file" and not os.path.exists(url2pathname(urlparse(url).path)):
+            raise OSError(f"URL seems to be an unsupported one: {url}")
+        with self.office._lock:
+            for document in self.office.documents:
+                if document.url == url:
+                    return document
+            document = StubDocument(self.office, url)
+            self.office.documents.append(document)
+            return document
+
+    def getComponents(self):
+        self._check()
+        office = self.office
+
+        class Components:
+            def createEnumeration(self):
+                with office._lock:
+                    return _StubEnumeration(list(office.documents))
+        return Components()
+
+
+class StubConnection(UnoConnection):
+    """UnoConnection to a StubOffice instead of a real soffice"""
+
+    _disconnect_errors = (DisposedException, NoConnectException)
+
+    def __init__(self, office: StubOffice):
+        super().__init__()
+        self.office = office
+
+    def _resolve(self):
+        if not self.office.running:
+            raise NoConnectException(f"Connector : couldn't connect to socket ({self.accept})")
+        self.office.connects += 1
+        return _StubDesktop(self.office)
+
+    def _start_office(self):
+        def start():
+            time.sleep(self.office.start_latency)
+            with self.office._lock:
+                self.office.running = True
+                self.office.generation += 1
+        threading.Thread(target=start, name="docsmart-stub-office", daemon=True).start()
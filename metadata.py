@@ -0,0 +1,184 @@
+"""
+Doc-smart metadata: document properties read straight from .docx packages
+"""
+
+import json
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from xml.etree import ElementTree
+
+from crawler import FoundFile
+from dedupe import normalize_path
+
+CORE_NS = {
+    'dc': "http://purl.org/dc/elements/1.1/",
+    'dcterms': "http://purl.org/dc/terms/",
+}
+APP_NS = {'ep': "http://schemas.openxmlformats.org/officeDocument/2006/extended-properties"}
+
+
+class DocMetadata(NamedTuple):
+    title: Optional[str] = None
+    author: Optional[str] = None
+    modified: Optional[str] = None  # ISO 8601, as stored in core.xml
+    words: Optional[int] = None
+    pages: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {key: value for key, value in self._asdict().items() if value is not None}
+
+
+def _text(root: ElementTree.Element, tag: str, ns: Dict[str, str]) -> Optional[str]:
+    element = root.find(tag, ns)
+    if element is None or element.text is None:
+        return None
+    return element.text.strip() or None
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def extract_metadata(path: str) -> Optional[DocMetadata]:
+    """Read title, author, modified date and counts from a .docx; None if unreadable"""
+    try:
+        with zipfile.ZipFile(path) as package:
+            names = set(package.namelist())
+            core = package.read('docProps/core.xml') if 'docProps/core.xml' in names else None
+            app = package.read('docProps/app.xml') if 'docProps/app.xml' in names else None
+    except (OSError, zipfile.BadZipFile):
+        return None
+
+    fields = {}
+    try:
+        if core:
+            root = ElementTree.fromstring(core)
+            fields['title'] = _text(root, 'dc:title', CORE_NS)
+            fields['author'] = _text(root, 'dc:creator', CORE_NS)
+            fields['modified'] = _text(root, 'dcterms:modified', CORE_NS)
+        if app:
+            root = ElementTree.fromstring(app)
+            fields['words'] = _int(_text(root, 'ep:Words', APP_NS))
+            fields['pages'] = _int(_text(root, 'ep:Pages', APP_NS))
+    except ElementTree.ParseError:
+        pass
+    return DocMetadata(**fields)
+
+
+def extract_many(paths: List[str]) -> List[Tuple[str, Optional[DocMetadata]]]:
+    """One pool task: several files, to keep inter-process overhead down"""
+    return [(path, extract_metadata(path)) for path in paths]
+
+
+class MetadataCache:
+    """Extracted metadata keyed by (normalized path, size, mtime), kept on disk"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Tuple[int, float, DocMetadata]] = {}
+        self.dirty = False
+
+    def load(self) -> 'MetadataCache':
+        try:
+            with open(self.path, 'r') as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return self
+        for key, size, mtime, *fields in rows:
+            self.entries[key] = (size, mtime, DocMetadata(*fields))
+        return self
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        rows = [[key, size, mtime, *meta] for key, (size, mtime, meta) in self.entries.items()]
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(rows, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def get(self, found: FoundFile) -> Optional[DocMetadata]:
+        entry = self.entries.get(normalize_path(found.path))
+        if entry is None or (entry[0], entry[1]) != (found.size, found.mtime):
+            return None
+        return entry[2]
+
+    def put(self, found: FoundFile, meta: DocMetadata):
+        self.entries[normalize_path(found.path)] = (found.size, found.mtime, meta)
+        self.dirty = True
+
+
+class MetadataExtractor:
+    """Extracts .docx metadata across a process pool while an import crawls"""
+
+    CHUNK_SIZE = 64
+
+    def __init__(self, cache: Optional[MetadataCache] = None, max_workers: Optional[int] = None):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.in_flight: Set[Future] = set()
+        self.files: Dict[str, FoundFile] = {}
+        self.cached: List[Tuple[str, DocMetadata]] = []
+        self.extracted = 0
+
+    def __enter__(self) -> 'MetadataExtractor':
+        self.pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.pool.shutdown(cancel_futures=True)
+        if self.cache is not None:
+            self.cache.save()
+
+    def submit(self, files: Iterable[FoundFile]):
+        to_extract = []
+        for found in files:
+            if not found.name.lower().endswith('.docx'):
+                continue
+            meta = self.cache.get(found) if self.cache is not None else None
+            if meta is not None:
+                self.cached.append((found.path, meta))
+            else:
+                self.files[found.path] = found
+                to_extract.append(found.path)
+        for i in range(0, len(to_extract), self.CHUNK_SIZE):
+            self.in_flight.add(self.pool.submit(extract_many, to_extract[i:i + self.CHUNK_SIZE]))
+
+    def _collect(self, futures: Iterable[Future]) -> List[Tuple[str, DocMetadata]]:
+        results, self.cached = self.cached, []
+        for future in futures:
+            for path, meta in future.result():
+                found = self.files.pop(path)
+                self.extracted += 1
+                if meta is None:
+                    continue
+                if self.cache is not None:
+                    self.cache.put(found, meta)
+                results.append((path, meta))
+        return results
+
+    def ready(self) -> List[Tuple[str, DocMetadata]]:
+        """Results finished so far, without waiting"""
+        done = {future for future in self.in_flight if future.done()}
+        self.in_flight -= done
+        return self._collect(done)
+
+    def drain(self) -> Iterator[List[Tuple[str, DocMetadata]]]:
+        """Wait for the remaining work, yielding results as they finish"""
+        results = self._collect(())
+        if results:
+            yield results
+        while self.in_flight:
+            done, self.in_flight = wait(self.in_flight, return_when=FIRST_COMPLETED)
+            results = self._collect(done)
+            if results:
+                yield results
@@ -0,0 +1,61 @@
+"""
+Doc-smart open-state reconciliation: keep each document's Open status in step with the editor
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from backends import DocumentBackend
+from word_session import document_key
+
+
+class OpenStateDiff(NamedTuple):
+    opened: List[str]  # ids the editor has open that weren't marked open
+    closed: List[str]  # ids marked open that the editor no longer has
+
+    def __bool__(self) -> bool:
+        return bool(self.opened or self.closed)
+
+    @property
+    def changed(self) -> List[str]:
+        return self.opened + self.closed
+
+
+def diff_open_state(open_keys: Set[str], ids_by_path: Dict[str, Set[str]], urls: Iterable[Tuple[str, str]],
+                    marked_open: Iterable[str], recently_opened: Set[str] = frozenset()) -> OpenStateDiff:
+    """Compare what the editor has open with the documents marked open"""
+    now_open: Set[str] = set()
+    for key in open_keys:
+        now_open.update(ids_by_path.get(key, ()))
+    now_open.update(doc_id for doc_id, url in urls if document_key(url) in open_keys)
+
+    marked = set(marked_open)
+    opened = sorted(now_open - marked)
+    closed = sorted(marked - now_open - recently_opened)
+    return OpenStateDiff(opened, closed)
+
+
+class OpenStateReconciler:
+    """Decides when to ask a backend what it has open"""
+
+    def __init__(self, backend: DocumentBackend, interval: float = 10.0):
+        self.backend = backend
+        self.interval = interval
+        self._changed = threading.Event()
+        self._next_poll = 0.0
+        self.polls = 0
+        self.events = backend.subscribe(self.notify) if backend.can_list else False
+
+    def notify(self):
+        self._changed.set()
+
+    def due(self) -> bool:
+        return self.backend.can_list and (self._changed.is_set() or time.monotonic() >= self._next_poll)
+
+    def poll(self) -> Optional[Set[str]]:
+        """Keys the editor has open now, or None if it can't tell"""
+        self._changed.clear()
+        self._next_poll = time.monotonic() + self.interval
+        self.polls += 1
+        return self.backend.list_open()
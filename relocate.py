@@ -0,0 +1,142 @@
+"""
+Doc-smart relocation: find moved or renamed files for broken library entries
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from crawler import DEFAULT_EXCLUDE, DEFAULT_INCLUDE, DirectoryCrawler, FoundFile
+from dedupe import fingerprint_file, normalize_path
+
+
+class BrokenFile(NamedTuple):
+    """A document whose file is missing, with what was last known about the file"""
+    doc_id: str
+    path: str
+    size: Optional[int] = None
+    fingerprint: Optional[str] = None
+
+
+class Relocation(NamedTuple):
+    doc_id: str
+    old_path: str
+    new_path: str
+    match: str  # "content", "name+size" or "name"
+
+
+class RelocationResult(NamedTuple):
+    relocations: List[Relocation]
+    unresolved: List[BrokenFile]
+    errors: List[str]
+
+
+class RelocationFinder:
+    """Matches broken entries to files under some search roots in one pass"""
+
+    def __init__(self, broken: Iterable[BrokenFile], roots: Iterable[str],
+                 include: Iterable[str] = DEFAULT_INCLUDE, exclude: Iterable[str] = DEFAULT_EXCLUDE,
+                 max_workers: int = 8, cancel_event: Optional[threading.Event] = None,
+                 library_paths: Iterable[str] = ()):
+        self.broken = list(broken)
+        self.library_paths = set(library_paths)
+        self.cancel_event = cancel_event or threading.Event()
+        self.crawler = DirectoryCrawler(roots, include=include, exclude=exclude, max_workers=max_workers,
+                                        with_stat=True, batch_size=1024, cancel_event=self.cancel_event)
+        self.max_workers = max_workers
+        self.candidates = 0
+        self.fingerprinted = 0
+
+    @property
+    def scanned(self) -> int:
+        return self.crawler.scanned
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def find(self) -> RelocationResult:
+        wanted_sizes = {b.size for b in self.broken if b.size is not None and b.fingerprint}
+        wanted_names = {os.path.basename(b.path).lower() for b in self.broken}
+        broken_paths = {normalize_path(b.path) for b in self.broken}
+
+        by_name: Dict[str, List[FoundFile]] = {}
+        to_fingerprint: List[FoundFile] = []
+        for batch in self.crawler.crawl():
+            for found in batch:
+                path = normalize_path(found.path)
+                if path in broken_paths:
+                    continue  # came back where it was; nothing to relink
+                if path in self.library_paths:
+                    continue  # another document's file
+                name = found.name.lower()
+                if name in wanted_names:
+                    by_name.setdefault(name, []).append(found)
+                    self.candidates += 1
+                if found.size in wanted_sizes:
+                    to_fingerprint.append(found)
+        if self.cancel_event.is_set():
+            return RelocationResult([], self.broken, self.crawler.errors)
+
+        by_content: Dict[Tuple[int, str], List[FoundFile]] = {}
+
+        def fingerprint(found: FoundFile) -> Tuple[FoundFile, Optional[str]]:
+            return found, fingerprint_file(found.path, found.size)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="docsmart-relocate") as pool:
+            for found, digest in pool.map(fingerprint, to_fingerprint):
+                self.fingerprinted += 1
+                if digest is not None:
+                    by_content.setdefault((found.size, digest), []).append(found)
+
+        relocations = []
+        unresolved = []
+        used: Set[str] = set()
+        for broken in self.broken:
+            match = self._match(broken, by_content, by_name, used)
+            if match is None:
+                unresolved.append(broken)
+            else:
+                used.add(match[0].path)
+                relocations.append(Relocation(broken.doc_id, broken.path, match[0].path, match[1]))
+        return RelocationResult(relocations, unresolved, self.crawler.errors)
+
+    @staticmethod
+    def _match(broken: BrokenFile, by_content: Dict[Tuple[int, str], List[FoundFile]],
+               by_name: Dict[str, List[FoundFile]], used: Set[str]) -> Optional[Tuple[FoundFile, str]]:
+        name = os.path.basename(broken.path).lower()
+        if broken.size is not None and broken.fingerprint:
+            same_content = [found for found in by_content.get((broken.size, broken.fingerprint), [])
+                            if found.path not in used]
+            if len(same_content) == 1:
+                return same_content[0], "content"
+            same_named = [found for found in same_content if found.name.lower() == name]
+            if len(same_named) == 1:
+                return same_named[0], "content"
+            if same_content:
+                return None  # copies in several places; let the user choose
+
+        same_name = [found for found in by_name.get(name, []) if found.path not in used]
+        if broken.size is not None:
+            same_size = [found for found in same_name if found.size == broken.size]
+            if len(same_size) == 1:
+                return same_size[0], "name+size"
+            if same_size:
+                return None
+        # Size unknown, or the file was edited since: only an unambiguous name will do
+        if len(same_name) == 1:
+            return same_name[0], "name"
+        return None
+
+
+def unique_roots(roots: Iterable[str]) -> List[str]:
+    """Drop duplicate roots and roots nested inside another, so each file is seen once"""
+    normalized: Set[str] = set()
+    result = []
+    for root in sorted(roots, key=lambda r: len(normalize_path(r))):
+        norm = normalize_path(root)
+        if any(norm == other or norm.startswith(other.rstrip(os.sep) + os.sep) for other in normalized):
+            continue
+        normalized.add(norm)
+        result.append(root)
+    return result
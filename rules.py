@@ -0,0 +1,108 @@
+"""
+Doc-smart rules: assign tags and teams to imported files from folder names and file name patterns
+"""
+
+import fnmatch
+import os
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+FOLDER = "folder"
+NAME = "name"
+
+
+class Rule(NamedTuple):
+    """A folder rule (one folder name in the path, ignoring case) or a name rule (a glob such as *_Harvard_*)"""
+    kind: str  # FOLDER or NAME
+    pattern: str
+    tag: Optional[str] = None
+    team: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Rule':
+        return cls(**data)
+
+    @property
+    def folder_key(self) -> str:
+        return self.pattern.strip().strip("/\\").lower()
+
+
+class RuleMatch(NamedTuple):
+    tags: List[str]
+    team: Optional[str]  # first matching rule with a team wins
+
+
+def required_literal(pattern: str) -> str:
+    """Longest run of plain characters in a glob; any match must contain it"""
+    runs = re.split(r"\*|\?|\[[^\]]*\]", pattern)
+    return max(runs, key=len).lower()
+
+
+class CompiledRules:
+    """All rules folded into two lookups, so matching cost doesn't grow per rule"""
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = list(rules)
+        self.by_folder: Dict[str, List[int]] = {}
+        self.globs: Dict[int, Any] = {}
+        self.by_literal: Dict[str, List[int]] = {}
+        self.always: List[int] = []  # globs with no plain characters, such as "*"
+        for index, rule in enumerate(self.rules):
+            pattern = rule.pattern.strip()
+            if rule.kind == FOLDER:
+                self.by_folder.setdefault(rule.folder_key, []).append(index)
+            elif rule.kind == NAME and pattern:
+                self.globs[index] = re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+                literal = required_literal(pattern)
+                if literal:
+                    self.by_literal.setdefault(literal, []).append(index)
+                else:
+                    self.always.append(index)
+
+        # A literal found at some position implies every literal inside it,
+        # since the scan reports only the longest one starting there
+        literals = sorted(self.by_literal, key=len, reverse=True)
+        self.implied = {literal: [other for other in literals if other in literal] for literal in literals}
+        self.literal_regex = None
+        if literals:
+            self.literal_regex = re.compile("(?=(" + "|".join(map(re.escape, literals)) + "))")
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def match(self, path: str) -> RuleMatch:
+        directory, name = os.path.split(path)
+        hits = set()
+        if self.by_folder:
+            for segment in directory.replace("\\", "/").lower().split("/"):
+                hits.update(self.by_folder.get(segment, ()))
+        if self.globs:
+            candidates = set(self.always)
+            if self.literal_regex is not None:
+                for found in {m.group(1) for m in self.literal_regex.finditer(name.lower())}:
+                    for literal in self.implied[found]:
+                        candidates.update(self.by_literal[literal])
+            hits.update(index for index in candidates if self.globs[index].match(name))
+
+        tags: List[str] = []
+        team = None
+        for index in sorted(hits):
+            rule = self.rules[index]
+            if rule.tag and rule.tag not in tags:
+                tags.append(rule.tag)
+            if rule.team and team is None:
+                team = rule.team
+        return RuleMatch(tags, team)
+
+
+def match_paths(compiled: CompiledRules, items: Iterable[Tuple[str, str]]) -> List[Tuple[str, RuleMatch]]:
+    """(doc id, path) pairs -> (doc id, match) for those that any rule matched"""
+    results = []
+    for doc_id, path in items:
+        match = compiled.match(path)
+        if match.tags or match.team:
+            results.append((doc_id, match))
+    return results
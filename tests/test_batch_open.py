@@ -0,0 +1,58 @@
+"""
+BatchOpenJob against FakeBackend: restoring a workspace opens its documents in the saved order
+"""
+
+import pytest
+
+from backends import FakeBackend
+from batch_open import BatchOpenJob, OpenRequest
+from word_session import document_key
+from workspaces import Workspace
+
+TIMEOUT = 30
+
+
+def run(job):
+    job.start()
+    job.thread.join(TIMEOUT)
+    assert not job.thread.is_alive()
+    opened = []
+    while not job.results.empty():
+        kind, payload = job.results.get()
+        if kind == "opened":
+            opened.extend(payload)
+    return opened
+
+
+@pytest.fixture
+def paths(tmp_path):
+    paths = {}
+    for index in range(24):
+        path = tmp_path / f"doc{index:02}.docx"
+        path.write_text("")
+        paths[f"doc{index:02}"] = str(path)
+    return paths
+
+
+@pytest.mark.parametrize("failure_rate", [0.0, 0.3])
+def test_in_order_restore_reproduces_saved_order(paths, failure_rate):
+    # Saved out of name order, the way a user arranges a workspace
+    workspace = Workspace.capture("review", sorted(paths, reverse=True))
+    backend = FakeBackend(open_latency=0.002, failure_rate=failure_rate, seed=7)
+    requests = [OpenRequest(doc_id, paths[doc_id], priority=position)
+                for position, doc_id in enumerate(workspace.doc_ids)]
+    job = BatchOpenJob(backend, requests, backoff=0.001, in_order=True)
+    assert job.max_concurrent == 1
+
+    opened = run(job)
+    assert opened
+    expected = [doc_id for doc_id in workspace.doc_ids if doc_id in opened]
+    assert opened == expected
+    assert backend.open_in_window_order() == [document_key(paths[doc_id]) for doc_id in expected]
+
+
+def test_unordered_batch_uses_backend_concurrency(paths):
+    backend = FakeBackend()
+    job = BatchOpenJob(backend, [OpenRequest(doc_id, path) for doc_id, path in paths.items()])
+    assert job.max_concurrent == backend.max_concurrency
+    assert sorted(run(job)) == sorted(paths)
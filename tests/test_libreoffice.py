@@ -0,0 +1,104 @@
+"""
+LibreOfficeBackend against StubOffice: connection reuse, non-blocking open, listing and close policies
+"""
+
+import time
+
+import pytest
+
+from backends import DISCARD_CHANGES, PROMPT_TO_SAVE, SAVE_CHANGES
+from libreoffice import LibreOfficeBackend, StubOffice, office_url_key
+from word_session import UNSAVED_CHANGES, document_key
+
+TIMEOUT = 10
+
+
+@pytest.fixture
+def documents(tmp_path):
+    paths = []
+    for name in ("a.odt", "b.odt", "c.odt"):
+        path = tmp_path / name
+        path.write_text("")
+        paths.append(str(path))
+    return paths
+
+
+def open_all(backend, paths):
+    for path in paths:
+        backend.open(path).result(timeout=TIMEOUT)
+
+
+def stub_document(office, path):
+    return next(document for document in office.documents if office_url_key(document.url) == document_key(path))
+
+
+def test_open_returns_future_without_waiting_for_startup(documents):
+    office = StubOffice(start_latency=0.5)
+    backend = LibreOfficeBackend(office.connection())
+    started = time.monotonic()
+    future = backend.open(documents[0])
+    assert time.monotonic() - started < 0.2
+    assert not future.done()
+    future.result(timeout=TIMEOUT)
+    assert len(office.open_urls()) == 1
+
+
+def test_connection_is_reused_and_reconnects_after_quit(documents):
+    office = StubOffice()
+    connection = office.connection()
+    backend = LibreOfficeBackend(connection)
+    open_all(backend, documents[:2])
+    assert connection.connects == 1
+
+    office.quit()
+    backend.open(documents[2]).result(timeout=TIMEOUT)
+    assert connection.connects == 2
+    assert backend.list_open() == {document_key(documents[2])}
+
+
+def test_list_open_does_not_start_office():
+    office = StubOffice()
+    backend = LibreOfficeBackend(office.connection())
+    assert backend.list_open() == set()
+    assert backend.open_in_window_order() == []
+    assert not office.running
+    assert office.connects == 0
+
+
+def test_close_does_not_start_office(documents):
+    office = StubOffice()
+    backend = LibreOfficeBackend(office.connection())
+    result = backend.close(documents)
+    assert result.closed == []
+    assert result.not_open == [document_key(path) for path in documents]
+    assert not office.running
+
+
+@pytest.mark.parametrize("save_policy, saves", [(SAVE_CHANGES, 1), (DISCARD_CHANGES, 0)])
+def test_close_saves_or_discards_changes(documents, save_policy, saves):
+    office = StubOffice()
+    backend = LibreOfficeBackend(office.connection())
+    open_all(backend, documents[:2])
+    edited = stub_document(office, documents[0])
+    edited.modified = True
+
+    result = backend.close(documents, save_policy)
+    assert sorted(result.closed) == sorted(document_key(path) for path in documents[:2])
+    assert result.not_open == [document_key(documents[2])]
+    assert result.failed == []
+    assert edited.saves == saves
+    assert office.open_urls() == []
+
+
+def test_close_prompt_to_save_leaves_unsaved_documents_open(documents):
+    office = StubOffice()
+    backend = LibreOfficeBackend(office.connection())
+    open_all(backend, documents[:2])
+    edited = stub_document(office, documents[0])
+    edited.modified = True
+
+    result = backend.close(documents[:2], PROMPT_TO_SAVE)
+    assert result.closed == [document_key(documents[1])]
+    assert result.failed == [(document_key(documents[0]), UNSAVED_CHANGES)]
+    assert edited.saves == 0
+    assert backend.list_open() == {document_key(documents[0])}
@@ -3,9 +3,12 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
 
+from word_session import WordSession
+
 class WordControllerGUI:
     def __init__(self):
-        self.word = None
+        # One Word connection for the whole session, re-made if Word is closed
+        self.word = WordSession(win32com.client)
         self.doc = None
         self.current_file = None
         
@@ -38,9 +41,7 @@ class WordControllerGUI:
             return
         
         try:
-            self.word = win32com.client.Dispatch("Word.Application")
-            self.word.Visible = True
-            self.doc = self.word.Documents.Open(self.current_file)
+            self.doc = self.word.open(self.current_file)
             messagebox.showinfo("Success", f"Opened: {os.path.basename(self.current_file)}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open document: {e}")
@@ -59,11 +60,8 @@ class WordControllerGUI:
             self.doc.Close(SaveChanges=save_choice)
             self.doc = None
             
-            # Check if any documents are still open
-            if self.word and self.word.Documents.Count == 0:
-                # No documents left, quit Word to avoid black window
-                self.word.Quit()
-                self.word = None
+            # No documents left: quit Word to avoid a blank window
+            if self.word.quit_if_idle():
                 messagebox.showinfo("Success", "Document closed and Word application closed")
             else:
                 messagebox.showinfo("Success", "Document closed")
@@ -77,9 +75,7 @@ class WordControllerGUI:
                 self.doc.Close(SaveChanges=False)
                 self.doc = None
                 
-            if self.word:
-                self.word.Quit()
-                self.word = None
+            self.word.quit(save_changes=False)
                 
             messagebox.showinfo("Success", "Document closed without saving")
         except Exception as e:
@@ -0,0 +1,189 @@
+"""
+Doc-smart Word session: one long-lived Word automation connection, reconnected when Word goes away
+"""
+
+import os
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+# HRESULTs meaning the Word process behind a connection is gone
+# (quit by the user, crashed, or closed by a previous Quit())
+DISCONNECTED_HRESULTS = {
+    -2147023174,  # RPC_S_SERVER_UNAVAILABLE
+    -2147023170,  # RPC_S_CALL_FAILED
+    -2147417848,  # RPC_E_DISCONNECTED
+    -2147220995,  # CO_E_OBJNOTCONNECTED
+    -2147418111,  # RPC_E_CALL_REJECTED while shutting down
+}
+
+WD_SAVE_CHANGES = -1
+WD_DO_NOT_SAVE_CHANGES = 0
+WD_PROMPT_TO_SAVE_CHANGES = -2
+
+
+def is_disconnected(error: Exception) -> bool:
+    """True if a COM error says the Word process is no longer there"""
+    hresult = getattr(error, "hresult", None)
+    if hresult is None and getattr(error, "args", None):
+        hresult = error.args[0]
+    return hresult in DISCONNECTED_HRESULTS
+
+
+class WordSession:
+    """Holds one Word.Application connection, reconnecting once when Word has gone away"""
+
+    PROG_ID = "Word.Application"
+
+    def __init__(self, com: Any):
+        self.com = com
+        self._app = None
+        self.connects = 0
+        self.calls = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._app is not None
+
+    def connect(self):
+        """The live Word application, connecting if needed"""
+        if self._app is None:
+            self._app = self.com.Dispatch(self.PROG_ID)
+            self.connects += 1
+        return self._app
+
+    def disconnect(self):
+        """Forget the connection; the next call reconnects"""
+        self._app = None
+
+    def attach(self) -> bool:
+        """Connect to Word only if it is already running; never starts it"""
+        if self._app is None:
+            try:
+                self._app = self.com.GetActiveObject(self.PROG_ID)
+            except Exception:
+                return False
+            self.connects += 1
+        return True
+
+    def run(self, action: Callable[[Any], Any]) -> Any:
+        """Call action(word_app), reconnecting and retrying once if Word has gone away"""
+        try:
+            self.calls += 1
+            return action(self.connect())
+        except Exception as e:
+            if not is_disconnected(e):
+                raise
+        self.disconnect()
+        self.calls += 1
+        return action(self.connect())
+
+    def peek(self, action: Callable[[Any], Any], default: Any = None) -> Any:
+        """Call action(word_app) if Word is running, else return default; never restarts Word"""
+        for _ in range(2):
+            if not self.attach():
+                return default
+            try:
+                self.calls += 1
+                return action(self._app)
+            except Exception as e:
+                if not is_disconnected(e):
+                    raise
+                self.disconnect()
+        return default
+
+    def open(self, path: str, visible: bool = True):
+        """Open a document in Word and return it"""
+        def action(word_app):
+            if visible:
+                word_app.Visible = True
+            return word_app.Documents.Open(os.path.abspath(path))
+        return self.run(action)
+
+    def quit_if_idle(self) -> bool:
+        """Quit Word when no documents are left, so no empty window lingers"""
+        def action(word_app):
+            if word_app.Documents.Count == 0:
+                word_app.Quit()
+                return True
+            return False
+        try:
+            quit_word = self.run(action)
+        except Exception as e:
+            if not is_disconnected(e):
+                raise
+            quit_word = True
+        if quit_word:
+            self.disconnect()
+        return quit_word
+
+    def quit(self, save_changes: int = WD_PROMPT_TO_SAVE_CHANGES):
+        """Quit Word outright"""
+        if self._app is None:
+            return
+        try:
+            self._app.Quit(SaveChanges=save_changes)
+        except Exception as e:
+            if not is_disconnected(e):
+                raise
+        self.disconnect()
+
+
+
+def document_key(full_name: str) -> str:
+    """Key for matching Word's FullName to a library path or URL"""
+    if "://" in full_name:
+        return full_name.lower()
+    return os.path.normcase(os.path.abspath(full_name))
+
+
+# CloseResult.failed message for documents left open because they have unsaved changes
+UNSAVED_CHANGES = "has unsaved changes"
+
+
+class CloseResult(NamedTuple):
+    closed: List[str]  # keys that were open and are now closed
+    not_open: List[str]  # keys Word didn't have open
+    failed: List[Tuple[str, str]]  # (key, error)
+    com_calls: int
+
+
+def close_documents(session: WordSession, keys: Iterable[str], save_changes: int = WD_SAVE_CHANGES,
+                    quit_when_idle: bool = True, keep_unsaved: bool = False) -> CloseResult:
+    """Close the Word documents whose document_key() is in keys, in one pass over Word's documents"""
+    wanted = list(dict.fromkeys(keys))
+    calls = 0
+
+    def read_open_documents(word_app) -> Dict[str, Any]:
+        nonlocal calls
+        by_key = {}
+        documents = word_app.Documents
+        count = documents.Count
+        calls += 2
+        for index in range(1, count + 1):  # COM collections are 1-based
+            word_doc = documents.Item(index)
+            by_key[document_key(word_doc.FullName)] = word_doc
+            calls += 2
+        return by_key
+
+    open_docs = session.run(read_open_documents)
+    closed, not_open, failed = [], [], []
+    for key in wanted:
+        word_doc = open_docs.get(key)
+        if word_doc is None:
+            not_open.append(key)
+            continue
+        try:
+            if keep_unsaved:
+                calls += 1
+                if not word_doc.Saved:
+                    failed.append((key, UNSAVED_CHANGES))
+                    continue
+            calls += 1
+            word_doc.Close(SaveChanges=save_changes)
+            closed.append(key)
+        except Exception as e:
+            failed.append((key, str(e)))
+
+    if quit_when_idle and open_docs and len(closed) == len(open_docs):
+        calls += 1
+        session.quit(WD_DO_NOT_SAVE_CHANGES)
+    return CloseResult(closed, not_open, failed, calls)
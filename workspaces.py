@@ -0,0 +1,52 @@
+"""
+Doc-smart workspaces: named sets of open documents, saved in window order and restored together
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+
+class Workspace(NamedTuple):
+    """Documents by id, in the order their windows were in when saved"""
+    name: str
+    doc_ids: List[str]
+    saved_at: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Short keys: the workspace list lives in data.json with the library
+        return {'name': self.name, 'docs': self.doc_ids, 'saved': round(self.saved_at)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Workspace':
+        return cls(data['name'], list(data.get('docs', [])), data.get('saved', 0))
+
+    @classmethod
+    def capture(cls, name: str, doc_ids: Iterable[str]) -> 'Workspace':
+        return cls(name, list(dict.fromkeys(doc_ids)), datetime.now().timestamp())
+
+
+def order_by_keys(keys: List[str], ids_by_path: Dict[str, Set[str]], urls: Dict[str, str]) -> List[str]:
+    """Library ids for editor document keys, keeping the editor's order"""
+    ordered: List[str] = []
+    for key in keys:
+        ids = ids_by_path.get(key)
+        if ids:
+            ordered.extend(sorted(ids))
+        elif key in urls:
+            ordered.append(urls[key])
+    return list(dict.fromkeys(ordered))
+
+
+def replace_workspace(workspaces: List[Workspace], workspace: Workspace) -> List[Workspace]:
+    """The list with `workspace` added, replacing one of the same name (ignoring case)"""
+    kept = [other for other in workspaces if other.name.lower() != workspace.name.lower()]
+    return sorted(kept + [workspace], key=lambda other: other.name.lower())
+
+
+def remove_workspace(workspaces: List[Workspace], name: str) -> List[Workspace]:
+    """The list without the workspace of this name (ignoring case)"""
+    return [workspace for workspace in workspaces if workspace.name.lower() != name.lower()]
+
+
+def find_workspace(workspaces: List[Workspace], name: str) -> Optional[Workspace]:
+    return next((workspace for workspace in workspaces if workspace.name.lower() == name.lower()), None)